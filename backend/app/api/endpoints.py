@@ -1,162 +1,548 @@
-import duckdb
-from fastapi import APIRouter, HTTPException, Query
-from typing import List, Optional, Dict, Any
-from backend.etl.config import GOLD_PATH
-import os
+import time
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from datetime import date as Date, datetime
+from decimal import Decimal
+import pyarrow as pa
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import Response
+from typing import Iterator, List, Literal, Optional, Dict, Any, Tuple
+from backend.app.api import formats
+from backend.app.api.etag import compute_etag, etag_matches
+from backend.app.cache import (
+    delta_file_count,
+    delta_partition_values,
+    delta_table_version,
+    get_gold_cache,
+)
+from backend.app.config import QUERY_TIMEOUT_SECONDS
+from backend.app.db import PoolExhaustedError, get_pool
+from backend.app.metrics import (
+    GOLD_DELTA_SNAPSHOT_FILES,
+    GOLD_QUERY_DURATION,
+    GOLD_QUERY_ROWS,
+    GOLD_RESULT_FETCH_DURATION,
+)
+from backend.app.models.gold import DimensionType, LeaderboardMetric
+from backend.app.query import (
+    QueryRejectedError,
+    QueryTimeoutError,
+    get_query_limiter,
+    get_single_flight,
+    interrupt_after,
+)
+from backend.etl.config import GOLD_PATH, SILVER_PATH
 
-router = APIRouter()
+# The prefix is part of each route's path, so route templates (metrics labels)
+# are the full path
+router = APIRouter(prefix="/api/v1")
 
+# Silver tables are named "silver.<table>", as in the ETL DAG outputs
+SILVER_TABLE_PREFIX = "silver."
 
-def get_db_connection():
+
+def lakehouse_table_path(table_name: str) -> Path:
+    """Location of a Gold table, or of a "silver.<table>" Silver table."""
+    if table_name.startswith(SILVER_TABLE_PREFIX):
+        return SILVER_PATH / table_name[len(SILVER_TABLE_PREFIX):]
+    return GOLD_PATH / table_name
+
+
+@contextmanager
+def gold_query(table_name: str, query: str, params: list = None) -> Iterator[Optional[Any]]:
     """
-    Creates a DuckDB connection and loads the Delta extension.
+    Executes SQL against a Gold Delta table and yields the pooled cursor holding
+    the result, or None if the table doesn't exist yet.
+
+    The table is served from the version-aware Gold cache when enabled, so repeat
+    queries don't re-read the Delta log and Parquet files. The query uses
+    `{table}` as the placeholder for the table.
+
+    Each query holds a slot of the concurrency limiter (503 when none frees up
+    quickly) and is interrupted in DuckDB after QUERY_TIMEOUT_SECONDS (504).
     """
-    con = duckdb.connect(":memory:")
-    # In a production environment, you ensure extensions are present.
-    # For now, we try to load it.
+    table_path = lakehouse_table_path(table_name)
+    if not table_path.exists():
+        # Fallback for development if table doesn't exist yet
+        yield None
+        return
+
+    cache = get_gold_cache()
     try:
-        con.execute("INSTALL delta;")
-        con.execute("LOAD delta;")
+        with get_query_limiter().slot(), get_pool().connection() as con:
+            if table_name.startswith(SILVER_TABLE_PREFIX):
+                # Silver reference tables are small: read the current snapshot as is
+                from deltalake import DeltaTable
+
+                snapshot = DeltaTable(str(table_path)).to_pyarrow_table()
+            else:
+                cached = cache.get(table_name) if cache is not None else None
+                snapshot = cached.table if cached is not None else None
+            if snapshot is not None:
+                # Cursor-local view over the in-memory Arrow snapshot
+                view_name = f"gold_{table_name}".replace(".", "_")
+                con.register(view_name, snapshot)
+                source = view_name
+            else:
+                view_name = None
+                source = f"delta_scan('{table_path}')"
+                version = delta_table_version(table_path)
+                if version is not None:
+                    GOLD_DELTA_SNAPSHOT_FILES.labels(table_name).inc(
+                        delta_file_count(str(table_path), version)
+                    )
+
+            try:
+                formatted_query = query.format(table=source)
+                started = time.perf_counter()
+                with interrupt_after(con, QUERY_TIMEOUT_SECONDS):
+                    if params:
+                        con.execute(formatted_query, params)
+                    else:
+                        con.execute(formatted_query)
+                GOLD_QUERY_DURATION.labels(table_name).observe(time.perf_counter() - started)
+                yield con
+            finally:
+                if view_name is not None:
+                    con.unregister(view_name)
+    except HTTPException:
+        raise
+    except (PoolExhaustedError, QueryRejectedError) as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except QueryTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
-        print(f"Warning: Could not load Delta extension. {e}")
-    return con
+        raise HTTPException(status_code=500, detail=str(e))
 
 
 def query_gold_table(table_name: str, query: str, params: list = None):
     """
-    Helper to execute SQL against a Gold Delta table.
+    Helper to execute SQL against a Gold Delta table, returning rows as dicts.
+    Meant for small results (KPI cards, pages); bulk data goes through gold_response.
+
+    Identical queries already in flight (e.g. every browser loading the same
+    KPI cards at once) share one execution and its result rows; callers must
+    treat the rows as read-only.
     """
-    table_path = GOLD_PATH / table_name
-    if not table_path.exists():
-        # Fallback for development if table doesn't exist yet
-        return []
 
-    con = get_db_connection()
+    def run():
+        with gold_query(table_name, query, params) as con:
+            if con is None:
+                return []
+            started = time.perf_counter()
+            result = con.fetchall()
+
+            # Convert to dictionary
+            columns = [desc[0] for desc in con.description]
+            rows = [dict(zip(columns, row)) for row in result]
+            GOLD_RESULT_FETCH_DURATION.labels(table_name).observe(time.perf_counter() - started)
+            GOLD_QUERY_ROWS.labels(table_name).observe(len(rows))
+            return rows
+
+    key = (table_name, query, tuple(params or ()))
+    return get_single_flight().do(key, run)
+
+
+def gold_response(request: Request, table_name: str, query: str, params: list = None) -> Response:
+    """
+    Runs a Gold query and returns it in the format the client asked for.
+
+    - `application/vnd.apache.arrow.stream`: record batches streamed from DuckDB;
+      the pooled cursor is held until the stream finishes.
+    - `application/vnd.apache.parquet`: one Parquet file.
+    - otherwise: columnar JSON (see formats.columnar_json_response).
+    """
+    media_type = formats.negotiate_format(request)
+    stack = ExitStack()
     try:
-        # Replace the table placeholder with the actual delta_scan call
-        # We assume the query uses {table} as placeholder
-        formatted_query = query.format(table=f"delta_scan('{table_path}')")
-        if params:
-            result = con.execute(formatted_query, params).fetchall()
-        else:
-            result = con.execute(formatted_query).fetchall()
-
-        # Convert to dictionary
-        columns = [desc[0] for desc in con.description]
-        return [dict(zip(columns, row)) for row in result]
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        con = stack.enter_context(gold_query(table_name, query, params))
+        if con is None:
+            empty = pa.table({})
+            if media_type == formats.ARROW_STREAM_MEDIA_TYPE:
+                return formats.arrow_stream_response(
+                    pa.RecordBatchReader.from_batches(empty.schema, [])
+                )
+            if media_type == formats.PARQUET_MEDIA_TYPE:
+                return formats.parquet_response(empty)
+            return formats.columnar_json_response(empty)
+
+        if media_type == formats.ARROW_STREAM_MEDIA_TYPE:
+            # to_arrow_reader() replaces fetch_record_batch() in newer DuckDB releases
+            reader = (
+                con.to_arrow_reader()
+                if hasattr(con, "to_arrow_reader")
+                else con.fetch_record_batch()
+            )
+            return formats.arrow_stream_response(reader, on_close=stack.pop_all().close)
+
+        started = time.perf_counter()
+        table = con.to_arrow_table() if hasattr(con, "to_arrow_table") else con.fetch_arrow_table()
+        GOLD_RESULT_FETCH_DURATION.labels(table_name).observe(time.perf_counter() - started)
+        GOLD_QUERY_ROWS.labels(table_name).observe(table.num_rows)
+        if media_type == formats.PARQUET_MEDIA_TYPE:
+            return formats.parquet_response(table)
+        return formats.columnar_json_response(table)
     finally:
-        con.close()
+        stack.close()
+
+
+def gold_etag(*tables: str):
+    """
+    Route dependency for conditional GETs on data read from `tables`.
+
+    The ETag combines the route, its normalized query parameters and the current
+    Delta version of each table (a `_delta_log` listing, no data read). A
+    matching If-None-Match ends the request with 304 before any query runs;
+    otherwise the ETag is left on `request.state` for the response middleware,
+    which only sets it on 200s. While a table doesn't exist yet the route
+    serves placeholder data, so no ETag is issued and nothing is revalidated.
+    """
+
+    def dependency(request: Request) -> None:
+        versions = {name: delta_table_version(lakehouse_table_path(name)) for name in tables}
+        if None in versions.values():
+            return
+        etag = compute_etag(request, versions, variant=formats.negotiate_format(request))
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=304, headers={"ETag": etag})
+        request.state.etag = etag
+
+    return Depends(dependency)
 
 
-@router.get("/kpis")
+def latest_partition(table_name: str, column: str) -> Optional[str]:
+    """
+    Newest value of a Gold table's partition column, from Delta metadata only.
+    Returns None if the table isn't partitioned on it (callers fall back to SQL).
+    """
+    cache = get_gold_cache()
+    if cache is not None:
+        values = cache.partition_values(table_name, column)
+    else:
+        values = delta_partition_values(GOLD_PATH / table_name, column)
+    return values[-1] if values else None
+
+
+def resolve_dimension(
+    team_id: Optional[str] = None, officer_id: Optional[str] = None
+) -> Tuple[str, str]:
+    """
+    Maps the dashboard filters to a precomputed Gold dimension.
+    officer_id takes precedence over team_id; no filter means the whole Bank.
+    """
+    if officer_id:
+        return DimensionType.Officer.value, officer_id
+    if team_id:
+        return DimensionType.Team.value, team_id
+    return DimensionType.Bank.value, "All"
+
+
+def month_key(value: str, param: str) -> int:
+    """Parses YYYY-MM or YYYY-MM-DD into a fact table date_key (YYYYMM)."""
+    for fmt in ("%Y-%m-%d", "%Y-%m"):
+        try:
+            parsed = datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+        return parsed.year * 100 + parsed.month
+    raise HTTPException(
+        status_code=422, detail=f"{param} must be YYYY-MM or YYYY-MM-DD, got '{value}'"
+    )
+
+
+@router.get("/kpis", dependencies=[gold_etag("agg_kpi_daily")])
 def get_kpis(
-    date: Optional[str] = None,
+    date: Optional[Date] = None,
     team_id: Optional[str] = None,
     officer_id: Optional[str] = None,
 ):
     """
     Get high-level KPIs.
     Mapped to KPICard component.
+
+    agg_kpi_daily holds every KPI precomputed for the Bank, each Team and each
+    Officer, so any filter is a lookup on (report_date, dimension), not an
+    aggregation. officer_id takes precedence over team_id.
     """
-    # TODO: Add filtering logic based on team/officer
-    # For now, return aggregate for the latest date if not specified
+    dimension_type, dimension_value = resolve_dimension(team_id, officer_id)
 
-    query = """
+    # Latest date if not specified: the newest report_date partition, from the
+    # Delta log. Tables written before partitioning fall back to a MAX() scan.
+    if not date:
+        date = latest_partition("agg_kpi_daily", "report_date")
+    if date:
+        date_filter = "report_date = CAST(? AS DATE)"
+        params = [date, dimension_type, dimension_value]
+    else:
+        date_filter = """report_date = (
+            SELECT MAX(report_date) FROM {table} WHERE dimension_type = ?
+        )"""
+        params = [dimension_type, dimension_type, dimension_value]
+
+    query = f"""
     SELECT 
         kpi_name,
         value,
         dimension_type,
         dimension_value
-    FROM {table}
-    WHERE report_date = (SELECT MAX(report_date) FROM {table})
+    FROM {{table}}
+    WHERE {date_filter}
+      AND dimension_type = ?
+      AND dimension_value = ?
     """
 
-    # In a real impl, we would construct the WHERE clause dynamically
-    try:
-        data = query_gold_table("agg_kpi_daily", query)
-
-        # Transform to expected schema
-        response = {
-            "total_deposits": 0,
-            "net_flow_mom": 0,
-            "liquidity_ratio": 0,
-            "trends": {},
-        }
-
-        for row in data:
-            if row["dimension_type"] == "Bank" and row["dimension_value"] == "All":
-                if row["kpi_name"] in response:
-                    response[row["kpi_name"]] = row["value"]
-
-        return response
-    except Exception as e:
-        # Graceful fallback if tables missing
-        print(f"Error fetching KPIs: {e}")
-        return {
-            "total_deposits": 125000000,  # Mock fallback
-            "net_flow_mom": 2500000,
-            "liquidity_ratio": 1.2,
-            "trends": {"total_deposits_pct": 5.2},
-        }
+    # 503/504 from the query layer propagate as-is; a missing table yields zeros
+    data = query_gold_table("agg_kpi_daily", query, params)
+
+    # Transform to expected schema
+    response = {
+        "total_deposits": 0,
+        "net_flow_mom": 0,
+        "liquidity_ratio": 0,
+        "trends": {},
+    }
 
+    for row in data:
+        if row["kpi_name"] in response:
+            response[row["kpi_name"]] = row["value"]
 
-@router.get("/analytics/waterfall")
-def get_waterfall(start_date: Optional[str] = None, end_date: Optional[str] = None):
+    return response
+
+
+@router.get("/analytics/waterfall", dependencies=[gold_etag("agg_flow_waterfall")])
+def get_waterfall(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    team_id: Optional[str] = None,
+    officer_id: Optional[str] = None,
+):
     """
     Get waterfall chart data.
+
+    agg_flow_waterfall holds increases/decreases per month for the Bank, each
+    Team and each Officer, so a date range sums a handful of monthly rows.
+    Without dates the latest month is returned. The range opens on the first
+    month's start balance and closes on the last month's end balance; any
+    difference between one month's close and the next month's open (households
+    joining or leaving the book) is reported as "Book changes".
     """
-    # Placeholder logic
+    dimension_type, dimension_value = resolve_dimension(team_id, officer_id)
+
+    if start_date or end_date:
+        date_filter = "date_key BETWEEN ? AND ?"
+        params = [
+            month_key(start_date, "start_date") if start_date else 0,
+            month_key(end_date, "end_date") if end_date else 999999,
+        ]
+    else:
+        date_filter = "date_key = (SELECT MAX(date_key) FROM {table})"
+        params = []
+
+    query = f"""
+    SELECT date_key, start_balance, increases, decreases, end_balance
+    FROM {{table}}
+    WHERE {date_filter}
+      AND dimension_type = ?
+      AND dimension_value = ?
+    ORDER BY date_key
+    """
+    months = query_gold_table(
+        "agg_flow_waterfall", query, params + [dimension_type, dimension_value]
+    )
+
+    zero = Decimal("0.00")
+    start_balance = months[0]["start_balance"] if months else zero
+    end_balance = months[-1]["end_balance"] if months else zero
+    increases = sum((m["increases"] for m in months), zero)
+    decreases = sum((m["decreases"] for m in months), zero)
+    book_changes = end_balance - start_balance - increases - decreases
+
+    details = [
+        {"category": "Increases", "value": increases},
+        {"category": "Decreases", "value": decreases},
+    ]
+    if book_changes:
+        details.append({"category": "Book changes", "value": book_changes})
+
     return {
-        "start_balance": 100000000,
-        "increases": 5000000,
-        "decreases": -2000000,
-        "end_balance": 103000000,
-        "details": [
-            {"category": "Deposits", "value": 4000000},
-            {"category": "Interest", "value": 1000000},
-            {"category": "Withdrawals", "value": -2000000},
-        ],
+        "start_balance": start_balance,
+        "increases": increases,
+        "decreases": decreases,
+        "end_balance": end_balance,
+        "details": details,
+        "months": months,
     }
 
 
-@router.get("/officers/leaderboard")
-def get_officer_leaderboard(metric: str = "balance", sort: str = "desc"):
+@router.get("/officers/leaderboard", dependencies=[gold_etag("agg_officer_leaderboard")])
+def get_officer_leaderboard(
+    metric: LeaderboardMetric = LeaderboardMetric.balance,
+    sort: Literal["asc", "desc"] = "desc",
+    limit: int = Query(10, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    date: Optional[Date] = None,
+):
     """
     Get officer leaderboard.
+
+    agg_officer_leaderboard stores every officer pre-ranked in both directions
+    for each metric, so a page is a range read on rank_desc / rank_asc.
+    """
+    rank_column = "rank_desc" if sort == "desc" else "rank_asc"
+
+    # Latest report date if not specified
+    if date:
+        date_filter = "report_date = CAST(? AS DATE)"
+        params = [date, metric.value]
+    else:
+        date_filter = "report_date = (SELECT MAX(report_date) FROM {table})"
+        params = [metric.value]
+
+    query = f"""
+    SELECT
+        {rank_column} as rank,
+        officer_code,
+        officer_name,
+        team_id,
+        value,
+        balance,
+        growth_ytd,
+        rank_desc + rank_asc - 1 as total
+    FROM {{table}}
+    WHERE {date_filter}
+      AND metric = ?
+      AND {rank_column} > ?
+      AND {rank_column} <= ?
+    ORDER BY {rank_column}
     """
-    # Placeholder logic
+    params += [offset, offset + limit]
+
+    data = query_gold_table("agg_officer_leaderboard", query, params)
     return {
+        "metric": metric.value,
+        "sort": sort,
+        "limit": limit,
+        "offset": offset,
+        "total": data[0]["total"] if data else 0,
         "data": [
             {
-                "officer_id": "OFF001",
-                "name": "Sarah Jenkins",
-                "team": "BB",
-                "balance": 45000000,
-                "growth_ytd": 1200000,
-            },
-            {
-                "officer_id": "OFF002",
-                "name": "Mike Ross",
-                "team": "OCF",
-                "balance": 32000000,
-                "growth_ytd": -500000,
-            },
-        ]
+                "rank": row["rank"],
+                "officer_id": row["officer_code"],
+                "name": row["officer_name"],
+                "team": row["team_id"],
+                "value": row["value"],
+                "balance": row["balance"],
+                "growth_ytd": row["growth_ytd"],
+            }
+            for row in data
+        ],
     }
 
 
-@router.get("/metadata/filters")
+@router.get("/households", dependencies=[gold_etag("fact_household_monthly")])
+def get_households(
+    request: Request,
+    date: Optional[str] = None,
+    team_id: Optional[str] = None,
+    officer_id: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1),
+    offset: int = Query(0, ge=0),
+):
+    """
+    Household balances for one month (latest by default) from fact_household_monthly.
+
+    Bulk endpoint: send `Accept: application/vnd.apache.arrow.stream` (or
+    `application/vnd.apache.parquet`) to receive Arrow record batches instead
+    of columnar JSON.
+    """
+    if date:
+        filters = ["date_key = ?"]
+        params: list = [month_key(date, "date")]
+    else:
+        filters = ["date_key = (SELECT MAX(date_key) FROM {table})"]
+        params = []
+    if team_id:
+        filters.append("team_key = ?")
+        params.append(team_id)
+    if officer_id:
+        filters.append("officer_key = ?")
+        params.append(officer_id)
+
+    query = f"""
+    SELECT
+        date_key,
+        household_key as household_id,
+        officer_key as officer_id,
+        team_key as team_id,
+        total_deposits,
+        net_flow_mom,
+        net_flow_ytd
+    FROM {{table}}
+    WHERE {" AND ".join(filters)}
+    ORDER BY household_key
+    LIMIT ? OFFSET ?
+    """
+    params += [limit, offset]
+    return gold_response(request, "fact_household_monthly", query, params)
+
+
+@router.get("/officers", dependencies=[gold_etag("agg_officer_leaderboard")])
+def get_officers(request: Request, team_id: Optional[str] = None):
+    """
+    Every officer with their totals for the latest report date.
+
+    Bulk endpoint with the same content negotiation as /households.
+    """
+    filters = [
+        "report_date = (SELECT MAX(report_date) FROM {table})",
+        "metric = ?",
+    ]
+    params: list = [LeaderboardMetric.balance.value]
+    if team_id:
+        filters.append("team_id = ?")
+        params.append(team_id)
+
+    query = f"""
+    SELECT
+        report_date,
+        officer_code as officer_id,
+        officer_name as name,
+        team_id as team,
+        balance,
+        net_flow_mom,
+        growth_ytd,
+        household_count
+    FROM {{table}}
+    WHERE {" AND ".join(filters)}
+    ORDER BY officer_code
+    """
+    return gold_response(request, "agg_officer_leaderboard", query, params)
+
+
+@router.get("/metadata/filters", dependencies=[gold_etag("dim_officer", "silver.teams")])
 def get_filters():
     """
     Get filter metadata.
+
+    Officers are the current rows of the dim_officer SCD2 dimension, read from
+    the Gold cache (and revalidated by ETag) rather than scanned per request.
+    Teams come from the Silver teams reference table.
     """
+    teams = query_gold_table("silver.teams", "SELECT team_id FROM {table} ORDER BY team_id")
+    officers = query_gold_table(
+        "dim_officer",
+        """
+        SELECT officer_key, officer_name, current_team
+        FROM {table}
+        WHERE is_current
+        ORDER BY officer_name, officer_key
+        """,
+    )
     return {
-        "teams": ["BB", "OCF", "PB"],
+        "teams": [row["team_id"] for row in teams],
         "officers": [
-            {"id": "OFF001", "name": "Sarah Jenkins", "team": "BB"},
-            {"id": "OFF002", "name": "Mike Ross", "team": "OCF"},
+            {"id": row["officer_key"], "name": row["officer_name"], "team": row["current_team"]}
+            for row in officers
         ],
         "balance_tiers": ["<1M", "1M-5M", ">5M"],
     }
@@ -0,0 +1,34 @@
+import hashlib
+from typing import Mapping, Optional
+
+from fastapi import Request
+
+
+def compute_etag(request: Request, versions: Mapping[str, Optional[int]], variant: str = "") -> str:
+    """
+    Weak ETag over the route, its normalized query parameters and the Delta
+    versions of the Gold tables it reads.
+
+    Parameters are sorted so `?a=1&b=2` and `?b=2&a=1` share an ETag. `variant`
+    distinguishes representations of the same data (e.g. the negotiated format).
+    The tag is weak because GZip may re-encode the body.
+    """
+    params = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    tables = ",".join(f"{name}@{versions[name]}" for name in sorted(versions))
+    digest = hashlib.sha256(
+        "|".join([request.url.path, params, tables, variant]).encode("utf-8")
+    ).hexdigest()[:32]
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against our ETag (RFC 9110 13.1.2)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
@@ -0,0 +1,188 @@
+import io
+import json
+import threading
+from typing import Any, Callable, Iterator, Optional
+
+import anyio
+import pyarrow as pa
+from fastapi import Request
+from fastapi.responses import Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+JSON_MEDIA_TYPE = "application/json"
+
+SUPPORTED_MEDIA_TYPES = (ARROW_STREAM_MEDIA_TYPE, PARQUET_MEDIA_TYPE, JSON_MEDIA_TYPE)
+
+
+def negotiate_format(request: Request) -> str:
+    """
+    Picks the response media type from the Accept header.
+
+    Media ranges are tried in order of their q-value; anything we can't serve
+    (including */* and a missing header) gets JSON.
+    """
+    accept = request.headers.get("accept", "")
+    ranges = []
+    for position, media_range in enumerate(accept.split(",")):
+        media_type, *params = [part.strip() for part in media_range.split(";")]
+        quality = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        ranges.append((-quality, position, media_type.lower()))
+
+    for negative_quality, _, media_type in sorted(ranges):
+        if negative_quality < 0 and media_type in SUPPORTED_MEDIA_TYPES:
+            return media_type
+    return JSON_MEDIA_TYPE
+
+
+def iter_arrow_stream(reader: pa.RecordBatchReader) -> Iterator[bytes]:
+    """
+    Encodes record batches as an Arrow IPC stream, one chunk per batch.
+
+    Batches are written as they are pulled from `reader`, so the full result is
+    never materialized.
+    """
+    sink = io.BytesIO()
+
+    def drain() -> bytes:
+        chunk = sink.getvalue()
+        sink.seek(0)
+        sink.truncate()
+        return chunk
+
+    with pa.ipc.new_stream(sink, reader.schema) as writer:
+        yield drain()  # schema message
+        for batch in reader:
+            writer.write_batch(batch)
+            yield drain()
+    yield drain()  # end-of-stream marker
+
+
+class ClosingIterator:
+    """
+    Wraps a body iterator so `on_close` runs exactly once: when the iterator is
+    exhausted or fails, or when `close()` is called, even if iteration never
+    started. `close()` waits for a chunk being produced in another thread, so
+    the resources behind the iterator are never released while still in use.
+    """
+
+    def __init__(self, iterator: Iterator[bytes], on_close: Callable[[], None]):
+        self._iterator = iterator
+        self._on_close = on_close
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def __iter__(self) -> "ClosingIterator":
+        return self
+
+    def __next__(self) -> bytes:
+        with self._lock:
+            if self._closed:
+                raise StopIteration
+            try:
+                return next(self._iterator)
+            except BaseException:
+                self._close()
+                raise
+
+    def close(self) -> None:
+        with self._lock:
+            self._close()
+
+    def _close(self) -> None:
+        # Caller holds self._lock
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            close = getattr(self._iterator, "close", None)
+            if close is not None:
+                close()
+        finally:
+            self._on_close()
+
+
+class ClosingStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse that closes its ClosingIterator however the response
+    ends: fully sent, client disconnected before the first chunk, or cancelled.
+    """
+
+    def __init__(self, content: ClosingIterator, **kwargs: Any):
+        super().__init__(content, **kwargs)
+        self.closing_iterator = content
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            # Shielded: on a disconnect the surrounding scope is already cancelled
+            with anyio.CancelScope(shield=True):
+                await run_in_threadpool(self.closing_iterator.close)
+
+
+def arrow_stream_response(
+    reader: pa.RecordBatchReader, on_close: Optional[Callable[[], None]] = None
+) -> StreamingResponse:
+    """
+    Streams `reader` as Arrow IPC. `on_close` (e.g. returning the DuckDB cursor
+    to the pool) runs once the stream ends or the client goes away.
+    """
+    if on_close is None:
+        return StreamingResponse(iter_arrow_stream(reader), media_type=ARROW_STREAM_MEDIA_TYPE)
+    return ClosingStreamingResponse(
+        ClosingIterator(iter_arrow_stream(reader), on_close),
+        media_type=ARROW_STREAM_MEDIA_TYPE,
+    )
+
+
+def parquet_response(table: pa.Table) -> Response:
+    """Parquet needs its footer written last, so the file is built in memory."""
+    import pyarrow.parquet as pq  # Loaded on first use (see API_PRELOAD_MODULES)
+
+    sink = pa.BufferOutputStream()
+    pq.write_table(table, sink)
+    return Response(sink.getvalue().to_pybytes(), media_type=PARQUET_MEDIA_TYPE)
+
+
+def columnar_json(table: pa.Table) -> bytes:
+    """
+    Serializes an Arrow table as `{"column": [values...], ...}`.
+
+    Encoding runs in Polars' JSON writer over whole columns, so no per-row
+    Python dicts are created. Decimals are emitted as JSON numbers, matching
+    FastAPI's default encoding of Decimal.
+    """
+    import polars as pl  # Loaded on first use (see API_PRELOAD_MODULES)
+
+    df = pl.from_arrow(table) if table.num_columns else pl.DataFrame()
+    df = df.with_columns(pl.col(pl.Decimal).cast(pl.Float64))
+    buffer = io.BytesIO()
+    df.select(pl.all().implode()).write_ndjson(buffer)
+    payload = buffer.getvalue().rstrip(b"\n")
+    return payload if df.width else b"{}"
+
+
+def columnar_json_response(table: pa.Table) -> Response:
+    """
+    JSON body: `{"columns": [...], "num_rows": n, "data": {"column": [...]}}`.
+    """
+    body = b"".join(
+        [
+            b'{"columns":',
+            json.dumps(table.column_names).encode(),
+            b',"num_rows":',
+            str(table.num_rows).encode(),
+            b',"data":',
+            columnar_json(table),
+            b"}",
+        ]
+    )
+    return Response(body, media_type=JSON_MEDIA_TYPE)
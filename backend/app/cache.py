@@ -0,0 +1,251 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import pyarrow as pa
+
+from backend.app.config import GOLD_CACHE_ENABLED, GOLD_CACHE_MAX_BYTES
+from backend.app.metrics import GOLD_DELTA_SNAPSHOT_FILES
+from backend.etl.config import GOLD_PATH
+from backend.shared.logging_config import get_logger
+
+logger = get_logger("api_cache")
+
+
+def delta_table_version(table_path: Path) -> Optional[int]:
+    """
+    Returns the latest committed version of a Delta table by listing `_delta_log`.
+
+    This is much cheaper than opening the table: no log replay, no Parquet reads.
+    Returns None if the path is not a Delta table (yet).
+    """
+    log_dir = Path(table_path) / "_delta_log"
+    try:
+        versions = [
+            int(entry.name[:-5])
+            for entry in log_dir.iterdir()
+            if entry.name.endswith(".json") and entry.name[:-5].isdigit()
+        ]
+    except FileNotFoundError:
+        return None
+    return max(versions) if versions else None
+
+
+def delta_partition_values(table_path: Path, column: str) -> List[str]:
+    """
+    Sorted distinct values of partition `column`, read from the Delta log only.
+
+    Returns [] if the table is missing or not partitioned on `column`.
+    """
+    if delta_table_version(table_path) is None:
+        return []
+    from deltalake import DeltaTable
+
+    dt = DeltaTable(str(table_path))
+    if column not in dt.metadata().partition_columns:
+        return []
+    return sorted(
+        {p[column] for p in dt.partitions() if p.get(column) is not None}
+    )
+
+
+@lru_cache(maxsize=256)
+def delta_file_count(table_path: str, version: int) -> int:
+    """Number of data files in a Delta table snapshot, memoized per version."""
+    from deltalake import DeltaTable
+
+    return len(DeltaTable(table_path, version=version).file_uris())
+
+
+@dataclass
+class CachedTable:
+    version: int
+    table: pa.Table
+
+    @property
+    def nbytes(self) -> int:
+        return self.table.nbytes
+
+
+class GoldTableCache:
+    """
+    In-memory cache of Gold Delta tables as Arrow tables, keyed on the Delta version.
+
+    Every lookup probes `_delta_log` for the latest version. A hit is served from
+    memory; a new commit triggers a reload of that table only. Entries are evicted
+    least-recently-used once the memory budget is exceeded. A table version larger
+    than the whole budget is remembered and not loaded again; callers query it
+    from Delta directly.
+    """
+
+    def __init__(self, root: Path = GOLD_PATH, max_bytes: int = GOLD_CACHE_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+
+        self._entries: "OrderedDict[str, CachedTable]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks: Dict[str, threading.Lock] = {}
+        # (table, column) -> (version, partition values)
+        self._partitions: Dict[Tuple[str, str], Tuple[int, List[str]]] = {}
+        # table -> version known to exceed max_bytes
+        self._oversized: Dict[str, int] = {}
+
+        # Metrics
+        self._hits = 0
+        self._misses = 0
+        self._reloads = 0
+        self._evictions = 0
+
+    @property
+    def current_bytes(self) -> int:
+        return sum(entry.nbytes for entry in self._entries.values())
+
+    def version(self, table_name: str) -> Optional[int]:
+        return delta_table_version(self.root / table_name)
+
+    def get(self, table_name: str) -> Optional[CachedTable]:
+        """
+        Returns the current snapshot of a Gold table, or None if it does not exist
+        or is too large to cache (the caller then scans the Delta table).
+        """
+        table_path = self.root / table_name
+        version = delta_table_version(table_path)
+        if version is None:
+            return None
+
+        with self._lock:
+            entry = self._lookup(table_name, version)
+            if entry is not None:
+                return entry
+            if self._oversized.get(table_name) == version:
+                return None
+            load_lock = self._load_locks.setdefault(table_name, threading.Lock())
+
+        # Serialize loads per table so concurrent misses read the Delta table once
+        with load_lock:
+            with self._lock:
+                entry = self._lookup(table_name, version, count_hit=False)
+                if entry is not None:
+                    self._hits += 1
+                    return entry
+                if self._oversized.get(table_name) == version:
+                    return None
+                if table_name in self._entries:
+                    self._reloads += 1
+                else:
+                    self._misses += 1
+
+            from deltalake import DeltaTable
+
+            dt = DeltaTable(str(table_path), version=version)
+            entry = CachedTable(version=version, table=dt.to_pyarrow_table())
+            GOLD_DELTA_SNAPSHOT_FILES.labels(table_name).inc(len(dt.file_uris()))
+            logger.info(
+                "gold_cache_loaded",
+                table=table_name,
+                version=version,
+                rows=entry.table.num_rows,
+                bytes=entry.nbytes,
+            )
+
+            with self._lock:
+                self._store(table_name, entry)
+        return entry
+
+    def partition_values(self, table_name: str, column: str) -> List[str]:
+        """
+        `delta_partition_values` for a Gold table, memoized per Delta version.
+        """
+        version = delta_table_version(self.root / table_name)
+        if version is None:
+            return []
+        key = (table_name, column)
+        with self._lock:
+            memo = self._partitions.get(key)
+            if memo is not None and memo[0] == version:
+                return memo[1]
+        values = delta_partition_values(self.root / table_name, column)
+        with self._lock:
+            self._partitions[key] = (version, values)
+        return values
+
+    def invalidate(self, table_name: Optional[str] = None) -> None:
+        with self._lock:
+            if table_name is None:
+                self._entries.clear()
+                self._partitions.clear()
+                self._oversized.clear()
+            else:
+                self._entries.pop(table_name, None)
+                self._oversized.pop(table_name, None)
+                for key in [k for k in self._partitions if k[0] == table_name]:
+                    del self._partitions[key]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "reloads": self._reloads,
+                "evictions": self._evictions,
+                "tables": {
+                    name: {"version": entry.version, "bytes": entry.nbytes}
+                    for name, entry in self._entries.items()
+                },
+                "oversized": dict(self._oversized),
+            }
+
+    def _lookup(self, table_name: str, version: int, count_hit: bool = True) -> Optional[CachedTable]:
+        # Caller holds self._lock
+        entry = self._entries.get(table_name)
+        if entry is None or entry.version != version:
+            return None
+        self._entries.move_to_end(table_name)
+        if count_hit:
+            self._hits += 1
+        return entry
+
+    def _store(self, table_name: str, entry: CachedTable) -> None:
+        # Caller holds self._lock
+        self._entries.pop(table_name, None)
+        if entry.nbytes > self.max_bytes:
+            # Larger than the whole budget: serve it this once, but don't keep it,
+            # and don't load this version again (get() returns None for it)
+            self._oversized[table_name] = entry.version
+            logger.warning(
+                "gold_cache_entry_too_large",
+                table=table_name,
+                version=entry.version,
+                bytes=entry.nbytes,
+                max_bytes=self.max_bytes,
+            )
+            return
+
+        self._oversized.pop(table_name, None)
+        self._entries[table_name] = entry
+        while self.current_bytes > self.max_bytes:
+            evicted, _ = self._entries.popitem(last=False)
+            self._evictions += 1
+            logger.info("gold_cache_evicted", table=evicted)
+
+
+_cache: Optional[GoldTableCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_gold_cache() -> Optional[GoldTableCache]:
+    """Returns the process-wide Gold cache, or None when caching is disabled."""
+    global _cache
+    if not GOLD_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = GoldTableCache()
+    return _cache
@@ -0,0 +1,41 @@
+import os
+
+# API runtime configuration
+# Values come from env vars so they can be tuned per Container App revision.
+
+# DuckDB connection pool
+DUCKDB_POOL_SIZE = int(os.getenv("DUCKDB_POOL_SIZE", "8"))
+DUCKDB_POOL_TIMEOUT_SECONDS = float(os.getenv("DUCKDB_POOL_TIMEOUT_SECONDS", "5"))
+DUCKDB_DATABASE = os.getenv("DUCKDB_DATABASE", ":memory:")
+DUCKDB_EXTENSIONS = [
+    ext.strip()
+    for ext in os.getenv("DUCKDB_EXTENSIONS", "delta").split(",")
+    if ext.strip()
+]
+
+# Gold table cache
+GOLD_CACHE_ENABLED = os.getenv("GOLD_CACHE_ENABLED", "true").lower() == "true"
+GOLD_CACHE_MAX_BYTES = int(os.getenv("GOLD_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+
+# Query layer
+# Queries running longer than this are interrupted in DuckDB (0 disables)
+QUERY_TIMEOUT_SECONDS = float(os.getenv("QUERY_TIMEOUT_SECONDS", "15"))
+# At most this many queries run at once; others wait briefly, then get a 503
+QUERY_MAX_CONCURRENT = int(os.getenv("QUERY_MAX_CONCURRENT", str(DUCKDB_POOL_SIZE)))
+QUERY_QUEUE_TIMEOUT_SECONDS = float(os.getenv("QUERY_QUEUE_TIMEOUT_SECONDS", "0.25"))
+
+# HTTP responses
+# Bodies at least this large are gzip-compressed when the client accepts it
+API_GZIP_MIN_BYTES = int(os.getenv("API_GZIP_MIN_BYTES", "1024"))
+
+# Metrics
+# Per-route latency/size histograms for /metrics (the endpoint itself is always served)
+API_METRICS_ENABLED = os.getenv("API_METRICS_ENABLED", "true").lower() == "true"
+
+# Startup
+# Heavy modules imported in the background once the API is ready (empty disables)
+API_PRELOAD_MODULES = [
+    name.strip()
+    for name in os.getenv("API_PRELOAD_MODULES", "polars,deltalake,pyarrow.parquet").split(",")
+    if name.strip()
+]
@@ -0,0 +1,183 @@
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+import duckdb
+
+from backend.app.config import (
+    DUCKDB_DATABASE,
+    DUCKDB_EXTENSIONS,
+    DUCKDB_POOL_SIZE,
+    DUCKDB_POOL_TIMEOUT_SECONDS,
+)
+from backend.shared.logging_config import get_logger
+
+logger = get_logger("api_db")
+
+
+class PoolExhaustedError(RuntimeError):
+    """Raised when no DuckDB cursor becomes available within the checkout timeout."""
+
+
+class DuckDBPool:
+    """
+    Application-lifetime DuckDB database with a bounded pool of cursors.
+
+    A single database is opened (and its extensions loaded) once. Each request
+    checks out one of `size` cursors, which DuckDB runs concurrently against the
+    shared database, and returns it when done.
+    """
+
+    def __init__(
+        self,
+        size: int = DUCKDB_POOL_SIZE,
+        database: str = DUCKDB_DATABASE,
+        extensions: Optional[List[str]] = None,
+        checkout_timeout: float = DUCKDB_POOL_TIMEOUT_SECONDS,
+    ):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self.size = size
+        self.database = database
+        self.extensions = DUCKDB_EXTENSIONS if extensions is None else extensions
+        self.checkout_timeout = checkout_timeout
+
+        self._con: Optional[duckdb.DuckDBPyConnection] = None
+        self._cursors: "queue.LifoQueue[duckdb.DuckDBPyConnection]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self.loaded_extensions: List[str] = []
+
+        # Metrics
+        self._checkouts = 0
+        self._timeouts = 0
+        self._in_use = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    @property
+    def is_open(self) -> bool:
+        return self._con is not None
+
+    def open(self) -> None:
+        """Creates the database, loads extensions and fills the cursor pool."""
+        with self._lock:
+            if self._con is not None:
+                return
+
+            con = duckdb.connect(self.database)
+            for ext in self.extensions:
+                # Extensions are installed/loaded once per process, not per request.
+                try:
+                    con.execute(f"INSTALL {ext};")
+                    con.execute(f"LOAD {ext};")
+                    self.loaded_extensions.append(ext)
+                except Exception as e:
+                    logger.warning("duckdb_extension_load_failed", extension=ext, error=str(e))
+
+            for _ in range(self.size):
+                self._cursors.put(con.cursor())
+            self._con = con
+
+        logger.info(
+            "duckdb_pool_opened",
+            size=self.size,
+            database=self.database,
+            extensions=self.loaded_extensions,
+        )
+
+    def close(self) -> None:
+        """Closes all pooled cursors and the underlying database."""
+        with self._lock:
+            if self._con is None:
+                return
+            while True:
+                try:
+                    self._cursors.get_nowait().close()
+                except queue.Empty:
+                    break
+            self._con.close()
+            self._con = None
+            self.loaded_extensions = []
+        logger.info("duckdb_pool_closed")
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None) -> Iterator[duckdb.DuckDBPyConnection]:
+        """
+        Checks out a cursor for the duration of the block.
+
+        Raises:
+            PoolExhaustedError: If no cursor is free within `timeout` seconds.
+        """
+        if self._con is None:
+            self.open()
+
+        timeout = self.checkout_timeout if timeout is None else timeout
+        started = time.perf_counter()
+        try:
+            cursor = self._cursors.get(timeout=timeout)
+        except queue.Empty:
+            with self._lock:
+                self._timeouts += 1
+            raise PoolExhaustedError(
+                f"No DuckDB connection available after {timeout:.1f}s (pool size {self.size})"
+            )
+        waited = time.perf_counter() - started
+
+        with self._lock:
+            self._checkouts += 1
+            self._in_use += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+
+        try:
+            yield cursor
+        finally:
+            with self._lock:
+                self._in_use -= 1
+            self._cursors.put(cursor)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns pool sizing metrics."""
+        with self._lock:
+            checkouts = self._checkouts
+            return {
+                "size": self.size,
+                "in_use": self._in_use,
+                "available": self.size - self._in_use if self._con is not None else 0,
+                "checkouts": checkouts,
+                "timeouts": self._timeouts,
+                "wait_seconds_total": round(self._wait_total, 6),
+                "wait_seconds_avg": round(self._wait_total / checkouts, 6) if checkouts else 0.0,
+                "wait_seconds_max": round(self._wait_max, 6),
+                "extensions": list(self.loaded_extensions),
+            }
+
+
+_pool: Optional[DuckDBPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> DuckDBPool:
+    """Returns the process-wide pool, creating it lazily outside of the app lifespan."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = DuckDBPool()
+    return _pool
+
+
+def init_pool() -> DuckDBPool:
+    pool = get_pool()
+    pool.open()
+    return pool
+
+
+def close_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
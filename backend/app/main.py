@@ -1,11 +1,77 @@
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from backend.app.api import endpoints
+from backend.shared.startup import ImportTimer, process_age_seconds
+
+# Timed for the api_ready log. Polars, deltalake and pyarrow.parquet are not
+# imported here; they load on first use or in the background once ready.
+with ImportTimer() as _imports:
+    import importlib
+    import threading
+    import time
+    from contextlib import asynccontextmanager
+    from typing import List
+    from fastapi import FastAPI, Request
+    from fastapi.responses import Response
+    from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.middleware.gzip import GZipMiddleware
+    from backend.app.api import endpoints
+    from backend.app.cache import get_gold_cache
+    from backend.app.config import API_GZIP_MIN_BYTES, API_METRICS_ENABLED, API_PRELOAD_MODULES
+    from backend.app.db import close_pool, get_pool, init_pool
+    from backend.app.metrics import CONTENT_TYPE, REGISTRY, MetricsMiddleware
+    from backend.app.query import get_query_limiter, get_single_flight
+    from backend.shared.logging_config import configure_logger, flush_logs, get_logger
+
+logger = get_logger("api")
+
+
+def preload_modules(names: List[str]) -> threading.Thread:
+    """
+    Imports `names` on a background thread, so the first request that needs
+    them doesn't pay for the import and readiness doesn't wait for it either.
+    """
+
+    def run() -> None:
+        seconds = {}
+        for name in names:
+            started = time.perf_counter()
+            try:
+                importlib.import_module(name)
+            except ImportError as e:
+                logger.warning("module_preload_failed", module=name, error=str(e))
+                continue
+            seconds[name] = round(time.perf_counter() - started, 3)
+        logger.info("modules_preloaded", seconds=seconds)
+
+    thread = threading.Thread(target=run, name="module-preload", daemon=True)
+    thread.start()
+    return thread
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    started = time.perf_counter()
+    # LOG_* env vars pick the format and the (optional) fast, non-blocking mode
+    configure_logger()
+    # One DuckDB database (with the Delta extension loaded) for the app lifetime
+    init_pool()
+    logger.info(
+        "api_ready",
+        startup_seconds=process_age_seconds(),
+        import_seconds=round(_imports.total_seconds, 3),
+        imports=_imports.top(),
+        lifespan_seconds=round(time.perf_counter() - started, 3),
+    )
+    if API_PRELOAD_MODULES:
+        preload_modules(API_PRELOAD_MODULES)
+    yield
+    close_pool()
+    flush_logs()
+
 
 app = FastAPI(
     title="Oxford Nexus API",
     description="API for the Banking Executive Dashboard (Lakehouse Backend)",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS Configuration
@@ -23,8 +89,32 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large JSON payloads (ETags are weak, so they survive re-encoding)
+app.add_middleware(GZipMiddleware, minimum_size=API_GZIP_MIN_BYTES)
+
+
+@app.middleware("http")
+async def add_etag_header(request: Request, call_next):
+    """Adds the ETag computed by the route's gold_etag dependency to 200 responses."""
+    response = await call_next(request)
+    etag = getattr(request.state, "etag", None)
+    if etag is not None and response.status_code == 200:
+        response.headers["ETag"] = etag
+        # Clients may store the response but must revalidate with If-None-Match
+        response.headers.setdefault("Cache-Control", "no-cache")
+        # Body depends on content negotiation as well as the encoding
+        vary = response.headers.get("Vary")
+        response.headers["Vary"] = f"{vary}, Accept" if vary else "Accept"
+    return response
+
+
+# Outermost, so latency and response sizes cover every other middleware
+if API_METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+
 # Include API Router
-app.include_router(endpoints.router, prefix="/api/v1")
+app.include_router(endpoints.router)
 
 
 @app.get("/health")
@@ -33,6 +123,72 @@ def health_check():
     return {"status": "ok", "service": "Oxford Nexus Backend"}
 
 
+@app.get("/health/db")
+def db_pool_stats():
+    """DuckDB connection pool metrics (size, checkouts, wait times) for capacity sizing."""
+    return get_pool().stats()
+
+
+@app.get("/health/cache")
+def gold_cache_stats():
+    """Gold table cache metrics (hits, misses, reloads, evictions, memory use)."""
+    cache = get_gold_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
+
+@app.get("/health/queries")
+def query_layer_stats():
+    """Query concurrency limiter and request coalescing metrics."""
+    return {
+        "limiter": get_query_limiter().stats(),
+        "single_flight": get_single_flight().stats(),
+    }
+
+
+def collect_health_stats():
+    """Exports the /health/* counters (pool, cache, query layer) on each scrape."""
+    pool = get_pool().stats()
+    yield "duckdb_pool_in_use", "gauge", "Pooled DuckDB cursors checked out.", [({}, pool["in_use"])]
+    yield "duckdb_pool_checkouts_total", "counter", "Cursor checkouts.", [({}, pool["checkouts"])]
+    yield "duckdb_pool_timeouts_total", "counter", "Checkouts that timed out.", [({}, pool["timeouts"])]
+    yield "duckdb_pool_wait_seconds_total", "counter", "Time spent waiting for a cursor.", [
+        ({}, pool["wait_seconds_total"])
+    ]
+
+    limiter = get_query_limiter().stats()
+    yield "gold_queries_active", "gauge", "Queries holding a limiter slot.", [({}, limiter["active"])]
+    yield "gold_queries_rejected_total", "counter", "Queries rejected with a 503.", [
+        ({}, limiter["rejected"])
+    ]
+    single_flight = get_single_flight().stats()
+    yield "gold_queries_coalesced_total", "counter", "Queries served by an identical in-flight one.", [
+        ({}, single_flight["coalesced"])
+    ]
+
+    cache = get_gold_cache()
+    if cache is not None:
+        stats = cache.stats()
+        yield "gold_cache_bytes", "gauge", "Memory held by the Gold cache.", [({}, stats["bytes"])]
+        yield "gold_cache_lookups_total", "counter", "Gold cache lookups by result.", [
+            ({"result": result}, stats[key])
+            for result, key in (("hit", "hits"), ("miss", "misses"), ("reload", "reloads"))
+        ]
+        yield "gold_cache_evictions_total", "counter", "Gold cache evictions.", [
+            ({}, stats["evictions"])
+        ]
+
+
+REGISTRY.add_collector(collect_health_stats)
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Request, query and pool/cache metrics in the Prometheus text format."""
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -0,0 +1,331 @@
+import bisect
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+
+# Prometheus text exposition format, version 0.0.4
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; covers cached KPI lookups (~1ms) up to the query timeout
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+SIZE_BUCKETS = tuple(float(4**i * 256) for i in range(10))  # 256 B .. 64 MiB
+ROW_BUCKETS = (1, 10, 100, 1_000, 10_000, 100_000, 1_000_000)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """
+    A metric family: one child per combination of label values.
+
+    Children are created on first use and cached, so the hot path is a dict
+    lookup plus the child's own lock.
+    """
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: Any) -> Any:
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _new_child(self) -> Any:
+        raise NotImplementedError
+
+    def _default(self) -> Any:
+        # The unlabelled child, for families without labels
+        return self.labels()
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            children = list(self._children.items())
+        for values, child in sorted(children):
+            yield from child.samples(self.name, self.labelnames, values)
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class _CounterChild:
+    def __init__(self) -> None:
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def samples(self, name: str, labelnames: Sequence[str], values: Sequence[str]) -> Iterable[str]:
+        yield f"{name}{_format_labels(labelnames, values)} {_format_value(self._value)}"
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1) -> None:
+        self._default().inc(amount)
+
+
+class _GaugeChild(_CounterChild):
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        self.inc(-amount)
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self._value = value
+
+
+class Gauge(_Metric):
+    type_name = "gauge"
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+    def inc(self, amount: float = 1) -> None:
+        self._default().inc(amount)
+
+    def dec(self, amount: float = 1) -> None:
+        self._default().dec(amount)
+
+    def set(self, value: float) -> None:
+        self._default().set(value)
+
+
+class _HistogramChild:
+    def __init__(self, buckets: Tuple[float, ...]) -> None:
+        self._buckets = buckets
+        # Per-bucket (not cumulative) counts; the last slot is +Inf
+        self._counts = [0] * (len(buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self._buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    @property
+    def count(self) -> int:
+        return sum(self._counts)
+
+    def samples(self, name: str, labelnames: Sequence[str], values: Sequence[str]) -> Iterable[str]:
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+        cumulative = 0
+        for bound, count in zip(self._buckets + (float("inf"),), counts):
+            cumulative += count
+            le = f'le="{_format_value(bound)}"'
+            yield f"{name}_bucket{_format_labels(labelnames, values, le)} {cumulative}"
+        yield f"{name}_sum{_format_labels(labelnames, values)} {_format_value(total)}"
+        yield f"{name}_count{_format_labels(labelnames, values)} {cumulative}"
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(b) for b in buckets))
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default().observe(value)
+
+
+# A collector returns (name, type, help, [(labels, value), ...]) families read at scrape time
+Collector = Callable[[], Iterable[Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]]]
+
+
+class Registry:
+    """Holds metric families and scrape-time collectors and renders them as text."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Collector] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def add_collector(self, collector: Collector) -> None:
+        """Adds a callable polled on every scrape (e.g. to export existing stats())."""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        blocks = [metric.render() for metric in metrics]
+        for collector in collectors:
+            for name, type_name, documentation, samples in collector():
+                lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {type_name}"]
+                for labels, value in samples:
+                    formatted = _format_labels(list(labels), list(labels.values()))
+                    lines.append(f"{name}{formatted} {_format_value(value)}")
+                blocks.append("\n".join(lines))
+        return "\n".join(blocks) + "\n"
+
+
+REGISTRY = Registry()
+
+# HTTP layer (recorded by MetricsMiddleware)
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    "http_request_duration_seconds",
+    "Time from request start to the last response byte, by route template.",
+    ("method", "route", "status"),
+)
+HTTP_REQUESTS_IN_FLIGHT = REGISTRY.gauge(
+    "http_requests_in_flight", "Requests currently being served."
+)
+HTTP_RESPONSE_SIZE = REGISTRY.histogram(
+    "http_response_size_bytes",
+    "Response body size as sent (after compression), by route template.",
+    ("method", "route"),
+    SIZE_BUCKETS,
+)
+
+# Query layer (recorded by the Gold query helpers)
+GOLD_QUERY_DURATION = REGISTRY.histogram(
+    "gold_query_duration_seconds",
+    "DuckDB execution time of Gold queries.",
+    ("table",),
+)
+GOLD_RESULT_FETCH_DURATION = REGISTRY.histogram(
+    "gold_result_fetch_seconds",
+    "Time to fetch a Gold query's result and convert it to rows or Arrow.",
+    ("table",),
+)
+GOLD_QUERY_ROWS = REGISTRY.histogram(
+    "gold_query_rows", "Rows returned by Gold queries.", ("table",), ROW_BUCKETS
+)
+GOLD_DELTA_SNAPSHOT_FILES = REGISTRY.counter(
+    "gold_delta_snapshot_files_total",
+    "Data files in the Delta snapshots Gold cache loads and uncached scans ran over "
+    "(uncached scans may prune some of them).",
+    ("table",),
+)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording latency, in-flight requests and response sizes.
+
+    A plain ASGI wrapper (not BaseHTTPMiddleware) keeps the per-request cost to
+    a couple of clock reads and counter updates. Requests are labelled with the
+    matched route's template (`/api/v1/kpis`), never the raw path, so the
+    number of series stays bounded; anything unrouted is `unmatched`.
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        in_flight = HTTP_REQUESTS_IN_FLIGHT._default()
+        in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_flight.dec()
+            route = _route_template(scope)
+            method = scope["method"]
+            HTTP_REQUEST_DURATION.labels(method, route, status).observe(
+                time.perf_counter() - started
+            )
+            HTTP_RESPONSE_SIZE.labels(method, route).observe(size)
+
+
+def _route_template(scope: Dict[str, Any]) -> str:
+    # The router stores the matched route in the (shared) scope
+    return getattr(scope.get("route"), "path", None) or "unmatched"
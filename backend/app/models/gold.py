@@ -17,6 +17,12 @@ class DimensionType(str, Enum):
     Officer = "Officer"
 
 
+class LeaderboardMetric(str, Enum):
+    balance = "balance"
+    net_flow_mom = "net_flow_mom"
+    growth_ytd = "growth_ytd"
+
+
 class FactHouseholdMonthly(BaseModel):
     """
     Gold Layer: Monthly snapshots of household performance.
@@ -34,12 +40,15 @@ class FactHouseholdMonthly(BaseModel):
 class DimOfficer(BaseModel):
     """
     Gold Layer: Slowly Changing Dimension (Type 2) for officers.
+    end_date is exclusive; the current row has end_date None and is_current True.
     """
 
     officer_key: str
+    officer_name: str
     current_team: str
     effective_date: date
     end_date: Optional[date] = None
+    is_current: bool = True
 
 
 class AggKpiDaily(BaseModel):
@@ -52,3 +61,38 @@ class AggKpiDaily(BaseModel):
     dimension_type: DimensionType
     dimension_value: str
     value: Decimal = Field(..., max_digits=18, decimal_places=2)
+
+
+class AggOfficerLeaderboard(BaseModel):
+    """
+    Gold Layer: Officers pre-ranked per metric, one row per (date, metric, officer).
+    """
+
+    report_date: date
+    metric: LeaderboardMetric
+    rank_desc: int = Field(..., description="1 = highest value")
+    rank_asc: int = Field(..., description="1 = lowest value")
+    officer_code: str
+    officer_name: Optional[str] = None
+    team_id: str
+    value: Decimal = Field(..., max_digits=18, decimal_places=2)
+    balance: Decimal = Field(..., max_digits=18, decimal_places=2)
+    net_flow_mom: Decimal = Field(..., max_digits=18, decimal_places=2)
+    growth_ytd: Decimal = Field(..., max_digits=18, decimal_places=2)
+    household_count: int
+
+
+class AggFlowWaterfall(BaseModel):
+    """
+    Gold Layer: Monthly flow buckets per dimension.
+    start_balance + increases + decreases = end_balance for every row.
+    """
+
+    date_key: int = Field(..., description="YYYYMM")
+    dimension_type: DimensionType
+    dimension_value: str
+    start_balance: Decimal = Field(..., max_digits=18, decimal_places=2)
+    increases: Decimal = Field(..., max_digits=18, decimal_places=2)
+    decreases: Decimal = Field(..., max_digits=18, decimal_places=2)
+    end_balance: Decimal = Field(..., max_digits=18, decimal_places=2)
+    household_count: int
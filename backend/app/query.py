@@ -0,0 +1,204 @@
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional
+
+import duckdb
+
+from backend.app.config import (
+    QUERY_MAX_CONCURRENT,
+    QUERY_QUEUE_TIMEOUT_SECONDS,
+)
+from backend.shared.logging_config import get_logger
+
+logger = get_logger("api_query")
+
+
+class QueryTimeoutError(RuntimeError):
+    """Raised when a query was interrupted for running past its timeout."""
+
+
+class QueryRejectedError(RuntimeError):
+    """Raised when the concurrency limit is reached and no slot frees up in time."""
+
+
+@contextmanager
+def interrupt_after(con: duckdb.DuckDBPyConnection, seconds: Optional[float]) -> Iterator[None]:
+    """
+    Interrupts whatever `con` is executing once `seconds` have passed.
+
+    DuckDB stops the query and raises InterruptException, which is turned into
+    QueryTimeoutError. The interrupt is only sent while the block is running, so
+    a late timer can never cancel the cursor's next query.
+    """
+    if not seconds or seconds <= 0:
+        yield
+        return
+
+    lock = threading.Lock()
+    state = {"running": True, "fired": False}
+
+    def fire() -> None:
+        with lock:
+            if state["running"]:
+                state["fired"] = True
+                con.interrupt()
+
+    timer = threading.Timer(seconds, fire)
+    timer.daemon = True
+    timer.start()
+    try:
+        yield
+    except duckdb.InterruptException as e:
+        if state["fired"]:
+            logger.warning("query_timed_out", timeout_seconds=seconds)
+            raise QueryTimeoutError(f"Query cancelled after {seconds:.1f}s") from e
+        raise
+    finally:
+        with lock:
+            state["running"] = False
+        timer.cancel()
+
+
+class ConcurrencyLimiter:
+    """
+    Caps the number of queries running at once.
+
+    A request waits at most `queue_timeout` seconds for a slot and is otherwise
+    rejected, so overload shows up as fast 503s rather than a growing queue.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = QUERY_MAX_CONCURRENT,
+        queue_timeout: float = QUERY_QUEUE_TIMEOUT_SECONDS,
+    ):
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        self.max_concurrent = max_concurrent
+        self.queue_timeout = queue_timeout
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+
+        # Metrics
+        self._active = 0
+        self._admitted = 0
+        self._rejected = 0
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """
+        Holds one query slot for the duration of the block.
+
+        Raises:
+            QueryRejectedError: If no slot is free within `queue_timeout` seconds.
+        """
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            with self._lock:
+                self._rejected += 1
+            logger.warning("query_rejected", max_concurrent=self.max_concurrent)
+            raise QueryRejectedError(
+                f"Too many concurrent queries (limit {self.max_concurrent})"
+            )
+        with self._lock:
+            self._active += 1
+            self._admitted += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._active -= 1
+            self._slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_concurrent": self.max_concurrent,
+                "queue_timeout_seconds": self.queue_timeout,
+                "active": self._active,
+                "admitted": self._admitted,
+                "rejected": self._rejected,
+            }
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesces identical in-flight calls: the first caller for a key runs the
+    function, callers arriving while it runs wait and share its result (or error).
+
+    Nothing is cached once the call completes; the next caller runs again.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+        # Metrics
+        self._executions = 0
+        self._coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._executions += 1
+            else:
+                self._coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "executions": self._executions,
+                "coalesced": self._coalesced,
+            }
+
+
+_limiter: Optional[ConcurrencyLimiter] = None
+_single_flight: Optional[SingleFlight] = None
+_singletons_lock = threading.Lock()
+
+
+def get_query_limiter() -> ConcurrencyLimiter:
+    """Returns the process-wide query concurrency limiter."""
+    global _limiter
+    if _limiter is None:
+        with _singletons_lock:
+            if _limiter is None:
+                _limiter = ConcurrencyLimiter()
+    return _limiter
+
+
+def get_single_flight() -> SingleFlight:
+    """Returns the process-wide single-flight group for Gold queries."""
+    global _single_flight
+    if _single_flight is None:
+        with _singletons_lock:
+            if _single_flight is None:
+                _single_flight = SingleFlight()
+    return _single_flight
@@ -8,9 +8,62 @@ BRONZE_PATH = BASE_DIR / "bronze"
 SILVER_PATH = BASE_DIR / "silver"
 GOLD_PATH = BASE_DIR / "gold"
 
+# Bronze table the source report is appended to
+BRONZE_TABLE = "raw_household_balances"
+# Row hashes of every source row per batch: Bronze stores each row once, so a
+# batch's full snapshot is its own rows plus the listed rows of earlier batches.
+# Each hash is listed with the ingestion_id of the batch storing the row.
+BRONZE_SNAPSHOT_TABLE = "snapshot_rows"
+# Commit metadata linking Silver and Gold: the as_of_dates a Silver households
+# commit wrote, and the Silver households version a Gold KPI commit was built from
+SILVER_DATES_METADATA_KEY = "as_of_dates"
+GOLD_SOURCE_VERSION_METADATA_KEY = "silver_households_version"
+
 # Source configuration
-# For the transitional phase, we point to the local file in the frontend public dir
-SOURCE_FILE_PATH = Path("../../ux/public/data/household-balance-report.xlsx")
+# For the transitional phase, we point to the local file in the frontend public dir.
+# A .parquet source (e.g. from scripts/create_dummy_data.py) is read as-is, which
+# is how benchmarks feed row counts beyond the xlsx sheet limit.
+SOURCE_FILE_PATH = Path(
+    os.getenv("SOURCE_FILE_PATH", "../../ux/public/data/household-balance-report.xlsx")
+)
+
+# Reference data maintained with the code (team definitions, officer -> team map)
+REFERENCE_DATA_PATH = Path(
+    os.getenv("REFERENCE_DATA_PATH", str(Path(__file__).parent / "reference_data"))
+)
+
+# Ingestion configuration
+# "calamine" loads the sheet once through fastexcel with a declared text schema and
+# processes it in INGEST_CHUNK_ROWS slices (calamine parses a whole sheet per load,
+# so the sheet itself is held in memory); "polars" is the original pl.read_excel path.
+INGEST_READER = os.getenv("INGEST_READER", "calamine")
+INGEST_CHUNK_ROWS = int(os.getenv("INGEST_CHUNK_ROWS", "50000"))
+# Pack source columns the Silver mapping doesn't use into a raw_content JSON column
+INGEST_KEEP_RAW_CONTENT = os.getenv("INGEST_KEEP_RAW_CONTENT", "true").lower() == "true"
+
+# Pipeline scheduling
+# Independent tasks (e.g. the Silver table writes) run on this many threads
+ETL_MAX_WORKERS = int(os.getenv("ETL_MAX_WORKERS", "4"))
+# Completed stages are recorded here so a failed run resumes from the failed stage
+ETL_CHECKPOINT_PATH = Path(
+    os.getenv("ETL_CHECKPOINT_PATH", str(BASE_DIR / "_checkpoints" / "etl_run.json"))
+)
+# A failed run's checkpoint is only resumed within this window (and for the same
+# source file), so a later night never skips stages for a new report
+ETL_CHECKPOINT_MAX_AGE_HOURS = float(os.getenv("ETL_CHECKPOINT_MAX_AGE_HOURS", "12"))
+
+# Maintenance (--stage maintain)
+MAINTAIN_TARGET_FILE_BYTES = int(
+    os.getenv("MAINTAIN_TARGET_FILE_BYTES", str(128 * 1024 * 1024))
+)
+# Z-ordered when present in a table (and not a partition column)
+MAINTAIN_ZORDER_COLUMNS = [
+    c.strip()
+    for c in os.getenv("MAINTAIN_ZORDER_COLUMNS", "officer_code,as_of_date").split(",")
+    if c.strip()
+]
+# Data files no longer referenced for this long are deleted by vacuum
+MAINTAIN_VACUUM_RETENTION_HOURS = int(os.getenv("MAINTAIN_VACUUM_RETENTION_HOURS", "168"))
 
 
 # Ensure directories exist for local development
@@ -0,0 +1,247 @@
+import contextvars
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from backend.shared.logging_config import get_logger
+
+logger = get_logger("etl_dag")
+
+
+@dataclass(frozen=True)
+class Task:
+    """
+    A unit of pipeline work.
+
+    `inputs`/`outputs` name the datasets the task reads and writes (e.g.
+    "silver.households"). A task runs after every task producing one of its inputs.
+    """
+
+    name: str
+    fn: Callable[[], Any]
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+
+
+@dataclass
+class TaskResult:
+    name: str
+    status: str  # "completed" | "skipped" (checkpointed) | "failed" | "not_run"
+    seconds: float = 0.0
+    result: Any = None
+    error: Optional[BaseException] = None
+
+
+class DagRunError(RuntimeError):
+    """Raised when a task fails; `results` holds the outcome of every task."""
+
+    def __init__(self, failed: str, results: Dict[str, TaskResult]):
+        super().__init__(f"Task '{failed}' failed")
+        self.failed = failed
+        self.results = results
+
+
+@dataclass
+class Dag:
+    """
+    Runs tasks in dependency order, independent tasks in parallel on a thread pool.
+
+    With a `checkpoint_path`, every completed task is recorded on disk. If a run
+    fails, the next run of the same task set skips the recorded tasks and resumes
+    from the failed one; the checkpoint is removed once a run succeeds.
+
+    A checkpoint only applies to the run it was written for: `run_key` identifies
+    the run's input (e.g. the source report), and a checkpoint written for another
+    key, or older than `checkpoint_max_age` seconds, is discarded so a new input
+    always runs every task.
+    """
+
+    tasks: List[Task]
+    name: str = "dag"
+    max_workers: int = 4
+    checkpoint_path: Optional[Path] = None
+    run_key: Optional[str] = None
+    checkpoint_max_age: Optional[float] = None
+    _dependencies: Dict[str, Set[str]] = field(init=False, default_factory=dict)
+
+    def __post_init__(self) -> None:
+        names = [t.name for t in self.tasks]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Duplicate task names in DAG '{self.name}': {names}")
+
+        producers: Dict[str, str] = {}
+        for task in self.tasks:
+            for output in task.outputs:
+                if output in producers:
+                    raise ValueError(
+                        f"Dataset '{output}' is produced by both "
+                        f"'{producers[output]}' and '{task.name}'"
+                    )
+                producers[output] = task.name
+
+        self._dependencies = {
+            task.name: {producers[i] for i in task.inputs if i in producers} - {task.name}
+            for task in self.tasks
+        }
+        self._check_acyclic()
+
+    def _check_acyclic(self) -> None:
+        remaining = {name: set(deps) for name, deps in self._dependencies.items()}
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"DAG '{self.name}' has a cycle among {sorted(remaining)}")
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+    def dependencies(self, task_name: str) -> Set[str]:
+        return set(self._dependencies[task_name])
+
+    # Checkpoints
+
+    def _load_checkpoint(self) -> Dict[str, Any]:
+        if self.checkpoint_path is None or not self.checkpoint_path.exists():
+            return {}
+        try:
+            checkpoint = json.loads(self.checkpoint_path.read_text())
+        except (OSError, ValueError) as e:
+            logger.warning("dag_checkpoint_unreadable", dag=self.name, error=str(e))
+            return {}
+        # Only resume the same set of tasks (e.g. not an `ingest` checkpoint for `all`)
+        if checkpoint.get("dag") != self.name or checkpoint.get("tasks") != sorted(
+            t.name for t in self.tasks
+        ):
+            return {}
+        reason = None
+        if checkpoint.get("run_key") != self.run_key:
+            reason = "other_run"
+        elif self.checkpoint_max_age is not None:
+            try:
+                written = datetime.fromisoformat(checkpoint["updated_at"])
+                age = (datetime.now() - written).total_seconds()
+            except (KeyError, TypeError, ValueError):
+                age = None
+            if age is None or age > self.checkpoint_max_age:
+                reason = "expired"
+        if reason is not None:
+            logger.info("dag_checkpoint_discarded", dag=self.name, reason=reason)
+            self.clear_checkpoint()
+            return {}
+        return checkpoint.get("completed", {})
+
+    def _save_checkpoint(self, completed: Dict[str, Any]) -> None:
+        if self.checkpoint_path is None:
+            return
+        self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.checkpoint_path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps(
+                {
+                    "dag": self.name,
+                    "tasks": sorted(t.name for t in self.tasks),
+                    "run_key": self.run_key,
+                    "completed": completed,
+                    "updated_at": datetime.now().isoformat(),
+                },
+                indent=2,
+            )
+        )
+        os.replace(tmp, self.checkpoint_path)
+
+    def clear_checkpoint(self) -> None:
+        if self.checkpoint_path is not None and self.checkpoint_path.exists():
+            self.checkpoint_path.unlink()
+
+    # Execution
+
+    def run(self, resume: bool = True) -> Dict[str, TaskResult]:
+        """
+        Executes the DAG and returns a TaskResult per task.
+
+        Raises:
+            DagRunError: If a task fails. Tasks already running are allowed to
+                finish (and are checkpointed); nothing new is started.
+        """
+        completed = self._load_checkpoint() if resume else {}
+        if not resume:
+            self.clear_checkpoint()
+
+        results: Dict[str, TaskResult] = {}
+        for name, record in completed.items():
+            results[name] = TaskResult(name, "skipped", seconds=record.get("seconds", 0.0))
+            logger.info("task_skipped", dag=self.name, task=name, reason="checkpointed")
+
+        tasks = {t.name: t for t in self.tasks}
+        pending = {name for name in tasks if name not in completed}
+        running: Dict[Future, Tuple[str, float]] = {}
+        failed: Optional[str] = None
+
+        logger.info(
+            "dag_started", dag=self.name, tasks=len(tasks), resumed=len(completed)
+        )
+        dag_started = time.perf_counter()
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix=self.name
+        ) as pool:
+            while True:
+                if failed is None:
+                    done = {
+                        n for n, r in results.items() if r.status in ("completed", "skipped")
+                    }
+                    for name in sorted(pending):
+                        if self._dependencies[name] <= done:
+                            pending.discard(name)
+                            logger.info("task_started", dag=self.name, task=name)
+                            # Tasks see the caller's context (log context, enclosing step)
+                            context = contextvars.copy_context()
+                            running[pool.submit(context.run, tasks[name].fn)] = (
+                                name,
+                                time.perf_counter(),
+                            )
+
+                if not running:
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name, started = running.pop(future)
+                    seconds = round(time.perf_counter() - started, 3)
+                    error = future.exception()
+                    if error is None:
+                        results[name] = TaskResult(name, "completed", seconds, future.result())
+                        completed[name] = {
+                            "seconds": seconds,
+                            "finished_at": datetime.now().isoformat(),
+                        }
+                        self._save_checkpoint(completed)
+                        logger.info("task_completed", dag=self.name, task=name, seconds=seconds)
+                    else:
+                        results[name] = TaskResult(name, "failed", seconds, error=error)
+                        logger.error(
+                            "task_failed",
+                            dag=self.name,
+                            task=name,
+                            seconds=seconds,
+                            error=str(error),
+                        )
+                        failed = failed or name
+
+        for name in pending:
+            results[name] = TaskResult(name, "not_run")
+
+        seconds = round(time.perf_counter() - dag_started, 3)
+        if failed is not None:
+            logger.error("dag_failed", dag=self.name, failed_task=failed, seconds=seconds)
+            raise DagRunError(failed, results) from results[failed].error
+
+        self.clear_checkpoint()
+        logger.info("dag_completed", dag=self.name, seconds=seconds)
+        return results
@@ -0,0 +1,67 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable
+
+from deltalake import DeltaTable
+
+
+def commit_stats(table_path: Path, version: int) -> Dict[str, Any]:
+    """
+    Rows, bytes and files added by one Delta commit, read from its log entry.
+
+    Only the single `_delta_log/<version>.json` file is parsed; no data files
+    are opened.
+    """
+    log_file = Path(table_path) / "_delta_log" / f"{version:020d}.json"
+    rows = 0
+    bytes_written = 0
+    files_added = 0
+    files_removed = 0
+
+    with open(log_file) as f:
+        for line in f:
+            action = json.loads(line)
+            if "add" in action:
+                add = action["add"]
+                files_added += 1
+                bytes_written += add.get("size", 0)
+                if add.get("stats"):
+                    rows += json.loads(add["stats"]).get("numRecords", 0)
+            elif "remove" in action:
+                files_removed += 1
+
+    return {
+        "version": version,
+        "rows": rows,
+        "bytes": bytes_written,
+        "files_added": files_added,
+        "files_removed": files_removed,
+    }
+
+
+def latest_commit_stats(table_path: Path) -> Dict[str, Any]:
+    """`commit_stats` for the table's current version."""
+    return commit_stats(table_path, DeltaTable(str(table_path)).version())
+
+
+def partition_replace_options(
+    table_path: Path, column: str, values: Iterable[Any]
+) -> Dict[str, Any]:
+    """
+    `write_deltalake` options that replace exactly the `column` partitions in `values`.
+
+    Partitions not being written are left as they are, so rerunning a write is
+    idempotent. A table not yet partitioned on `column` (or missing) is
+    overwritten whole into the partitioned layout.
+    """
+    options: Dict[str, Any] = {"mode": "overwrite", "partition_by": [column]}
+    table_path = Path(table_path)
+    if (
+        table_path.exists()
+        and list(DeltaTable(str(table_path)).metadata().partition_columns) == [column]
+    ):
+        literals = ", ".join(f"'{value}'" for value in values)
+        options["predicate"] = f"{column} IN ({literals})"
+    else:
+        options["schema_mode"] = "overwrite"
+    return options
@@ -0,0 +1,143 @@
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import polars as pl
+from deltalake import DeltaTable
+
+from backend.etl.config import (
+    BRONZE_PATH,
+    GOLD_PATH,
+    MAINTAIN_TARGET_FILE_BYTES,
+    MAINTAIN_VACUUM_RETENTION_HOURS,
+    MAINTAIN_ZORDER_COLUMNS,
+    SILVER_PATH,
+)
+from backend.shared.instrumentation import instrument
+from backend.shared.logging_config import get_logger
+
+logger = get_logger("etl_maintain")
+
+# Delta's default deletedFileRetentionDuration; shorter retention must be forced
+DEFAULT_RETENTION_HOURS = 168
+
+
+def find_delta_tables(*roots: Path) -> Iterator[Path]:
+    """Yields every Delta table (a directory with a `_delta_log`) under `roots`."""
+    for root in roots:
+        if not root.exists():
+            continue
+        for log_dir in sorted(root.rglob("_delta_log")):
+            yield log_dir.parent
+
+
+def table_storage_stats(table_path: Path) -> Dict[str, int]:
+    """
+    File counts and bytes for one table.
+
+    `files`/`bytes` cover the current snapshot (from the log); `storage_*`
+    cover every Parquet file on disk, including ones vacuum can remove;
+    `log_files` counts `_delta_log` commit files.
+    """
+    dt = DeltaTable(str(table_path))
+    actions = pl.DataFrame(dt.get_add_actions(flatten=True))
+    on_disk = [
+        p for p in table_path.rglob("*.parquet") if "_delta_log" not in p.parts
+    ]
+    return {
+        "files": len(actions),
+        "bytes": int(actions["size_bytes"].sum()) if len(actions) else 0,
+        "storage_files": len(on_disk),
+        "storage_bytes": sum(p.stat().st_size for p in on_disk),
+        "log_files": len(list((table_path / "_delta_log").glob("*.json"))),
+    }
+
+
+def maintain_table(
+    table_path: Path,
+    target_size: int = MAINTAIN_TARGET_FILE_BYTES,
+    zorder_columns: Optional[List[str]] = None,
+    retention_hours: int = MAINTAIN_VACUUM_RETENTION_HOURS,
+) -> Dict[str, Any]:
+    """
+    Compacts (or Z-orders), checkpoints and vacuums one Delta table.
+
+    Z-ordering is used when the table has any of `zorder_columns` outside its
+    partition columns; otherwise small files are bin-packed towards
+    `target_size`. Returns before/after storage stats.
+    """
+    zorder_columns = MAINTAIN_ZORDER_COLUMNS if zorder_columns is None else zorder_columns
+    before = table_storage_stats(table_path)
+
+    dt = DeltaTable(str(table_path))
+    partition_columns = set(dt.metadata().partition_columns)
+    schema_columns = {field.name for field in dt.schema().fields}
+    zorder = [
+        c for c in zorder_columns if c in schema_columns and c not in partition_columns
+    ]
+
+    if zorder:
+        optimize = dt.optimize.z_order(zorder, target_size=target_size)
+    else:
+        optimize = dt.optimize.compact(target_size=target_size)
+
+    dt = DeltaTable(str(table_path))
+    dt.create_checkpoint()
+    dt.cleanup_metadata()
+    vacuumed = dt.vacuum(
+        retention_hours=retention_hours,
+        dry_run=False,
+        enforce_retention_duration=retention_hours >= DEFAULT_RETENTION_HOURS,
+    )
+
+    after = table_storage_stats(table_path)
+    return {
+        "table": str(table_path),
+        "zorder_columns": zorder,
+        "files_removed": optimize.get("numFilesRemoved", 0),
+        "files_added": optimize.get("numFilesAdded", 0),
+        "files_vacuumed": len(vacuumed),
+        "before": before,
+        "after": after,
+    }
+
+
+def maintain_lakehouse(**options: Any) -> List[Dict[str, Any]]:
+    """
+    Runs maintain_table on every Delta table in Bronze, Silver and Gold.
+
+    A failure on one table is logged and the remaining tables are still maintained.
+    """
+    logger.info("maintenance_started", stage="maintain")
+    reports = []
+    failed = []
+    for table_path in find_delta_tables(BRONZE_PATH, SILVER_PATH, GOLD_PATH):
+        try:
+            with instrument(logger, "table_maintained", pipeline_stage="maintain") as step:
+                step.track_delta_write(table_path)  # Files rewritten by compaction
+                report = maintain_table(table_path, **options)
+                step.bytes_read = report["before"]["bytes"]
+                step.set(
+                    table=report["table"],
+                    zorder_columns=report["zorder_columns"],
+                    files_before=report["before"]["files"],
+                    files_after=report["after"]["files"],
+                    bytes_before=report["before"]["bytes"],
+                    bytes_after=report["after"]["bytes"],
+                    storage_bytes_before=report["before"]["storage_bytes"],
+                    storage_bytes_after=report["after"]["storage_bytes"],
+                    log_files_before=report["before"]["log_files"],
+                    log_files_after=report["after"]["log_files"],
+                    files_vacuumed=report["files_vacuumed"],
+                )
+        except Exception as e:
+            logger.error("table_maintenance_failed", table=str(table_path), error=str(e))
+            failed.append(str(table_path))
+            continue
+        reports.append(report)
+
+    logger.info(
+        "maintenance_completed", stage="maintain", tables=len(reports), failed=len(failed)
+    )
+    if failed:
+        raise RuntimeError(f"Maintenance failed for {len(failed)} table(s): {failed}")
+    return reports
@@ -0,0 +1,31 @@
+import polars as pl
+from backend.app.models.silver import TeamId
+from backend.etl.config import REFERENCE_DATA_PATH
+
+# Personal Banking is the catch-all team for officers not assigned elsewhere
+DEFAULT_TEAM_ID = TeamId.PB.value
+
+
+def _read_reference(name: str, schema: dict) -> pl.DataFrame:
+    df = pl.read_csv(REFERENCE_DATA_PATH / name, schema_overrides=schema)
+    unknown = df.filter(~pl.col("team_id").is_in([t.value for t in TeamId]))
+    if not unknown.is_empty():
+        raise ValueError(
+            f"{name} references unknown team_id(s): {unknown['team_id'].unique().to_list()}"
+        )
+    return df.select(list(schema))
+
+
+def load_teams() -> pl.DataFrame:
+    """Team definitions (team_id, team_name), shared by Silver and the API."""
+    return _read_reference("teams.csv", {"team_id": pl.Utf8, "team_name": pl.Utf8})
+
+
+def load_officer_teams() -> pl.DataFrame:
+    """
+    Officer name -> team_id assignments. Officers not listed belong to
+    DEFAULT_TEAM_ID (Personal Banking).
+    """
+    return _read_reference(
+        "officer_teams.csv", {"officer_name": pl.Utf8, "team_id": pl.Utf8}
+    ).unique(subset=["officer_name"], keep="last")
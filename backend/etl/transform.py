@@ -1,63 +1,372 @@
 import polars as pl
-from backend.etl.config import BRONZE_PATH, SILVER_PATH
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+from deltalake import CommitProperties, DeltaTable
+from backend.etl.config import (
+    BRONZE_PATH,
+    BRONZE_SNAPSHOT_TABLE,
+    BRONZE_TABLE,
+    ETL_MAX_WORKERS,
+    SILVER_DATES_METADATA_KEY,
+    SILVER_PATH,
+)
+from backend.etl.dag import Dag, Task
+from backend.etl.reference import DEFAULT_TEAM_ID, load_officer_teams, load_teams
 from backend.app.models.silver import Household, Officer, Team, TeamId, OfficerStatus
+from backend.etl.validation import Rule, validate_against_model
+from backend.shared.instrumentation import StepMetrics, instrument
 from backend.shared.logging_config import get_logger
 
 logger = get_logger("etl_transform")
 
+# Matches the Silver/Gold models: Decimal(max_digits=18, decimal_places=2)
+CURRENCY_DTYPE = pl.Decimal(18, 2)
+# Source column of each Silver balance
+BALANCE_SOURCES = {
+    "balance_current": "Current Month-end Deposit Balance",
+    "balance_prior_month": "Prior Month-end Deposit Balance",
+    "balance_ytd_start": "Prior Year-end Deposit Balance",
+}
+BALANCE_COLUMNS = list(BALANCE_SOURCES)
+# Suffix of the per-balance flag set by parse_balances for excess precision
+EXCESS_PRECISION_SUFFIX = "__excess_precision"
+# Slow-path cleanup: drop '$', ',', ')' and spaces anywhere, turn '(' into a minus sign
+_CURRENCY_PATTERNS = ["$", ",", ")", " ", "("]
+_CURRENCY_REPLACEMENTS = ["", "", "", "", "-"]
+
+# Silver merge keys (etl_pipeline_spec: upsert on household_id + as_of_date)
+HOUSEHOLD_KEYS = ["household_id", "as_of_date"]
+OFFICER_KEYS = ["officer_code"]
+
+HOUSEHOLD_COLUMNS = [
+    "household_id",
+    "household_name",
+    "officer_code",
+    "balance_current",
+    "balance_prior_month",
+    "balance_ytd_start",
+    "as_of_date",
+]
+
+
+def parse_currency(col_expr):
+    # Handles "$1,000.50", "$(1,607,943)", "(500.00)", "-$500", " 12.00" and plain
+    # numbers, parsing straight into CURRENCY_DTYPE: no Float64 step, so balances
+    # stay exact through Silver and the Gold SUMs. Digits beyond the scale are
+    # truncated; see excess_precision.
+    #
+    # Fast path: strip '$' and parentheses around the number (cheap, no copy),
+    # drop the thousands separators and negate amounts ending in ')'. Values that
+    # still don't parse ("-$500", " 12.00", "(500) ") go through the full replace
+    # pass, which turns '(' into a minus sign wherever it is.
+    # Best used in a lazy frame, where the shared sub-expressions run once.
+    text = col_expr.cast(pl.Utf8)
+    fast = (
+        text.str.strip_chars("$()")
+        .str.replace_all(",", "", literal=True)
+        .cast(CURRENCY_DTYPE, strict=False)
+    )
+    signed = pl.when(text.str.ends_with(")")).then(-fast).otherwise(fast)
+    slow = (
+        pl.when(fast.is_null())
+        .then(text)
+        .str.replace_many(_CURRENCY_PATTERNS, _CURRENCY_REPLACEMENTS)
+        .cast(CURRENCY_DTYPE, strict=False)
+    )
+    return pl.coalesce(signed, slow)
+
+
+def excess_precision(col_expr):
+    """True for currency text with more significant decimals than CURRENCY_DTYPE keeps."""
+    # Anchored at the end (only non-digits may follow), which the regex engine
+    # matches from the back of the string
+    return col_expr.cast(pl.Utf8).str.contains(
+        rf"\.\d{{{CURRENCY_DTYPE.scale}}}\d*[1-9]\D*$"
+    )
+
 
 def clean_currency(col_expr):
-    # Remove '$', ',', '(', ')' and handle negatives
-    # This is a simplified regex approach
-    return (
-        col_expr.cast(pl.Utf8)
-        .str.replace_all(r"[$,)]", "")
-        .str.replace(r"\(", "-")
-        .cast(pl.Float64)
+    # parse_currency, with values it would truncate ("1,000.505") nulled instead.
+    # Unparseable or out-of-range values become null too and are caught by validation
+    return pl.when(~excess_precision(col_expr)).then(parse_currency(col_expr))
+
+
+def parse_balances(sources: Dict[str, str] = BALANCE_SOURCES) -> List[pl.Expr]:
+    """
+    Each balance parsed from its source column, plus a `<balance>__excess_precision`
+    flag, so validation can quarantine those rows under a decimal_places reason.
+    """
+    return [
+        expr
+        for name, source in sources.items()
+        for expr in (
+            parse_currency(pl.col(source)).alias(name),
+            excess_precision(pl.col(source)).alias(name + EXCESS_PRECISION_SUFFIX),
+        )
+    ]
+
+
+def excess_precision_rules(columns: List[str] = BALANCE_COLUMNS) -> List[Rule]:
+    """decimal_places rules over the flags set by parse_balances."""
+    return [
+        Rule(f"{name}_decimal_places", name, pl.col(name + EXCESS_PRECISION_SUFFIX))
+        for name in columns
+    ]
+
+
+def _align_target_schema(df: pl.DataFrame, table_path: Path) -> None:
+    """
+    One-off migration when a Silver column changed type (e.g. Float64 balances
+    written before the Decimal(18,2) pipeline): rewrite the target with the
+    source's types so the MERGE can proceed.
+    """
+    target = pl.scan_delta(str(table_path))
+    target_schema = target.collect_schema()
+    changed = {
+        name: dtype
+        for name, dtype in df.schema.items()
+        if name in target_schema and target_schema[name] != dtype
+    }
+    if not changed:
+        return
+
+    logger.warning(
+        "silver_schema_migrated",
+        table=table_path.name,
+        columns={name: str(dtype) for name, dtype in changed.items()},
+    )
+    target.with_columns(
+        pl.col(name).cast(dtype, strict=False) for name, dtype in changed.items()
+    ).collect().write_delta(
+        table_path, mode="overwrite", delta_write_options={"schema_mode": "overwrite"}
+    )
+
+
+def merge_into_silver(
+    df: pl.DataFrame,
+    table_path: Path,
+    keys: List[str],
+    commit_metadata: Optional[Dict[str, str]] = None,
+) -> Dict[str, int]:
+    """
+    Upserts `df` into a Silver Delta table on `keys` using a delta-rs MERGE.
+
+    Matched rows are only rewritten when a non-key column actually changed, so
+    write volume follows the change set rather than the table size.
+    `commit_metadata` is stored with the commit. Returns rows inserted / updated /
+    unchanged.
+    """
+    table_name = table_path.name
+    commit_properties = CommitProperties(custom_metadata=commit_metadata or {})
+
+    with instrument(logger, "silver_merge_completed", table=table_name) as step:
+        step.rows_in = len(df)
+        step.track_delta_write(table_path)
+
+        if not table_path.exists():
+            df.write_delta(
+                table_path,
+                mode="overwrite",
+                delta_write_options={"commit_properties": commit_properties},
+            )
+            stats = {"rows_inserted": len(df), "rows_updated": 0, "rows_unchanged": 0}
+            step.set(**stats)
+            step.rows_out = len(df)
+            return stats
+
+        _align_target_schema(df, table_path)
+
+        predicate = " AND ".join(f"t.{k} = s.{k}" for k in keys)
+        changed = " OR ".join(
+            f"(t.{c} IS DISTINCT FROM s.{c})" for c in df.columns if c not in keys
+        )
+
+        merger = df.write_delta(
+            table_path,
+            mode="merge",
+            delta_merge_options={
+                "predicate": predicate,
+                "source_alias": "s",
+                "target_alias": "t",
+                "commit_properties": commit_properties,
+            },
+        )
+        if changed:
+            merger = merger.when_matched_update_all(predicate=changed)
+        metrics = merger.when_not_matched_insert_all().execute()
+
+        inserted = metrics.get("num_target_rows_inserted", 0)
+        updated = metrics.get("num_target_rows_updated", 0)
+        stats = {
+            "rows_inserted": inserted,
+            "rows_updated": updated,
+            "rows_unchanged": len(df) - inserted - updated,
+        }
+        step.set(
+            files_added=metrics.get("num_target_files_added", 0),
+            files_removed=metrics.get("num_target_files_removed", 0),
+            **stats,
+        )
+        step.rows_out = inserted + updated
+        return stats
+
+
+def latest_bronze_batch(bronze_table_path: Path) -> Optional[str]:
+    """
+    Returns the ingestion_id of the newest Bronze batch without scanning data.
+
+    Looks, in order, at:
+    1. The newest commit carrying `ingestion_id` commit metadata (written by ingest).
+    2. The newest `ingestion_date` partition (log metadata), then the latest
+       `ingestion_timestamp` within just that partition.
+    3. For unpartitioned legacy tables, the latest `ingestion_timestamp` overall.
+    """
+    dt = DeltaTable(str(bronze_table_path))
+
+    for commit in dt.history():
+        if commit.get("ingestion_id"):
+            return commit["ingestion_id"]
+
+    if "ingestion_date" in dt.metadata().partition_columns:
+        partitions = pl.DataFrame(dt.get_add_actions(flatten=True))
+        if partitions.is_empty():
+            return None
+        newest_date = partitions["partition.ingestion_date"].max()
+        lf = pl.from_arrow(
+            dt.to_pyarrow_table(
+                columns=["ingestion_id", "ingestion_timestamp"],
+                filters=[("ingestion_date", "=", newest_date)],
+            )
+        ).lazy()
+    else:
+        lf = pl.scan_delta(str(bronze_table_path))
+
+    latest = (
+        lf.select("ingestion_id", "ingestion_timestamp")
+        .sort("ingestion_timestamp")
+        .last()
+        .collect()
+    )
+    return latest.item(0, "ingestion_id") if not latest.is_empty() else None
+
+
+def read_bronze_batch(bronze_table_path: Path, ingestion_id: str) -> pl.LazyFrame:
+    """
+    Lazily reads a single Bronze batch.
+
+    On a partitioned table only the batch's partition files are opened, so the
+    cost stays flat as Bronze history grows.
+    """
+    return read_bronze_batches(bronze_table_path, [ingestion_id])
+
+
+def read_bronze_batches(bronze_table_path: Path, ingestion_ids: List[str]) -> pl.LazyFrame:
+    """
+    Lazily reads the given Bronze batches, opening only their partitions when
+    the table is partitioned by ingestion_id.
+    """
+    dt = DeltaTable(str(bronze_table_path))
+    if "ingestion_id" in dt.metadata().partition_columns:
+        return pl.from_arrow(
+            dt.to_pyarrow_table(filters=[("ingestion_id", "in", ingestion_ids)])
+        ).lazy()
+    return pl.scan_delta(str(bronze_table_path)).filter(
+        pl.col("ingestion_id").is_in(ingestion_ids)
+    )
+
+
+def read_bronze_snapshot(bronze_table_path: Path, ingestion_id: str) -> pl.LazyFrame:
+    """
+    Lazily reads the full source report behind a Bronze batch.
+
+    Ingest only appends rows whose hash is new, and lists the hashes of all
+    the report's rows in the snapshot table. Rows listed there but stored by
+    an earlier batch are carried forward with this batch's ingestion columns,
+    so unchanged households get the new as_of_date too. Only the batches the
+    snapshot says store those rows are read; snapshots from before that was
+    recorded fall back to scanning all earlier batches. Batches without a
+    snapshot (forced, or written before snapshots) are complete on their own.
+    """
+    batch = read_bronze_batch(bronze_table_path, ingestion_id)
+    snapshot_path = bronze_table_path.parent / BRONZE_SNAPSHOT_TABLE
+    if not snapshot_path.exists():
+        return batch
+    snapshot = (
+        pl.scan_delta(str(snapshot_path))
+        .filter(pl.col("ingestion_id") == ingestion_id)
+        .collect()
+    )
+    if snapshot.is_empty():
+        return batch
+
+    stored_in = snapshot.get_column("stored_ingestion_id", default=None)
+    if stored_in is not None and stored_in.null_count() == 0:
+        earlier_ids = [i for i in stored_in.unique().to_list() if i != ingestion_id]
+        if not earlier_ids:
+            return batch
+        earlier = read_bronze_batches(bronze_table_path, earlier_ids)
+    else:
+        earlier = pl.scan_delta(str(bronze_table_path)).filter(
+            pl.col("ingestion_id") != ingestion_id
+        )
+
+    timestamp = snapshot.item(0, "ingestion_timestamp")
+    carried = (
+        earlier.join(snapshot.lazy().select("row_hash"), on="row_hash", how="semi")
+        .unique(subset="row_hash", keep="any")
+        .with_columns(
+            pl.lit(ingestion_id).alias("ingestion_id"),
+            pl.lit(timestamp).alias("ingestion_timestamp"),
+            pl.lit(timestamp.date()).alias("ingestion_date"),
+        )
     )
+    return pl.concat([batch, carried], how="diagonal_relaxed")
 
 
 def transform_silver():
     """
     Reads from Bronze, cleans/validates, and writes to Silver tables.
     """
+    with instrument(
+        logger, "transformation_completed", pipeline_stage="transform", stage="silver"
+    ) as step:
+        _transform_silver(step)
+
+
+def _transform_silver(step: StepMetrics) -> None:
     logger.info("transformation_started", stage="silver")
 
-    bronze_table_path = BRONZE_PATH / "raw_household_balances"
+    bronze_table_path = BRONZE_PATH / BRONZE_TABLE
 
     if not bronze_table_path.exists():
         logger.error("bronze_table_not_found", path=str(bronze_table_path))
         raise FileNotFoundError(f"Bronze table not found at {bronze_table_path}")
 
-    # Lazy scan the Delta table
-    lf = pl.scan_delta(bronze_table_path)
-
-    # Filter out bad rows (totals, empty names) - similar to logic in data-processor.ts
-    # Using Polars expression API for performance
-
-    # 1. Normalize Column Names (Handling the variability seen in Excel)
-    # We'll map the raw Excel headers to our internal schema
-    # Note: In a real scenario, we might need a dynamic mapper if columns change often.
-
     # We assume the latest ingestion is what we want to process for the "Current State"
     # Or we process the increment. For this PoC, we take the latest ingestion_id.
 
-    # Get latest ingestion ID
+    # Get latest ingestion ID from the Delta log, then read only that batch's files
     try:
-        latest_ingestion_id = (
-            pl.scan_delta(bronze_table_path)
-            .select("ingestion_id")
-            .tail(1)
-            .collect()
-            .item(0, 0)
-        )
-        logger.info("processing_batch", ingestion_id=latest_ingestion_id)
+        latest_ingestion_id = latest_bronze_batch(bronze_table_path)
     except Exception as e:
         logger.warning("no_data_found_in_bronze", error=str(e))
+        step.discard()
         return
+    if latest_ingestion_id is None:
+        logger.warning("no_data_found_in_bronze")
+        step.discard()
+        return
+    logger.info("processing_batch", ingestion_id=latest_ingestion_id)
 
-    # Filter for latest batch
-    current_batch = lf.filter(pl.col("ingestion_id") == latest_ingestion_id)
+    current_batch = read_bronze_snapshot(bronze_table_path, latest_ingestion_id)
+
+    # Filter out bad rows (totals, empty names) - similar to logic in data-processor.ts
+    # Using Polars expression API for performance
+
+    # 1. Normalize Column Names (Handling the variability seen in Excel)
+    # We'll map the raw Excel headers to our internal schema
+    # Note: In a real scenario, we might need a dynamic mapper if columns change often.
 
     # Transformation Logic
     # We need to map the Excel columns to our schema
@@ -78,15 +387,7 @@ def transform_silver():
             pl.col("Household Name").alias("household_name"),
             pl.col("Officer Code").cast(pl.Utf8).alias("officer_code_raw"),
             pl.col("Officer Name").alias("officer_name_raw"),
-            clean_currency(pl.col("Current Month-end Deposit Balance")).alias(
-                "balance_current"
-            ),
-            clean_currency(pl.col("Prior Month-end Deposit Balance")).alias(
-                "balance_prior_month"
-            ),
-            clean_currency(pl.col("Prior Year-end Deposit Balance")).alias(
-                "balance_ytd_start"
-            ),
+            *parse_balances(),
             # Use ingestion timestamp as as_of_date for now, or today's date
             pl.col("ingestion_timestamp").cast(pl.Date).alias("as_of_date"),
         ]
@@ -108,48 +409,111 @@ def transform_silver():
         .alias("officer_name"),
     )
 
+    # Validate against the Silver model in one vectorized pass.
+    # Failing rows go to quarantine (spec: on_error: quarantine_row)
+    with instrument(
+        logger, "silver_batch_cleaned", ingestion_id=latest_ingestion_id
+    ) as clean_step:
+        clean_step.track_delta_read(bronze_table_path, ingestion_id=latest_ingestion_id)
+        clean_step.explain_polars("silver_batch_cleaned", cleaned)
+        collected = cleaned.collect()
+        valid, quarantined = validate_against_model(
+            collected, Household, table="households", extra_rules=excess_precision_rules()
+        )
+        # Quarantine keeps null rather than the truncated value of such balances
+        flags = [c + EXCESS_PRECISION_SUFFIX for c in BALANCE_COLUMNS]
+        valid = valid.drop(flags)
+        quarantined = quarantined.with_columns(
+            pl.when(~pl.col(c + EXCESS_PRECISION_SUFFIX)).then(pl.col(c)).alias(c)
+            for c in BALANCE_COLUMNS
+        ).drop(flags)
+        clean_step.rows_in = len(collected)
+        clean_step.rows_out = len(valid)
+        clean_step.set(rows_quarantined=len(quarantined))
+    step.rows_in = len(collected)
+    step.rows_out = len(valid)
+
+    if not quarantined.is_empty():
+        logger.info("writing_to_silver_quarantine_households", rows=len(quarantined))
+        step.track_delta_write(SILVER_PATH / "quarantine_households")
+        quarantined.select(
+            [
+                *HOUSEHOLD_COLUMNS,
+                "ingestion_id",
+                "ingestion_timestamp",
+                "reason_codes",
+                pl.lit(datetime.now()).alias("quarantined_at"),
+            ]
+        ).write_delta(
+            SILVER_PATH / "quarantine_households",
+            mode="append",
+            delta_write_options={"schema_mode": "merge"},
+        )
+    cleaned = valid.lazy()
+
     # Create Dataframes for the normalized tables
 
     # 1. Households Table
-    households_df = cleaned.select(
-        [
-            "household_id",
-            "household_name",
-            "officer_code",
-            "balance_current",
-            "balance_prior_month",
-            "balance_ytd_start",
-            "as_of_date",
-        ]
-    ).unique(subset=["household_id"])  # Simple dedup
+    # Dedup on the merge key, keeping the row from the newest ingestion
+    households_df = (
+        cleaned.sort("ingestion_timestamp")
+        .unique(subset=HOUSEHOLD_KEYS, keep="last", maintain_order=True)
+        .select(HOUSEHOLD_COLUMNS)
+    )
 
     # 2. Officers Table (Derived)
     officers_df = (
-        cleaned.select(["officer_code", "officer_name"])
-        .unique()
+        cleaned.sort("ingestion_timestamp")
+        .unique(subset=OFFICER_KEYS, keep="last", maintain_order=True)
+        .select(["officer_code", "officer_name"])
+        # Team assignment comes from the officer_teams reference table
+        .join(load_officer_teams().lazy(), on="officer_name", how="left")
         .with_columns(
             [
-                # Assign default Team (Logic needs the map from team-config.ts)
-                # For now, we'll placeholder it or leave null
-                pl.lit(None).cast(pl.Utf8).alias("team_id"),
+                pl.col("team_id").fill_null(DEFAULT_TEAM_ID),
                 pl.lit("Active").alias("status"),
             ]
         )
     )
 
-    # Write to Silver
-    logger.info("writing_to_silver_households")
-    households_df.collect().write_delta(
-        SILVER_PATH / "households",
-        mode="overwrite",  # Overwrite for "current state" table pattern
-        overwrite_schema=True,
-    )
+    # Upsert into Silver: only files containing affected keys are rewritten.
+    # The three tables are independent, so they are written concurrently.
+    def write_households():
+        logger.info("writing_to_silver_households")
+        step.explain_polars("silver_households", households_df)
+        households = households_df.collect()
+        # Lets aggregate_gold rebuild only the KPI dates this batch touched
+        report_dates = households["as_of_date"].unique().sort().cast(pl.Utf8).to_list()
+        return merge_into_silver(
+            households,
+            SILVER_PATH / "households",
+            HOUSEHOLD_KEYS,
+            commit_metadata={SILVER_DATES_METADATA_KEY: ",".join(report_dates)},
+        )
 
-    logger.info("writing_to_silver_officers")
-    officers_df.collect().write_delta(
-        SILVER_PATH / "officers",
-        mode="overwrite",  # In reality we'd merge
-        overwrite_schema=True,
-    )
+    def write_officers():
+        logger.info("writing_to_silver_officers")
+        step.explain_polars("silver_officers", officers_df)
+        return merge_into_silver(
+            officers_df.collect(), SILVER_PATH / "officers", OFFICER_KEYS
+        )
 
-    logger.info("transformation_completed", stage="silver")
+    def write_teams():
+        # 3. Teams Table (Reference)
+        logger.info("writing_to_silver_teams")
+        step.track_delta_write(SILVER_PATH / "teams")
+        load_teams().write_delta(
+            SILVER_PATH / "teams",
+            mode="overwrite",
+            delta_write_options={"schema_mode": "overwrite"},
+        )
+
+    Dag(
+        [
+            Task("silver_households", write_households, outputs=("silver.households",)),
+            Task("silver_officers", write_officers, outputs=("silver.officers",)),
+            Task("silver_teams", write_teams, outputs=("silver.teams",)),
+        ],
+        name="silver_writes",
+        max_workers=ETL_MAX_WORKERS,
+    ).run()
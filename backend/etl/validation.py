@@ -0,0 +1,209 @@
+import enum
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import (
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+    get_args,
+    get_origin,
+)
+
+import polars as pl
+from pydantic import BaseModel
+
+from backend.shared.logging_config import get_logger
+
+logger = get_logger("etl_validation")
+
+REASON_CODES_COLUMN = "reason_codes"
+
+
+@dataclass(frozen=True)
+class Rule:
+    """
+    A single vectorized check. `failed` evaluates to True for rows that violate it.
+    """
+
+    reason_code: str
+    column: str
+    failed: pl.Expr
+
+
+def _unwrap_optional(annotation) -> Tuple[type, bool]:
+    if get_origin(annotation) is Union:
+        args = [a for a in get_args(annotation) if a is not type(None)]
+        if len(args) == 1:
+            return args[0], True
+    return annotation, False
+
+
+def _constraint(metadata: list, name: str):
+    """Finds a constraint value in pydantic field metadata (Field kwargs or annotated_types)."""
+    for item in metadata:
+        value = getattr(item, name, None)
+        if value is not None:
+            return value
+    return None
+
+
+def compile_model_rules(
+    model: Type[BaseModel], schema: Mapping[str, pl.DataType]
+) -> List[Rule]:
+    """
+    Compiles the constraints declared on a Pydantic model into Polars expressions.
+
+    Only fields present in `schema` are compiled. Supported constraints:
+    required (non-Optional), `pattern`, `min_length`/`max_length`, `gt`/`ge`/`lt`/`le`,
+    `max_digits`/`decimal_places` on Decimals and Enum membership.
+    """
+    rules: List[Rule] = []
+
+    for name, field in model.model_fields.items():
+        if name not in schema:
+            continue
+
+        col = pl.col(name)
+        annotation, optional = _unwrap_optional(field.annotation)
+        meta = field.metadata
+
+        if field.is_required() and not optional:
+            rules.append(Rule(f"{name}_required", name, col.is_null()))
+
+        pattern = _constraint(meta, "pattern")
+        if pattern is not None:
+            rules.append(
+                Rule(
+                    f"{name}_pattern",
+                    name,
+                    col.is_not_null() & ~col.cast(pl.Utf8).str.contains(pattern),
+                )
+            )
+
+        min_length = _constraint(meta, "min_length")
+        if min_length is not None:
+            rules.append(
+                Rule(f"{name}_min_length", name, col.str.len_chars() < min_length)
+            )
+        max_length = _constraint(meta, "max_length")
+        if max_length is not None:
+            rules.append(
+                Rule(f"{name}_max_length", name, col.str.len_chars() > max_length)
+            )
+
+        for op, code, failed in (
+            ("gt", "gt", lambda v: col <= v),
+            ("ge", "ge", lambda v: col < v),
+            ("lt", "lt", lambda v: col >= v),
+            ("le", "le", lambda v: col > v),
+        ):
+            bound = _constraint(meta, op)
+            if bound is not None:
+                rules.append(Rule(f"{name}_{code}", name, failed(bound)))
+
+        if annotation is Decimal:
+            max_digits = _constraint(meta, "max_digits")
+            decimal_places = _constraint(meta, "decimal_places")
+            if max_digits is not None:
+                # Integer part must fit in max_digits - decimal_places digits
+                limit = 10 ** (max_digits - (decimal_places or 0))
+                rules.append(Rule(f"{name}_max_digits", name, col.abs() >= limit))
+            dtype = schema[name]
+            if decimal_places is not None and isinstance(dtype, pl.Decimal):
+                # Exact on Decimals; a column with scale <= decimal_places can't fail
+                if dtype.scale > decimal_places:
+                    rules.append(
+                        Rule(
+                            f"{name}_decimal_places",
+                            name,
+                            col != col.round(decimal_places),
+                        )
+                    )
+            elif decimal_places is not None:
+                scaled = col.cast(pl.Float64) * (10**decimal_places)
+                rules.append(
+                    Rule(
+                        f"{name}_decimal_places",
+                        name,
+                        (scaled - scaled.round(0)).abs() > 1e-6,
+                    )
+                )
+
+        if isinstance(annotation, type) and issubclass(annotation, enum.Enum):
+            allowed = [member.value for member in annotation]
+            rules.append(
+                Rule(
+                    f"{name}_enum",
+                    name,
+                    col.is_not_null() & ~col.cast(pl.Utf8).is_in(allowed),
+                )
+            )
+
+    return rules
+
+
+def apply_rules(
+    df: pl.DataFrame, rules: List[Rule]
+) -> Tuple[pl.DataFrame, pl.DataFrame, Dict[str, int]]:
+    """
+    Evaluates every rule in a single pass.
+
+    Returns (valid rows, failing rows with a `reason_codes` list column,
+    per-rule failure counts).
+    """
+    flag_columns = [f"__rule_{rule.reason_code}" for rule in rules]
+    flagged = df.with_columns(
+        rule.failed.fill_null(False).alias(flag) for rule, flag in zip(rules, flag_columns)
+    )
+    counts = (
+        flagged.select(pl.col(flag).sum() for flag in flag_columns).row(0)
+        if rules
+        else ()
+    )
+
+    reasons = (
+        pl.concat_list(
+            pl.when(pl.col(flag)).then(pl.lit(rule.reason_code))
+            for rule, flag in zip(rules, flag_columns)
+        ).list.drop_nulls()
+        if rules
+        else pl.lit([], dtype=pl.List(pl.Utf8))
+    )
+    flagged = flagged.with_columns(reasons.alias(REASON_CODES_COLUMN)).drop(flag_columns)
+
+    failed = pl.col(REASON_CODES_COLUMN).list.len() > 0
+    valid = flagged.filter(~failed).drop(REASON_CODES_COLUMN)
+    invalid = flagged.filter(failed)
+    return valid, invalid, {
+        rule.reason_code: int(n) for rule, n in zip(rules, counts)
+    }
+
+
+def validate_against_model(
+    df: pl.DataFrame,
+    model: Type[BaseModel],
+    table: Optional[str] = None,
+    extra_rules: Sequence[Rule] = (),
+) -> Tuple[pl.DataFrame, pl.DataFrame]:
+    """
+    Validates `df` against `model` (plus `extra_rules`, for checks the model
+    can't express on the parsed columns) and logs per-rule failure counts.
+
+    Returns (valid rows, quarantined rows with reason codes).
+    """
+    rules = compile_model_rules(model, df.schema) + list(extra_rules)
+    valid, invalid, counts = apply_rules(df, rules)
+    logger.info(
+        "validation_completed",
+        table=table or model.__name__,
+        rules=len(rules),
+        rows_valid=len(valid),
+        rows_quarantined=len(invalid),
+        failures={code: n for code, n in counts.items() if n},
+    )
+    return valid, invalid
@@ -0,0 +1,353 @@
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+from backend.shared.logging_config import get_logger
+
+# Opt-in profiling: comma-separated stage names (e.g. "transform,aggregate") or "all".
+# Profiled stages dump their Polars/DuckDB query plans and a sampling profile.
+PROFILE_STAGES = {
+    s.strip() for s in os.getenv("PROFILE_STAGES", "").split(",") if s.strip()
+}
+PROFILE_OUTPUT_DIR = Path(os.getenv("PROFILE_OUTPUT_DIR", "./profiles"))
+PROFILE_SAMPLE_INTERVAL_SECONDS = float(os.getenv("PROFILE_SAMPLE_INTERVAL_SECONDS", "0.005"))
+
+logger = get_logger("instrumentation")
+
+_current_step: contextvars.ContextVar[Optional["StepMetrics"]] = contextvars.ContextVar(
+    "instrumented_step", default=None
+)
+
+
+# Memory: per-step peak RSS
+#
+# Linux tracks the process' RSS high-water mark (VmHWM) and lets us reset it
+# through /proc/self/clear_refs, so each step can measure its own peak. Before
+# a reset, the current mark is folded into every open step (nested or on other
+# threads) so none of them loses its peak. Elsewhere we fall back to the
+# lifetime peak from getrusage, and a step's delta is how far it raised it.
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+_memory_lock = threading.Lock()
+_open_steps: Dict[int, "StepMetrics"] = {}
+_can_reset_peak: Optional[bool] = None
+
+
+def current_rss_bytes() -> Optional[int]:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def peak_rss_bytes() -> Optional[int]:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _reset_peak() -> bool:
+    global _can_reset_peak
+    if _can_reset_peak is False:
+        return False
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        _can_reset_peak = True
+    except OSError:
+        _can_reset_peak = False
+    return _can_reset_peak
+
+
+# Sampling profiler
+
+
+class _Sampler(threading.Thread):
+    """
+    Samples every thread's Python stack at a fixed interval and counts them as
+    folded stacks (`thread;module:function;... count`), the input format of
+    flamegraph.pl and speedscope. Time spent in Polars/DuckDB native code is
+    attributed to the Python frame that called into it.
+    """
+
+    def __init__(self, interval: float):
+        super().__init__(name="instrumentation-sampler", daemon=True)
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        names = {}
+        while not self._stop_event.wait(self.interval):
+            for thread in threading.enumerate():
+                names[thread.ident] = thread.name
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == self.ident:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    module = frame.f_globals.get("__name__", "?")
+                    stack.append(f"{module}:{code.co_name}")
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+    def write(self, path: Path) -> None:
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class StepMetrics:
+    """
+    What an instrumented step reports, filled in by the code inside the block.
+
+    Set `rows_in` / `rows_out` / `bytes_read` / `bytes_written` directly, or let
+    `track_delta_read` / `track_delta_write` work the bytes out from the Delta
+    log. Bytes of nested steps are added to their parent's, so a step should
+    only count the I/O its sub-steps don't.
+    """
+
+    def __init__(self, event: str, pipeline_stage: Optional[str], fields: Dict[str, Any]):
+        self.event = event
+        self.pipeline_stage = pipeline_stage
+        self.fields = dict(fields)
+        self.rows_in: Optional[int] = None
+        self.rows_out: Optional[int] = None
+        self.bytes_read: Optional[int] = None
+        self.bytes_written: Optional[int] = None
+        self.profile_dir: Optional[Path] = None
+        self._emit = True
+        self._delta_writes: Dict[str, Optional[int]] = {}
+        self._child_bytes_read = 0
+        self._child_bytes_written = 0
+        self._peak_rss: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def set(self, **fields: Any) -> None:
+        """Adds context fields to the event."""
+        self.fields.update(fields)
+
+    def discard(self) -> None:
+        """Don't emit the event (e.g. the step turned out to have nothing to do)."""
+        self._emit = False
+
+    # Delta I/O
+
+    def track_delta_read(self, table_path: Path, **partition: Any) -> int:
+        """
+        Counts the data files of a Delta table (optionally one partition, e.g.
+        `ingestion_id=...`) as read by this step. Returns the bytes counted.
+        """
+        from deltalake import DeltaTable
+
+        actions = DeltaTable(str(table_path)).get_add_actions(flatten=True)
+        sizes = actions.column("size_bytes").to_pylist()
+        for column, value in partition.items():
+            if f"partition.{column}" not in actions.schema.names:
+                continue  # Not partitioned on it: the whole table is scanned
+            values = actions.column(f"partition.{column}").to_pylist()
+            sizes = [s for s, v in zip(sizes, values) if v == value]
+        read = sum(sizes)
+        self.bytes_read = (self.bytes_read or 0) + read
+        return read
+
+    def track_delta_write(self, table_path: Path) -> None:
+        """
+        Counts the data files committed to `table_path` while the step runs as
+        written by it (from the `add` actions of the new commits).
+        """
+        self._delta_writes[str(table_path)] = _delta_version(Path(table_path))
+
+    # Plans (only when the stage is being profiled)
+
+    def explain_polars(self, name: str, lf: Any) -> None:
+        """Writes the optimized plan of a Polars LazyFrame."""
+        if self.profile_dir is not None:
+            self._write_plan(name, lf.explain())
+
+    def explain_duckdb(self, name: str, con: Any, query: str, params: Any = None) -> None:
+        """Writes DuckDB's physical plan for `query` (EXPLAIN; the query is not run)."""
+        if self.profile_dir is None:
+            return
+        rows = con.execute(f"EXPLAIN {query}", params).fetchall()
+        self._write_plan(name, "\n".join(str(row[-1]) for row in rows))
+
+    def _write_plan(self, name: str, plan: str) -> None:
+        path = self.profile_dir / f"{name}.plan.txt"
+        path.write_text(plan)
+        logger.info("query_plan_written", event_name=self.event, plan=name, path=str(path))
+
+    # Internals
+
+    def _add_child(self, child: "StepMetrics") -> None:
+        with self._lock:
+            self._child_bytes_read += child.bytes_read or 0
+            self._child_bytes_written += child.bytes_written or 0
+
+    def _finish_delta_writes(self) -> None:
+        if not self._delta_writes:
+            return
+        written = sum(
+            _delta_bytes_added(Path(path), since)
+            for path, since in self._delta_writes.items()
+        )
+        self.bytes_written = (self.bytes_written or 0) + written
+
+
+def _delta_version(table_path: Path) -> Optional[int]:
+    log = table_path / "_delta_log"
+    versions = [int(p.stem) for p in log.glob("*.json") if p.stem.isdigit()] if log.exists() else []
+    return max(versions) if versions else None
+
+
+def _delta_bytes_added(table_path: Path, since_version: Optional[int]) -> int:
+    """Sizes of the files added by the commits after `since_version`."""
+    latest = _delta_version(table_path)
+    if latest is None:
+        return 0
+    first = 0 if since_version is None else since_version + 1
+    added = 0
+    for version in range(first, latest + 1):
+        log_file = table_path / "_delta_log" / f"{version:020d}.json"
+        if not log_file.exists():
+            continue
+        with open(log_file) as f:
+            for line in f:
+                action = json.loads(line)
+                if "add" in action:
+                    added += action["add"].get("size", 0)
+    return added
+
+
+def _profiling(pipeline_stage: Optional[str]) -> bool:
+    return pipeline_stage is not None and (
+        "all" in PROFILE_STAGES or pipeline_stage in PROFILE_STAGES
+    )
+
+
+@contextmanager
+def instrument(
+    log: Any, event: str, *, pipeline_stage: Optional[str] = None, **fields: Any
+) -> Iterator[StepMetrics]:
+    """
+    Times a pipeline stage or sub-step and logs `event` when it completes, with
+    `fields` plus:
+
+    - `duration_seconds`, `cpu_seconds` (process-wide, so it includes Polars,
+      DuckDB and delta-rs worker threads)
+    - `rss_peak_delta_bytes`: the step's peak RSS above the RSS it started at
+    - `rows_in`, `rows_out`, `bytes_read`, `bytes_written`, when known
+
+    Nothing is logged if the block raises; the stage's own error event covers it.
+    With `pipeline_stage` (ingest, transform, ...) listed in PROFILE_STAGES, the
+    step and the steps nested in it also write query plans and a folded-stack
+    sampling profile to PROFILE_OUTPUT_DIR.
+    """
+    parent = _current_step.get()
+    step = StepMetrics(
+        event, pipeline_stage or (parent.pipeline_stage if parent else None), fields
+    )
+
+    sampler: Optional[_Sampler] = None
+    if parent is not None and parent.profile_dir is not None:
+        step.profile_dir = parent.profile_dir
+    elif _profiling(pipeline_stage):
+        step.profile_dir = (
+            PROFILE_OUTPUT_DIR / f"{pipeline_stage}-{datetime.now():%Y%m%dT%H%M%S}"
+        )
+        step.profile_dir.mkdir(parents=True, exist_ok=True)
+        sampler = _Sampler(PROFILE_SAMPLE_INTERVAL_SECONDS)
+        sampler.start()
+
+    rss_start = current_rss_bytes()
+    with _memory_lock:
+        peak_before = peak_rss_bytes()
+        for open_step in _open_steps.values():
+            open_step._peak_rss = max(open_step._peak_rss or 0, peak_before or 0)
+        if _reset_peak():
+            step._peak_rss = rss_start
+        else:
+            step._peak_rss = peak_before
+        _open_steps[id(step)] = step
+
+    token = _current_step.set(step)
+    cpu_started = time.process_time()
+    started = time.perf_counter()
+    succeeded = False
+    try:
+        yield step
+        succeeded = True
+    finally:
+        duration = time.perf_counter() - started
+        cpu = time.process_time() - cpu_started
+        _current_step.reset(token)
+        with _memory_lock:
+            del _open_steps[id(step)]
+            peak = max(step._peak_rss or 0, peak_rss_bytes() or 0)
+        if _can_reset_peak:
+            rss_delta = peak - rss_start if rss_start is not None else None
+        else:
+            rss_delta = peak - peak_before if peak_before is not None else None
+
+        if sampler is not None:
+            sampler.stop()
+            profile_path = step.profile_dir / "profile.folded"
+            sampler.write(profile_path)
+            logger.info(
+                "profile_written", event_name=event, path=str(profile_path), samples=sampler.samples
+            )
+
+        if succeeded:
+            step._finish_delta_writes()
+            if step._child_bytes_read:
+                step.bytes_read = (step.bytes_read or 0) + step._child_bytes_read
+            if step._child_bytes_written:
+                step.bytes_written = (step.bytes_written or 0) + step._child_bytes_written
+            if parent is not None:
+                parent._add_child(step)
+
+            if step._emit:
+                metrics = {
+                    "duration_seconds": round(duration, 4),
+                    "cpu_seconds": round(cpu, 4),
+                    "rss_peak_delta_bytes": max(rss_delta, 0) if rss_delta is not None else None,
+                    "rows_in": step.rows_in,
+                    "rows_out": step.rows_out,
+                    "bytes_read": step.bytes_read,
+                    "bytes_written": step.bytes_written,
+                }
+                if step.profile_dir is not None:
+                    metrics["profile_dir"] = str(step.profile_dir)
+                log.info(
+                    step.event,
+                    **step.fields,
+                    **{k: v for k, v in metrics.items() if v is not None},
+                )
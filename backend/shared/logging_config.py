@@ -1,10 +1,223 @@
+import atexit
+import itertools
+import os
 import sys
+import threading
 import structlog
 import logging
-from typing import Any, Dict
+from collections import defaultdict, deque
+from typing import Any, Callable, Dict, IO, Optional
 
+try:
+    import orjson
+except ImportError:  # Optional: the fast mode falls back to the stdlib json encoder
+    orjson = None
 
-def configure_logger(json_logs: bool = True, log_level: str = "INFO") -> None:
+# Logging configuration, from env vars so it can be set per Container App revision / job
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_JSON = os.getenv("LOG_JSON", "true").lower() == "true"
+# Fast mode: orjson rendering, level filtering before the event dict is built,
+# and a background writer thread instead of synchronous writes to stdout
+LOG_FAST = os.getenv("LOG_FAST", "false").lower() == "true"
+# Fraction of debug events kept (per event name), e.g. 0.01 keeps 1 in 100
+LOG_DEBUG_SAMPLE_RATE = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "1.0"))
+# Lines buffered for the writer thread in fast mode; beyond that, events are dropped
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+
+def _dropped_line(count: int) -> bytes:
+    return (
+        b'{"event": "log_events_dropped", "dropped": %d, "logger": "logging_config", '
+        b'"level": "warning"}' % count
+    )
+
+
+class AsyncLogWriter:
+    """
+    Writes log lines to a stream from a background thread, in batches.
+
+    `write` only appends to a bounded in-memory buffer, so a slow or blocked
+    stream (a back-pressured stdout pipe) never stalls the caller: once
+    `max_queue` lines are waiting, new lines are dropped and counted, and the
+    count is reported as a `log_events_dropped` line, built by `render_dropped`.
+    """
+
+    def __init__(
+        self,
+        stream: IO,
+        max_queue: int = LOG_QUEUE_SIZE,
+        batch_size: int = 512,
+        flush_interval: float = 0.05,
+        render_dropped: Callable[[int], bytes] = _dropped_line,
+    ):
+        self._use_stream(stream)
+        self.render_dropped = render_dropped
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._reported_dropped = 0
+        self._lines: deque = deque()
+        self._wakeup = threading.Event()
+        self._drain_lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, line: bytes) -> None:
+        lines = self._lines
+        if len(lines) >= self.max_queue:
+            self.dropped += 1
+            return
+        lines.append(line)
+        if len(lines) == self.batch_size:
+            self._wakeup.set()
+
+    def flush(self) -> None:
+        """Writes everything buffered so far (from the caller's thread)."""
+        self._drain()
+
+    def set_stream(self, stream: IO) -> None:
+        """Sends later lines to `stream`; lines buffered so far go to the old one."""
+        self._drain()
+        with self._drain_lock:
+            self._use_stream(stream)
+
+    def _use_stream(self, stream: IO) -> None:
+        # Write bytes straight to the buffer underneath text streams like sys.stdout
+        self._stream = getattr(stream, "buffer", stream)
+        self._binary = not hasattr(self._stream, "encoding")
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._wakeup.set()
+        self._thread.join()
+        self._drain()
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self._drain()
+
+    def _drain(self) -> None:
+        with self._drain_lock:
+            lines = self._lines
+            while lines:
+                batch = []
+                while lines and len(batch) < self.batch_size:
+                    batch.append(lines.popleft())
+                if self.dropped != self._reported_dropped:
+                    batch.append(self.render_dropped(self.dropped - self._reported_dropped))
+                    self._reported_dropped = self.dropped
+                self._write_batch(batch)
+
+    def _write_batch(self, batch: list) -> None:
+        data = b"\n".join(batch) + b"\n"
+        try:
+            if self._binary:
+                self._stream.write(data)
+            else:
+                self._stream.write(data.decode("utf-8"))
+            self._stream.flush()
+        except (OSError, ValueError):
+            pass  # Stream closed (e.g. interpreter shutdown); nothing left to log to
+
+
+def _dropped_line_renderer(renderer: Callable) -> Callable[[int], bytes]:
+    """Renders the `log_events_dropped` line with the configured structlog renderer."""
+
+    def render(count: int) -> bytes:
+        line = renderer(
+            None,
+            "warning",
+            {
+                "event": "log_events_dropped",
+                "dropped": count,
+                "logger": "logging_config",
+                "level": "warning",
+            },
+        )
+        return line if isinstance(line, bytes) else line.encode("utf-8")
+
+    return render
+
+
+class QueueLogger:
+    """structlog logger that hands rendered lines to an AsyncLogWriter."""
+
+    def __init__(self, writer: AsyncLogWriter, name: Optional[str] = None):
+        self._writer = writer
+        self.name = name
+
+    def msg(self, message: Any) -> None:
+        self._writer.write(message if isinstance(message, bytes) else message.encode("utf-8"))
+
+    log = debug = info = warn = warning = error = err = critical = fatal = exception = msg
+
+
+class QueueLoggerFactory:
+    def __init__(self, writer: AsyncLogWriter):
+        self.writer = writer
+
+    def __call__(self, *args: Any) -> QueueLogger:
+        return QueueLogger(self.writer, args[0] if args else None)
+
+
+class _WriterHandler(logging.Handler):
+    """Routes stdlib log records (uvicorn, azure, ...) through the same writer."""
+
+    def __init__(self, writer: AsyncLogWriter):
+        super().__init__()
+        self.writer = writer
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.writer.write(self.format(record).encode("utf-8"))
+        except Exception:
+            self.handleError(record)
+
+
+class SampleDebugEvents:
+    """
+    Keeps one in every `1 / rate` debug events of each event name and drops
+    the rest; other levels are untouched.
+    """
+
+    def __init__(self, rate: float):
+        self.every = max(1, round(1 / rate)) if rate > 0 else 0
+        self._counters: Dict[str, Any] = defaultdict(itertools.count)
+
+    def __call__(self, logger: Any, method_name: str, event_dict: Dict[str, Any]) -> Dict[str, Any]:
+        if method_name != "debug":
+            return event_dict
+        if self.every == 0 or next(self._counters[event_dict.get("event")]) % self.every:
+            raise structlog.DropEvent
+        return event_dict
+
+
+_writer: Optional[AsyncLogWriter] = None
+
+
+def _close_writer() -> None:
+    global _writer
+    if _writer is not None:
+        _writer.close()
+        _writer = None
+
+
+atexit.register(_close_writer)
+
+
+def configure_logger(
+    json_logs: bool = LOG_JSON,
+    log_level: str = LOG_LEVEL,
+    fast: bool = LOG_FAST,
+    debug_sample_rate: float = LOG_DEBUG_SAMPLE_RATE,
+    stream: Optional[IO] = None,
+) -> None:
     """
     Configures structlog for the application.
 
@@ -12,25 +225,72 @@ def configure_logger(json_logs: bool = True, log_level: str = "INFO") -> None:
         json_logs: If True, outputs logs in JSON format (good for Azure Monitor).
                    If False, outputs pretty-printed logs (good for local dev).
         log_level: The logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL).
+        fast: Renders with orjson (when installed), drops events below `log_level`
+              before any processor runs, and writes from a background thread
+              in batches (see AsyncLogWriter).
+        debug_sample_rate: Fraction of debug events kept per event name.
+        stream: Where logs go (defaults to stdout).
     """
-
-    # Configure standard logging levels
-    logging.basicConfig(
-        format="%(message)s",
-        stream=sys.stdout,
-        level=log_level.upper(),
-    )
+    global _writer
+    stream = stream or sys.stdout
+    if _writer is not None:
+        # Loggers cached on first use keep the writer they were bound to, so the
+        # process keeps a single writer and reconfiguring only moves its stream
+        _writer.set_stream(stream)
 
     shared_processors = [
         structlog.contextvars.merge_contextvars,
         structlog.stdlib.add_logger_name,
         structlog.stdlib.add_log_level,
-        structlog.stdlib.PositionalArgumentsFormatter(),
+    ]
+    if not fast:
+        # The filtering bound logger of the fast mode formats positional args itself
+        shared_processors.append(structlog.stdlib.PositionalArgumentsFormatter())
+    shared_processors += [
         structlog.processors.TimeStamper(fmt="iso"),
         structlog.processors.StackInfoRenderer(),
         structlog.processors.format_exc_info,
         structlog.processors.UnicodeDecoder(),
     ]
+    if debug_sample_rate < 1:
+        shared_processors.insert(0, SampleDebugEvents(debug_sample_rate))
+
+    if fast:
+        if _writer is None:
+            _writer = AsyncLogWriter(stream)
+        if json_logs:
+            renderer = (
+                structlog.processors.JSONRenderer(
+                    serializer=orjson.dumps, option=orjson.OPT_NON_STR_KEYS
+                )
+                if orjson is not None
+                else structlog.processors.JSONRenderer()
+            )
+        else:
+            renderer = structlog.dev.ConsoleRenderer(colors=False)
+        _writer.render_dropped = _dropped_line_renderer(renderer)
+
+        handler = _WriterHandler(_writer)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logging.basicConfig(handlers=[handler], level=log_level.upper(), force=True)
+
+        structlog.configure(
+            processors=shared_processors + [renderer],
+            logger_factory=QueueLoggerFactory(_writer),
+            wrapper_class=structlog.make_filtering_bound_logger(
+                logging.getLevelName(log_level.upper())
+            ),
+            cache_logger_on_first_use=True,
+        )
+        return
+
+    # Configure standard logging levels
+    logging.basicConfig(
+        format="%(message)s",
+        stream=stream,
+        level=log_level.upper(),
+        force=True,
+    )
 
     if json_logs:
         # Production mode: JSON output for Azure Monitor / Log Analytics
@@ -47,5 +307,11 @@ def configure_logger(json_logs: bool = True, log_level: str = "INFO") -> None:
     )
 
 
+def flush_logs() -> None:
+    """Writes out lines still buffered by the fast mode's writer thread."""
+    if _writer is not None:
+        _writer.flush()
+
+
 def get_logger(name: str) -> structlog.stdlib.BoundLogger:
     return structlog.get_logger(name)
@@ -0,0 +1,87 @@
+import builtins
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+# Stdlib only: this module is imported first so it can time everything else.
+
+
+class ImportTimer:
+    """
+    Records how long each top-level package takes to import while installed.
+
+    Times are exclusive: when importing polars pulls in pyarrow, pyarrow's
+    time is counted under pyarrow, not polars, so the values add up to the
+    total. Modules that were already imported cost nothing and are not
+    listed. Meant to wrap a module's imports at startup (single-threaded):
+
+        with ImportTimer() as imports:
+            import polars
+        imports.seconds  # {"polars": 0.17, "pyarrow": 0.04, ...}
+    """
+
+    def __init__(self) -> None:
+        self.seconds: Dict[str, float] = {}
+        self.total_seconds = 0.0
+        # (package, time spent in nested packages) for imports in progress
+        self._stack: List[List[Any]] = []
+        self._original_import: Optional[Any] = None
+        self._started: Optional[float] = None
+
+    def __enter__(self) -> "ImportTimer":
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._import
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        builtins.__import__ = self._original_import
+        self.total_seconds += time.perf_counter() - self._started
+
+    def _import(self, name: str, globals: Any = None, locals: Any = None, fromlist: Any = (), level: int = 0) -> Any:
+        package = name.partition(".")[0]
+        if level or not package or name in sys.modules:
+            return self._original_import(name, globals, locals, fromlist, level)
+
+        frame = [package, 0.0]
+        self._stack.append(frame)
+        started = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - started
+            self._stack.pop()
+            exclusive = elapsed - frame[1]
+            if self._stack:
+                parent = self._stack[-1]
+                if parent[0] == package:
+                    # Submodule of the package being imported: its own time stays
+                    # with the parent, only the nested packages' time is passed up
+                    parent[1] += frame[1]
+                    exclusive = 0.0
+                else:
+                    parent[1] += elapsed
+            if exclusive > 0:
+                self.seconds[package] = self.seconds.get(package, 0.0) + exclusive
+
+    def top(self, n: int = 8, digits: int = 3) -> Dict[str, float]:
+        """The `n` slowest packages, slowest first, rounded for logging."""
+        ranked = sorted(self.seconds.items(), key=lambda item: item[1], reverse=True)
+        return {package: round(seconds, digits) for package, seconds in ranked[:n]}
+
+
+def process_age_seconds() -> Optional[float]:
+    """
+    Seconds since this process started (Linux), i.e. interpreter startup plus
+    everything since. None where /proc is unavailable.
+    """
+    try:
+        with open("/proc/self/stat") as f:
+            # Fields after the command name (which may contain spaces); starttime is field 22
+            fields = f.read().rpartition(")")[2].split()
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return round(uptime - int(fields[19]) / os.sysconf("SC_CLK_TCK"), 3)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
@@ -0,0 +1,120 @@
+"""
+Benchmark: Float64 vs Decimal(18,2) currency path.
+
+Compares the legacy regex + Float64 parse against transform_silver's balance
+parse (`parse_balances`: Decimal(18,2) plus the excess-precision flag), and the
+DuckDB SUM over DOUBLE vs DECIMAL(18,2), on messy currency strings
+("$1,234.56", "(1,607,943.00)", "-12.30"). Checks the Decimal totals are exact.
+Both parses run in a lazy frame, as in transform_silver.
+
+Usage:
+    python benchmarks/bench_currency.py --rows 2000000
+"""
+
+import argparse
+import random
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import duckdb
+import polars as pl
+
+from backend.etl.transform import parse_balances
+
+
+def legacy_float_currency(col_expr):
+    # The pre-Decimal implementation, kept here as the baseline
+    return (
+        col_expr.cast(pl.Utf8)
+        .str.replace_all(r"[$,)]", "")
+        .str.replace(r"\(", "-")
+        .cast(pl.Float64, strict=False)
+    )
+
+
+def make_values(rows: int, seed: int) -> pl.DataFrame:
+    rng = random.Random(seed)
+    values = []
+    for _ in range(rows):
+        cents = rng.randint(0, 10**11)
+        amount = f"{cents // 100:,}.{cents % 100:02d}"
+        style = rng.random()
+        if style < 0.4:
+            values.append(f"${amount}")
+        elif style < 0.6:
+            values.append(f"({amount})")
+        elif style < 0.8:
+            values.append(f"$({amount})")
+        elif style < 0.9:
+            values.append(f"-{amount}")
+        else:
+            values.append(amount.replace(",", ""))
+    return pl.DataFrame({"raw": values})
+
+
+def best_of(repeat: int, *fns):
+    # Runs the functions in turn on each round, so machine noise hits both sides
+    timings = [[] for _ in fns]
+    results = [None] * len(fns)
+    for _ in range(repeat):
+        for i, fn in enumerate(fns):
+            started = time.perf_counter()
+            results[i] = fn()
+            timings[i].append(time.perf_counter() - started)
+    return [(min(t), r) for t, r in zip(timings, results)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.10,
+        help="Allowed slowdown of the Decimal path vs Float64 before failing (fraction, for timer noise)",
+    )
+    args = parser.parse_args()
+
+    df = make_values(args.rows, args.seed)
+
+    (float_parse, floats), (decimal_parse, decimals) = best_of(
+        args.repeat,
+        lambda: df.lazy().select(legacy_float_currency(pl.col("raw")).alias("v")).collect(),
+        lambda: df.lazy().select(parse_balances({"v": "raw"})).collect(),
+    )
+
+    con = duckdb.connect()
+    con.register("floats", floats.to_arrow())
+    con.register("decimals", decimals.to_arrow())
+    (float_sum_time, float_sum), (decimal_sum_time, decimal_sum) = best_of(
+        args.repeat,
+        lambda: con.execute("SELECT SUM(v) FROM floats").fetchone()[0],
+        lambda: con.execute("SELECT SUM(v) FROM decimals").fetchone()[0],
+    )
+
+    exact = sum(decimals["v"].to_list(), Decimal("0"))
+
+    print(f"rows: {args.rows:,}")
+    print(f"{'step':<22}{'Float64 (s)':>14}{'Decimal(18,2) (s)':>20}")
+    print(f"{'parse':<22}{float_parse:>14.4f}{decimal_parse:>20.4f}")
+    print(f"{'duckdb SUM':<22}{float_sum_time:>14.4f}{decimal_sum_time:>20.4f}")
+    print(f"exact total:   {exact}")
+    print(f"Decimal total: {decimal_sum}  (drift {Decimal(decimal_sum) - exact})")
+    print(f"Float64 total: {float_sum!r}  (drift {Decimal(float_sum) - exact})")
+
+    ratio = (decimal_parse + decimal_sum_time) / (float_parse + float_sum_time)
+    print(f"Decimal / Float64 time: {ratio:.3f}")
+
+    ok = decimal_sum == exact and ratio <= 1 + args.tolerance
+    print("result:", "PASS" if ok else "FAIL")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
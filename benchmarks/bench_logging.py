@@ -0,0 +1,111 @@
+"""
+Benchmark: default vs fast structlog configuration.
+
+Measures events/s seen by the caller for typical pipeline/API events, for debug
+events below the configured level (filtered) and with debug sampling, writing
+to /dev/null and to a slow sink that simulates a back-pressured stdout pipe.
+For the fast mode, end-to-end throughput (after the writer thread flushed
+everything) is reported as well.
+
+Usage:
+    python benchmarks/bench_logging.py --events 200000
+"""
+
+import argparse
+import os
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import structlog
+
+from backend.shared.logging_config import configure_logger, flush_logs
+
+
+class SlowSink:
+    """A text stream whose every write stalls like a full pipe draining."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.encoding = "utf-8"
+
+    def write(self, data):
+        time.sleep(self.delay)
+        return len(data)
+
+    def flush(self):
+        pass
+
+
+def emit(logger, method: str, events: int) -> None:
+    log = getattr(logger, method)
+    for i in range(events):
+        log(
+            "silver_merge_completed",
+            table="households",
+            rows_inserted=i,
+            rows_updated=0,
+            duration_seconds=0.0123,
+            value=Decimal("1234.56"),
+        )
+
+
+def run(mode: str, method: str, events: int, stream, level: str = "INFO", sample_rate: float = 1.0):
+    configure_logger(
+        json_logs=True,
+        log_level=level,
+        fast=mode == "fast",
+        debug_sample_rate=sample_rate,
+        stream=stream,
+    )
+    logger = structlog.get_logger("bench")
+    started = time.perf_counter()
+    emit(logger, method, events)
+    caller = time.perf_counter() - started
+    flush_logs()
+    total = time.perf_counter() - started
+    return events / caller, events / total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument(
+        "--slow-sink-ms", type=float, default=0.2, help="Stall per write of the slow sink"
+    )
+    args = parser.parse_args()
+
+    devnull = open(os.devnull, "w")
+    slow_events = max(1, args.events // 50)
+    scenarios = [
+        ("info events -> /dev/null", "info", args.events, devnull, "INFO", 1.0),
+        ("debug events, level INFO (filtered)", "debug", args.events, devnull, "INFO", 1.0),
+        ("debug events, level DEBUG, 1% sampled", "debug", args.events, devnull, "DEBUG", 0.01),
+        (
+            f"info events -> slow sink ({args.slow_sink_ms}ms/write, {slow_events} events)",
+            "info",
+            slow_events,
+            SlowSink(args.slow_sink_ms / 1000),
+            "INFO",
+            1.0,
+        ),
+    ]
+
+    # Results go to stderr: the configured loggers own stdout
+    out = sys.__stderr__
+    print(f"{'scenario':<58} {'default/s':>12} {'fast/s':>12} {'speedup':>8} {'fast e2e/s':>12}", file=out)
+    for name, method, events, stream, level, rate in scenarios:
+        default, _ = run("default", method, events, stream, level, rate)
+        fast, fast_e2e = run("fast", method, events, stream, level, rate)
+        print(
+            f"{name:<58} {default:>12,.0f} {fast:>12,.0f} {fast / default:>7.1f}x {fast_e2e:>12,.0f}",
+            file=out,
+        )
+    configure_logger(stream=sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
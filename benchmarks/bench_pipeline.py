@@ -0,0 +1,580 @@
+"""
+Benchmark: ETL stages and the Gold query path at several data scales.
+
+For each scale a household report is generated (scripts/create_dummy_data.py)
+into a fresh temp LAKEHOUSE_ROOT, then ingest, transform, aggregate and a set of
+API queries through `query_gold_table` run one after another, each in its own
+subprocess so peak RSS is per stage. Wall/CPU time, rows/s, peak RSS and bytes
+written go to a JSON results file, which is compared against a stored baseline.
+
+Cold start is measured too: wall time of a fresh interpreter running the ETL
+CLI (`--help`) and importing the API, with a per-package import-time breakdown
+from `python -X importtime`.
+
+Usage:
+    python benchmarks/bench_pipeline.py --scales 10k,100k
+    python benchmarks/bench_pipeline.py --scales 10k,100k,1M,10M --output nightly.json
+    python benchmarks/bench_pipeline.py --scales 10k,100k,1M --save-baseline
+    python benchmarks/bench_pipeline.py --scales ""            # startup only
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+STAGES = ["ingest", "transform", "aggregate", "query"]
+DEFAULT_SCALES = "10k,100k,1M,10M"
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+DEFAULT_OUTPUT = Path(__file__).parent / "results" / "latest.json"
+
+# Compared against the baseline; rates are derived from these
+COMPARED_METRICS = ("seconds", "peak_rss_bytes")
+
+# Cold-start commands (python arguments), run from the repo root
+STARTUP_TARGETS = {
+    "etl_cli": ["-m", "backend.etl.run", "--help"],
+    "api": ["-c", "import backend.app.main"],
+}
+# Startup regressions smaller than this are noise
+STARTUP_MIN_SECONDS = 0.05
+
+
+def parse_scale(text: str) -> int:
+    text = text.strip().lower().replace("_", "")
+    for suffix, factor in (("k", 1_000), ("m", 1_000_000)):
+        if text.endswith(suffix):
+            return int(float(text[:-1]) * factor)
+    return int(text)
+
+
+def scale_label(rows: int) -> str:
+    if rows >= 1_000_000 and rows % 1_000_000 == 0:
+        return f"{rows // 1_000_000}M"
+    if rows >= 1_000 and rows % 1_000 == 0:
+        return f"{rows // 1_000}k"
+    return str(rows)
+
+
+def directory_bytes(path: Path) -> int:
+    if not path.exists():
+        return 0
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+def peak_rss_bytes() -> Optional[int]:
+    # Linux keeps ru_maxrss across fork + exec, so a worker would report the
+    # orchestrator's peak (e.g. from generating the source); VmHWM is per process
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+# Worker side: runs inside the subprocess, with LAKEHOUSE_ROOT already set
+
+
+def run_ingest() -> Dict[str, Any]:
+    from backend.etl.ingest import ingest_excel_to_bronze
+
+    ingest_excel_to_bronze(force=True)
+    return {}
+
+
+def run_transform() -> Dict[str, Any]:
+    from backend.etl.transform import transform_silver
+
+    transform_silver()
+    return {}
+
+
+def run_aggregate() -> Dict[str, Any]:
+    from backend.etl.aggregate import aggregate_gold
+
+    aggregate_gold()
+    return {}
+
+
+def run_queries(repeat: int) -> Dict[str, Any]:
+    """
+    Dashboard queries through the API's query layer: the first (cold) call
+    loads the Gold cache, the rest are warm.
+    """
+    from backend.app.api.endpoints import query_gold_table
+
+    queries = {
+        "kpi_lookup": (
+            "agg_kpi_daily",
+            """SELECT kpi_name, value FROM {table}
+            WHERE report_date = (SELECT MAX(report_date) FROM {table})
+              AND dimension_type = ? AND dimension_value = ?""",
+            ["Bank", "All"],
+        ),
+        "leaderboard_page": (
+            "agg_officer_leaderboard",
+            """SELECT rank_desc, officer_code, value FROM {table}
+            WHERE report_date = (SELECT MAX(report_date) FROM {table})
+              AND metric = ? AND rank_desc > ? AND rank_desc <= ?
+            ORDER BY rank_desc""",
+            ["balance", 0, 25],
+        ),
+        "households_page": (
+            "fact_household_monthly",
+            """SELECT household_key, officer_key, total_deposits FROM {table}
+            WHERE date_key = (SELECT MAX(date_key) FROM {table})
+            ORDER BY household_key LIMIT ? OFFSET ?""",
+            [500, 1000],
+        ),
+        "team_totals_scan": (
+            "fact_household_monthly",
+            """SELECT team_key, SUM(total_deposits) AS deposits, COUNT(*) AS households
+            FROM {table} GROUP BY team_key""",
+            None,
+        ),
+    }
+
+    details = {}
+    for name, (table, query, params) in queries.items():
+        started = time.perf_counter()
+        rows = query_gold_table(table, query, params)
+        cold = time.perf_counter() - started
+
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            query_gold_table(table, query, params)
+            timings.append(time.perf_counter() - started)
+        timings.sort()
+        details[name] = {
+            "rows_returned": len(rows),
+            "cold_seconds": round(cold, 6),
+            "p50_seconds": round(statistics.median(timings), 6),
+            "p95_seconds": round(timings[int(0.95 * (len(timings) - 1))], 6),
+        }
+    return details
+
+
+def run_worker(stage: str, rows: int, repeat: int, result_path: Path) -> None:
+    lakehouse = Path(os.environ["LAKEHOUSE_ROOT"])
+    stage_fn: Callable[[], Dict[str, Any]] = {
+        "ingest": run_ingest,
+        "transform": run_transform,
+        "aggregate": run_aggregate,
+        "query": lambda: run_queries(repeat),
+    }[stage]
+
+    rss_before = peak_rss_bytes()
+    bytes_before = directory_bytes(lakehouse)
+    cpu_started = time.process_time()
+    started = time.perf_counter()
+    details = stage_fn()
+    seconds = time.perf_counter() - started
+    cpu_seconds = time.process_time() - cpu_started
+
+    if stage == "query":
+        # Rows scanned vary per query; throughput is queries per second
+        calls = len(details) * (repeat + 1)
+        throughput = {"queries": calls, "queries_per_second": round(calls / seconds, 1)}
+    else:
+        throughput = {"rows": rows, "rows_per_second": round(rows / seconds) if seconds else None}
+
+    result_path.write_text(
+        json.dumps(
+            {
+                "seconds": round(seconds, 4),
+                "cpu_seconds": round(cpu_seconds, 4),
+                **throughput,
+                "peak_rss_bytes": peak_rss_bytes(),
+                "rss_after_imports_bytes": rss_before,
+                "bytes_written": directory_bytes(lakehouse) - bytes_before,
+                "details": details,
+            }
+        )
+    )
+
+
+# Orchestrator side
+
+
+def generate_source(rows: int, officers: Optional[int], fmt: str, seed: int, path: Path) -> None:
+    from scripts.create_dummy_data import XLSX_MAX_ROWS, generate_reports, write_report
+
+    if fmt == "xlsx" and rows > XLSX_MAX_ROWS:
+        raise SystemExit(f"{rows:,} rows exceed the xlsx sheet limit; use --source-format parquet")
+    officers = officers or max(20, min(2000, rows // 2500))
+    _, report = next(generate_reports(households=rows, officers=officers, seed=seed))
+    write_report(report, path, fmt)
+
+
+def run_stages(
+    rows: int, args: argparse.Namespace, scale_dir: Path, source: Path, attempt: int
+) -> Dict[str, Any]:
+    """One pass of every stage, each in a subprocess, against a fresh lakehouse."""
+    label = scale_label(rows)
+    env = dict(
+        os.environ,
+        LAKEHOUSE_ROOT=str(scale_dir / f"lakehouse_{attempt}"),
+        SOURCE_FILE_PATH=str(source),
+    )
+    stages: Dict[str, Any] = {}
+    for stage in STAGES:
+        result_path = scale_dir / f"{stage}_{attempt}.json"
+        completed = subprocess.run(
+            [
+                sys.executable,
+                str(Path(__file__).resolve()),
+                "--worker",
+                stage,
+                "--worker-rows",
+                str(rows),
+                "--query-repeat",
+                str(args.query_repeat),
+                "--worker-result",
+                str(result_path),
+            ],
+            env=env,
+            cwd=ROOT,
+            stdout=None if args.verbose else subprocess.DEVNULL,
+            stderr=None if args.verbose else subprocess.PIPE,
+            text=True,
+        )
+        if completed.returncode != 0:
+            stages[stage] = {"status": "failed", "error": (completed.stderr or "")[-2000:]}
+            print(f"[{label}] {stage} FAILED", flush=True)
+            break
+        stages[stage] = {"status": "ok", **json.loads(result_path.read_text())}
+        print(f"[{label}] {stage} {stages[stage]['seconds']:.2f}s", flush=True)
+    if not args.keep:
+        shutil.rmtree(env["LAKEHOUSE_ROOT"], ignore_errors=True)
+    return stages
+
+
+def run_scale(rows: int, args: argparse.Namespace, workdir: Path) -> Dict[str, Any]:
+    """
+    Generates the source once, then runs the stages `--repeat` times and keeps
+    each stage's fastest run (the least disturbed by other load on the machine).
+    """
+    label = scale_label(rows)
+    scale_dir = Path(tempfile.mkdtemp(prefix=f"bench_{label}_", dir=workdir))
+    source = scale_dir / f"household-balance-report.{args.source_format}"
+
+    print(f"[{label}] generating {rows:,} rows ({args.source_format})", flush=True)
+    started = time.perf_counter()
+    generate_source(rows, args.officers, args.source_format, args.seed, source)
+    generate_seconds = time.perf_counter() - started
+
+    stages: Dict[str, Any] = {}
+    try:
+        for attempt in range(args.repeat):
+            for stage, result in run_stages(rows, args, scale_dir, source, attempt).items():
+                best = stages.get(stage)
+                if (
+                    best is None
+                    or result["status"] != "ok"
+                    or (best["status"] == "ok" and result["seconds"] < best["seconds"])
+                ):
+                    stages[stage] = result
+            if any(r["status"] != "ok" for r in stages.values()):
+                break
+    finally:
+        if not args.keep:
+            shutil.rmtree(scale_dir, ignore_errors=True)
+
+    return {
+        "rows": rows,
+        "source_format": args.source_format,
+        "repeat": args.repeat,
+        "generate_seconds": round(generate_seconds, 3),
+        "stages": stages,
+    }
+
+
+def import_breakdown(importtime_output: str, top: int = 8) -> Dict[str, float]:
+    """Exclusive import seconds per top-level package from `-X importtime` output."""
+    seconds: Dict[str, float] = {}
+    for line in importtime_output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = [part.strip() for part in line[len("import time:"):].split("|")]
+        package = name.split(".")[0]
+        seconds[package] = seconds.get(package, 0.0) + int(self_us) / 1e6
+    ranked = sorted(seconds.items(), key=lambda item: item[1], reverse=True)
+    return {package: round(value, 4) for package, value in ranked[:top]}
+
+
+def measure_startup(repeat: int) -> Dict[str, Any]:
+    """Best-of-`repeat` cold start per target, plus one `-X importtime` run for the breakdown."""
+    env = {**os.environ, "PYTHONPATH": str(ROOT)}
+    results = {}
+    for target, python_args in STARTUP_TARGETS.items():
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            subprocess.run(
+                [sys.executable, *python_args], cwd=ROOT, env=env, capture_output=True, check=True
+            )
+            timings.append(time.perf_counter() - started)
+        traced = subprocess.run(
+            [sys.executable, "-X", "importtime", *python_args],
+            cwd=ROOT,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        breakdown = import_breakdown(traced.stderr, top=10_000)
+        results[target] = {
+            "status": "ok",
+            "seconds": round(min(timings), 4),
+            "import_seconds": round(sum(breakdown.values()), 4),
+            "imports": dict(list(breakdown.items())[:8]),
+        }
+    return results
+
+
+def package_versions() -> Dict[str, str]:
+    versions = {}
+    for name in ("polars", "duckdb", "deltalake", "pyarrow"):
+        try:
+            versions[name] = __import__(name).__version__
+        except ImportError:
+            versions[name] = "missing"
+    return versions
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "packages": package_versions(),
+        "git_commit": git_commit(),
+    }
+
+
+def compare(
+    results: Dict[str, Any], baseline: Dict[str, Any], threshold: float, min_seconds: float
+) -> List[Dict[str, Any]]:
+    """
+    Per (scale, stage, metric) ratio against the baseline. A metric regresses
+    when it grew by more than `threshold`; time deltas under `min_seconds` are
+    treated as noise. Scales or formats missing from the baseline are skipped.
+    """
+    rows = []
+    for label, scale in results["scales"].items():
+        base_scale = baseline.get("scales", {}).get(label)
+        if not base_scale or base_scale.get("source_format") != scale["source_format"]:
+            continue
+        for stage, result in scale["stages"].items():
+            base = base_scale["stages"].get(stage)
+            if result.get("status") != "ok" or not base or base.get("status") != "ok":
+                continue
+            for metric in COMPARED_METRICS:
+                current, previous = result.get(metric), base.get(metric)
+                if not current or not previous:
+                    continue
+                ratio = current / previous
+                noise = metric == "seconds" and current - previous < min_seconds
+                rows.append(
+                    {
+                        "scale": label,
+                        "stage": stage,
+                        "metric": metric,
+                        "baseline": previous,
+                        "current": current,
+                        "ratio": round(ratio, 3),
+                        "regressed": ratio > 1 + threshold and not noise,
+                    }
+                )
+
+    for target, result in results.get("startup", {}).items():
+        base = baseline.get("startup", {}).get(target)
+        if not base:
+            continue
+        current, previous = result["seconds"], base["seconds"]
+        ratio = current / previous
+        rows.append(
+            {
+                "scale": "startup",
+                "stage": target,
+                "metric": "seconds",
+                "baseline": previous,
+                "current": current,
+                "ratio": round(ratio, 3),
+                "regressed": ratio > 1 + threshold and current - previous >= STARTUP_MIN_SECONDS,
+            }
+        )
+    return rows
+
+
+def print_report(results: Dict[str, Any], comparison: List[Dict[str, Any]]) -> None:
+    ratios = {(c["scale"], c["stage"], c["metric"]): c for c in comparison}
+    print()
+    print(
+        f"{'scale':<7}{'stage':<11}{'seconds':>10}{'throughput':>15}{'peak RSS MB':>13}"
+        f"{'written MB':>12}{'vs baseline':>13}"
+    )
+    for label, scale in results["scales"].items():
+        for stage, result in scale["stages"].items():
+            if result.get("status") != "ok":
+                print(f"{label:<7}{stage:<11}{'FAILED':>10}")
+                continue
+            versus = ratios.get((label, stage, "seconds"))
+            change = f"{versus['ratio']:.2f}x" if versus else "-"
+            if "queries_per_second" in result:
+                throughput = f"{result['queries_per_second']:,.1f} q/s"
+            else:
+                throughput = f"{result['rows_per_second']:,} rows/s"
+            rss = result["peak_rss_bytes"]
+            print(
+                f"{label:<7}{stage:<11}{result['seconds']:>10.3f}"
+                f"{throughput:>15}"
+                f"{(rss or 0) / 2**20:>13.1f}"
+                f"{result['bytes_written'] / 2**20:>12.1f}"
+                f"{change:>13}"
+            )
+        queries = scale["stages"].get("query", {}).get("details", {})
+        for name, q in queries.items():
+            print(
+                f"{'':<7}  {name:<24} cold {q['cold_seconds'] * 1000:8.1f} ms"
+                f"  p50 {q['p50_seconds'] * 1000:7.2f} ms  p95 {q['p95_seconds'] * 1000:7.2f} ms"
+            )
+
+    startup = results.get("startup", {})
+    if startup:
+        print()
+        print(f"{'startup':<18}{'seconds':>10}{'imports s':>11}{'vs baseline':>13}  slowest imports")
+        for target, result in startup.items():
+            versus = ratios.get(("startup", target, "seconds"))
+            change = f"{versus['ratio']:.2f}x" if versus else "-"
+            slowest = ", ".join(f"{name} {seconds:.3f}" for name, seconds in list(result["imports"].items())[:4])
+            print(
+                f"{target:<18}{result['seconds']:>10.3f}{result['import_seconds']:>11.3f}"
+                f"{change:>13}  {slowest}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scales", default=DEFAULT_SCALES, help="Comma-separated row counts, e.g. 10k,100k,1M")
+    parser.add_argument("--source-format", choices=["parquet", "xlsx"], default="parquet",
+                        help="Source file for ingest; xlsx exercises the Excel reader but caps at ~1M rows")
+    parser.add_argument("--officers", type=int, default=None, help="Officer cardinality (default scales with rows)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per scale; the fastest run of each stage is kept")
+    parser.add_argument("--query-repeat", type=int, default=20, help="Warm runs per query")
+    parser.add_argument("--startup-repeat", type=int, default=5,
+                        help="Cold starts per startup target; the fastest is kept (0 skips startup)")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Write these results as the new baseline")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Allowed growth of time / peak RSS over the baseline before failing (fraction)",
+    )
+    parser.add_argument("--min-seconds", type=float, default=0.25, help="Ignore slowdowns smaller than this")
+    parser.add_argument("--workdir", type=Path, default=None, help="Where temp lakehouses go (default: system temp)")
+    parser.add_argument("--keep", action="store_true", help="Keep the generated lakehouses")
+    parser.add_argument("--verbose", action="store_true", help="Show pipeline logs")
+    # Internal: a single stage in a subprocess
+    parser.add_argument("--worker", choices=STAGES, help=argparse.SUPPRESS)
+    parser.add_argument("--worker-rows", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--worker-result", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.worker_rows, args.query_repeat, args.worker_result)
+        return
+
+    scales = [parse_scale(s) for s in args.scales.split(",") if s.strip()]
+    workdir = args.workdir or Path(tempfile.gettempdir())
+    workdir.mkdir(parents=True, exist_ok=True)
+
+    results = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "environment": environment(),
+        "settings": {"seed": args.seed, "query_repeat": args.query_repeat},
+        "scales": {},
+    }
+    if args.startup_repeat > 0:
+        results["startup"] = measure_startup(args.startup_repeat)
+    for rows in scales:
+        results["scales"][scale_label(rows)] = run_scale(rows, args, workdir)
+
+    comparison: List[Dict[str, Any]] = []
+    if args.baseline.exists() and not args.save_baseline:
+        baseline = json.loads(args.baseline.read_text())
+        if baseline.get("environment", {}).get("cpu_count") != os.cpu_count():
+            print(f"note: baseline was recorded on a different machine ({args.baseline})")
+        comparison = compare(results, baseline, args.threshold, args.min_seconds)
+        results["baseline"] = {"path": str(args.baseline), "created_at": baseline.get("created_at")}
+    results["comparison"] = comparison
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(results, indent=2))
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2))
+
+    print_report(results, comparison)
+    print(f"\nresults: {args.output}")
+
+    failed = [
+        f"{label}/{stage}"
+        for label, scale in results["scales"].items()
+        for stage, result in scale["stages"].items()
+        if result.get("status") != "ok"
+    ]
+    regressions = [c for c in comparison if c["regressed"]]
+    for c in regressions:
+        print(
+            f"REGRESSION {c['scale']}/{c['stage']} {c['metric']}: "
+            f"{c['baseline']} -> {c['current']} ({c['ratio']:.2f}x)"
+        )
+    ok = not failed and not regressions
+    print("result:", "PASS" if ok else "FAIL")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,62 +1,426 @@
-import pandas as pd
-import os
+"""
+Synthetic household balance reports for load tests, benchmarks and backfills.
+
+Everything is generated with Polars expressions (no per-row Python), so millions
+of rows take seconds. Output mirrors the real SharePoint export, including the
+quirks the ETL has to handle:
+
+- Officer Code / Officer Name columns swapped (the export puts the name under
+  "Officer Code"); `--swap-rate` of rows use the other orientation.
+- Currency text such as "$1,234.56", "$(1,607,943.43)" and "(500.00)" on
+  `--messy-rate` of the balance cells.
+- A trailing "Totals" row.
+
+Usage:
+    python scripts/create_dummy_data.py                       # 1,000 rows -> ux/public/data/*.xlsx
+    python scripts/create_dummy_data.py --households 2000000 --format parquet --out /tmp/report.parquet
+    python scripts/create_dummy_data.py --months 6 --end-month 2024-06 --out /tmp/backfill/report.csv
+"""
+
+import argparse
+import math
+import sys
+import time
+from datetime import date
 from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+import polars as pl
 
 # Define the target directory and file
 TARGET_DIR = Path("ux/public/data")
 TARGET_FILE = TARGET_DIR / "household-balance-report.xlsx"
 
+FORMATS = ("xlsx", "csv", "parquet")
+XLSX_MAX_ROWS = 1_048_575  # sheet limit minus the header row
+
+BALANCE_COLUMNS = [
+    "Current Month-end Deposit Balance",
+    "Prior Month-end Deposit Balance",
+    "Prior Year-end Deposit Balance",
+]
+CHANGE_COLUMNS = [
+    "Deposit Balance Change Month-over-Month",
+    "Deposit Balance Change Year-to-date",
+]
+LOAN_RATIO_COLUMNS = [
+    "% of Deposits to Loans (Current)",
+    "% of Deposits to Loans (Prior)",
+    "% of Deposits to Loans (YTD)",
+]
+REPORT_COLUMNS = (
+    ["Household ID", "Household Name", "Officer Code", "Officer Name"]
+    + LOAN_RATIO_COLUMNS
+    + BALANCE_COLUMNS
+    + CHANGE_COLUMNS
+)
+
+# Teams in the order officers are assigned to them (see backend/etl/reference_data)
+TEAM_IDS = ["BB", "OCF", "PB"]
+
+FIRST_NAMES = [
+    "Mark", "Brad", "Cary", "Josh", "Jose", "Marlon", "Scott", "Bryan", "Jack", "Hans",
+    "Tracey", "Thomas", "Daniel", "Mohamed", "John", "Steve", "Robyn", "Kori", "Matthew",
+    "Julie", "Taylor", "Nicole", "Jennifer", "Glenn", "Sarah", "Mike", "Laura", "Priya",
+]
+LAST_NAMES = [
+    "Morrison", "Kirkland", "Listerman", "Copen", "Morales", "Attiq", "McCurdy", "Ford",
+    "Korth", "Dessureault", "Brinkman", "Merrill", "McCarthy", "Arfaoui", "Trendell",
+    "Tomasello", "Barrett", "Bacich", "Matheson", "Jones", "Spicer", "Curtiss", "Sherby",
+    "Bianchini", "Jenkins", "Ross", "Nguyen", "Patel",
+]
+NAME_WORDS = [
+    "MODERN", "BOOKKEEPING", "CHERRY", "FUEL", "CELL", "CENTRACORE", "CONSTABLE", "REAL",
+    "ESTATE", "LIONS", "CLUB", "PIPES", "WOODLINE", "BUILDING", "HARBOR", "SUMMIT", "OAK",
+    "RIVER", "VALLEY", "NORTHERN", "PRAIRIE", "GRANITE", "CEDAR", "MAPLE", "PIONEER",
+]
+NAME_SUFFIXES = ["HOUSEHOLD", "LLC HOUSEHOLD", "INC HOUSEHOLD", "Household", "CO INC HOUSEHOLD"]
+
+_MASK64 = 2**64
+_GOLDEN = 0x9E3779B97F4A7C15
+
+
+def uniform(index: pl.Expr, seed: int, stream: int) -> pl.Expr:
+    """
+    Uniform [0, 1) floats from a row index, via the SplitMix64 mixer.
+
+    Implemented with wrapping UInt64 arithmetic, so results depend only on
+    (seed, stream, index): reproducible across runs, machines and Polars versions.
+    Each `stream` is an independent sequence for the same rows.
+    """
+    offset = ((seed * 0x100000001B3 + stream + 1) * _GOLDEN) % _MASK64
+    z = index.cast(pl.UInt64) * pl.lit(_GOLDEN, dtype=pl.UInt64) + pl.lit(offset, dtype=pl.UInt64)
+    z = z.xor(z // (2**30)) * pl.lit(0xBF58476D1CE4E5B9, dtype=pl.UInt64)
+    z = z.xor(z // (2**27)) * pl.lit(0x94D049BB133111EB, dtype=pl.UInt64)
+    z = z.xor(z // (2**31))
+    # Top 53 bits -> exactly representable double in [0, 1)
+    return (z // (2**11)).cast(pl.Float64) / float(2**53)
+
 
-def create_dummy_excel():
-    print(f"Ensuring directory exists: {TARGET_DIR}")
-    TARGET_DIR.mkdir(parents=True, exist_ok=True)
-
-    data = [
-        {
-            "Transaction Date": "2024-01-15",
-            "Account Number": "123456789",
-            "Description": "Deposit",
-            "Debit": 0,
-            "Credit": 5000,
-            "Category": "Income",
-            "Household ID": "100001",
-            "Household Name": "Smith Family",
-            "Officer Code": "OFF001",
-            "Officer Name": "Sarah Jenkins",
-            "Current Month-end Deposit Balance": 150000,
-            "Prior Month-end Deposit Balance": 145000,
-            "Prior Year-end Deposit Balance": 120000,
-        },
-        {
-            "Transaction Date": "2024-01-20",
-            "Account Number": "987654321",
-            "Description": "Utility Bill",
-            "Debit": 200,
-            "Credit": 0,
-            "Category": "Utilities",
-            "Household ID": "100002",
-            "Household Name": "Jones Family",
-            "Officer Code": "OFF002",
-            "Officer Name": "Mike Ross",
-            "Current Month-end Deposit Balance": 80000,
-            "Prior Month-end Deposit Balance": 80200,
-            "Prior Year-end Deposit Balance": 75000,
-        },
+def normal(index: pl.Expr, seed: int, stream: int) -> pl.Expr:
+    """Standard normal via Box-Muller over two uniform streams."""
+    u1 = 1.0 - uniform(index, seed, stream)  # (0, 1], safe for log
+    u2 = uniform(index, seed, stream + 1)
+    return (-2.0 * u1.log()).sqrt() * (2.0 * math.pi * u2).cos()
+
+
+def pick(index: pl.Expr, values: List[str], seed: int, stream: int, skew: float = 1.0) -> pl.Expr:
+    """
+    Picks from `values` per row. `skew` > 1 favours the first values
+    (u ** skew concentrates near 0), giving a few large books and a long tail.
+    """
+    position = (uniform(index, seed, stream).pow(skew) * len(values)).floor().cast(pl.Int64)
+    return position.replace_strict(dict(enumerate(values)), return_dtype=pl.Utf8)
+
+
+def officer_roster(officers: int, teams: int, seed: int) -> pl.DataFrame:
+    """
+    Officers with a numeric code, a unique name and a team.
+
+    The first `teams - 1` teams (BB, OCF) get roughly a fifth of the officers
+    each; everyone else is in Personal Banking, the catch-all team.
+    """
+    if not 1 <= teams <= len(TEAM_IDS):
+        raise ValueError(f"teams must be between 1 and {len(TEAM_IDS)}")
+    i = pl.int_range(0, officers, dtype=pl.Int64)
+    n_first, n_last = len(FIRST_NAMES), len(LAST_NAMES)
+    share = max(1, officers // 5)
+    named_teams = TEAM_IDS[: teams - 1]
+    team = pl.lit(TEAM_IDS[-1])
+    for position, team_id in reversed(list(enumerate(named_teams))):
+        team = pl.when(i // share == position).then(pl.lit(team_id)).otherwise(team)
+
+    return pl.select(
+        (i + 100).cast(pl.Utf8).alias("officer_code"),
+        # (first, last) pairs are distinct for the first n_first * n_last officers; past that a
+        # generation number keeps names unique at any cardinality
+        pl.concat_str(
+            [
+                ((i + seed) % n_first).replace_strict(dict(enumerate(FIRST_NAMES)), return_dtype=pl.Utf8),
+                pl.lit(" "),
+                ((i // n_first + seed) % n_last).replace_strict(dict(enumerate(LAST_NAMES)), return_dtype=pl.Utf8),
+                pl.when(i >= n_first * n_last)
+                .then(pl.lit(" ") + (i // (n_first * n_last) + 1).cast(pl.Utf8))
+                .otherwise(pl.lit("")),
+            ]
+        ).alias("officer_name"),
+        team.alias("team_id"),
+    )
+
+
+def month_sequence(end_month: date, months: int) -> List[date]:
+    """First day of each of the `months` months ending at `end_month`."""
+    index = end_month.year * 12 + end_month.month - 1
+    return [
+        date(m // 12, m % 12 + 1, 1) for m in range(index - months + 1, index + 1)
     ]
 
-    df = pd.DataFrame(data)
 
-    print(f"Writing dummy data to {TARGET_FILE}...")
-    try:
-        df.to_excel(TARGET_FILE, index=False)
-        print("Success!")
-    except ImportError:
-        print(
-            "Error: 'openpyxl' library is missing. Please install it with: pip install openpyxl"
+def generate_balances(
+    households: int, officers: pl.DataFrame, months: List[date], seed: int
+) -> pl.DataFrame:
+    """
+    Long frame of (household, month) balances for every requested month.
+
+    Balances start lognormal (median ~$50k, heavy right tail, ~3% closed at
+    zero, ~1% overdrawn) and drift month to month with lognormal growth. Each
+    row carries the prior month-end and prior year-end balances of the same
+    series, so a multi-month history is internally consistent.
+    """
+    # Simulate from the December before the first requested month
+    first = months[0]
+    start_index = (first.year - 1) * 12 + 11
+    steps = months[-1].year * 12 + months[-1].month - 1 - start_index + 1
+
+    h = pl.int_range(0, households, dtype=pl.Int64)
+    base = pl.select(
+        h.alias("h"),
+        (100001 + h).cast(pl.Utf8).alias("household_id"),
+        pl.concat_str(
+            [
+                pick(h, NAME_WORDS, seed, 10),
+                pick(h, NAME_WORDS, seed, 11),
+                pick(h, NAME_SUFFIXES, seed, 12, skew=2.0),
+            ],
+            separator=" ",
+        ).alias("household_name"),
+        # Skewed book sizes: low officer indexes hold most households
+        (uniform(h, seed, 13).pow(1.6) * len(officers)).floor().cast(pl.Int64).alias("officer_index"),
+        (math.log(50_000) + 1.6 * normal(h, seed, 14)).exp().alias("opening"),
+        pl.when(uniform(h, seed, 16) < 0.03)
+        .then(0.0)
+        .when(uniform(h, seed, 17) < 0.01)
+        .then(-1.0)
+        .otherwise(1.0)
+        .alias("sign"),
+    ).join(
+        officers.with_row_index("officer_index").with_columns(
+            pl.col("officer_index").cast(pl.Int64)
+        ),
+        on="officer_index",
+    )
+
+    # Rows are household-major (h * steps + step), so every household's series
+    # occupies a known contiguous block and lookups are positional gathers
+    # instead of window functions.
+    step = pl.col("step")
+    steps_df = pl.DataFrame({"step": pl.int_range(0, steps, dtype=pl.Int64, eager=True)})
+    series = (
+        base.lazy().join(steps_df.lazy(), how="cross")
+        .sort("h", "step")
+        .with_columns(
+            # Monthly log-growth ~ N(0.3%, 6%); step 0 is the opening balance
+            pl.when(step == 0)
+            .then(0.0)
+            .otherwise(0.003 + 0.06 * normal(pl.col("h") * steps + step, seed, 20))
+            .cum_sum()
+            .alias("log_growth")
+        )
+        .with_columns(
+            (
+                pl.col("opening")
+                * pl.col("sign")
+                * (pl.col("log_growth") - pl.col("log_growth").gather(pl.col("h") * steps)).exp()
+            ).round(2).alias("balance"),
+            ((step + start_index) // 12).alias("year"),
+            ((step + start_index) % 12 + 1).alias("month"),
+        )
+        .with_columns(
+            pl.col("balance").shift(1).alias("prior_month"),
+            # December of the previous year; always simulated (step >= 0)
+            pl.col("balance")
+            .gather(pl.col("h") * steps + (pl.col("year") - 1) * 12 + 11 - start_index)
+            .alias("prior_year_end"),
         )
-    except Exception as e:
-        print(f"Error creating Excel file: {e}")
+    )
+
+    wanted = [m.year * 12 + m.month - 1 - start_index for m in months]
+    return series.filter(step.is_in(wanted)).sort("year", "month", "h").collect()
+
+
+def format_currency(value: pl.Expr, style: pl.Expr) -> pl.Expr:
+    """
+    Renders cents-rounded floats as export-style text.
+
+    style 0: plain "1234.56" / "-1234.56"
+    style 1: "$1,234.56" / "$(1,234.56)"
+    style 2: "1,234.56" / "(1,234.56)"
+    """
+    cents_total = (value.abs() * 100).round().cast(pl.Int64)
+    dollars = cents_total // 100
+    cents = (cents_total % 100).cast(pl.Utf8).str.zfill(2)
+
+    # Thousands separators: zero-pad to 15 digits, slice into groups of three,
+    # then strip the padding (regex grouping is an order of magnitude slower)
+    padded = dollars.cast(pl.Utf8).str.zfill(15)
+    grouped = (
+        pl.concat_str([padded.str.slice(start, 3) for start in range(0, 15, 3)], separator=",")
+        .str.strip_chars_start("0,")
+    )
+    grouped = pl.when(dollars == 0).then(pl.lit("0")).otherwise(grouped)
+
+    negative = value < 0
+    accounting = negative & (style > 0)
+    return pl.concat_str(
+        [
+            pl.when(negative & (style == 0)).then(pl.lit("-")).otherwise(pl.lit("")),
+            pl.when(style == 1).then(pl.lit("$")).otherwise(pl.lit("")),
+            pl.when(accounting).then(pl.lit("(")).otherwise(pl.lit("")),
+            pl.when(style == 0).then(dollars.cast(pl.Utf8)).otherwise(grouped),
+            pl.lit("."),
+            cents,
+            pl.when(accounting).then(pl.lit(")")).otherwise(pl.lit("")),
+        ]
+    )
+
+
+def render_report(
+    balances: pl.DataFrame, seed: int, messy_rate: float = 0.1, swap_rate: float = 0.05
+) -> pl.DataFrame:
+    """
+    One month of balances in the export layout, with a trailing Totals row.
+
+    Balance and change columns are numeric when `messy_rate` is 0, and text
+    (mostly plain, `messy_rate` of cells in "$"/comma/parenthesis formats) otherwise.
+    """
+    h = pl.col("h")
+    swapped = uniform(h, seed, 30) < swap_rate
+    report = balances.select(
+        pl.col("household_id").alias("Household ID"),
+        pl.col("household_name").alias("Household Name"),
+        # The export puts the officer name under "Officer Code"; some rows don't
+        pl.when(swapped).then("officer_code").otherwise("officer_name").alias("Officer Code"),
+        pl.when(swapped).then("officer_name").otherwise("officer_code").alias("Officer Name"),
+        *[pl.lit(None, dtype=pl.Float64).alias(c) for c in LOAN_RATIO_COLUMNS],
+        pl.col("balance").alias(BALANCE_COLUMNS[0]),
+        pl.col("prior_month").alias(BALANCE_COLUMNS[1]),
+        pl.col("prior_year_end").alias(BALANCE_COLUMNS[2]),
+        (pl.col("balance") - pl.col("prior_month")).round(2).alias(CHANGE_COLUMNS[0]),
+        (pl.col("balance") - pl.col("prior_year_end")).round(2).alias(CHANGE_COLUMNS[1]),
+        h,
+    )
+
+    amounts = BALANCE_COLUMNS + CHANGE_COLUMNS
+    totals = report.select(
+        pl.lit("Totals").alias("Household ID"),
+        *[pl.col(c).sum().round(2) for c in amounts],
+    )
+    report = pl.concat([report, totals], how="diagonal")
+
+    if messy_rate > 0:
+        index = pl.col("h").fill_null(-1) + 1
+        # Lazy so the formatter's repeated subexpressions are computed once
+        report = report.lazy().with_columns(
+            format_currency(
+                pl.col(c),
+                pl.when(uniform(index, seed, 40 + n) < messy_rate)
+                .then(1 + (uniform(index, seed, 50 + n) < 0.5).cast(pl.Int64))
+                .otherwise(0),
+            ).alias(c)
+            for n, c in enumerate(amounts)
+        ).collect()
+    return report.select(REPORT_COLUMNS)
+
+
+def write_report(report: pl.DataFrame, path: Path, fmt: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if fmt == "xlsx":
+        if len(report) > XLSX_MAX_ROWS:
+            raise ValueError(
+                f"{len(report):,} rows exceed the xlsx sheet limit; use --format csv or parquet"
+            )
+        report.write_excel(path, autofit=False)
+    elif fmt == "csv":
+        report.write_csv(path)
+    else:
+        report.write_parquet(path)
+
+
+def generate_reports(
+    households: int = 1000,
+    officers: int = 60,
+    teams: int = 3,
+    months: int = 1,
+    end_month: date = date(2024, 1, 1),
+    seed: int = 42,
+    messy_rate: float = 0.1,
+    swap_rate: float = 0.05,
+) -> Iterator[Tuple[date, pl.DataFrame]]:
+    """Yields (month, report) for each month of the history, oldest first."""
+    roster = officer_roster(officers, teams, seed)
+    sequence = month_sequence(end_month, months)
+    balances = generate_balances(households, roster, sequence, seed)
+    for month in sequence:
+        month_rows = balances.filter(
+            (pl.col("year") == month.year) & (pl.col("month") == month.month)
+        )
+        yield month, render_report(month_rows, seed + month.month, messy_rate, swap_rate)
+
+
+def officer_teams_reference(officers: int, teams: int, seed: int) -> pl.DataFrame:
+    """officer_teams.csv rows for the generated roster (catch-all team omitted)."""
+    roster = officer_roster(officers, teams, seed)
+    return roster.filter(pl.col("team_id") != TEAM_IDS[-1]).select("officer_name", "team_id")
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate synthetic household balance reports")
+    parser.add_argument("--households", type=int, default=1000, help="Households per month")
+    parser.add_argument("--officers", type=int, default=60, help="Number of officers")
+    parser.add_argument("--teams", type=int, default=3, choices=[1, 2, 3], help="Teams with officers (BB, OCF, PB)")
+    parser.add_argument("--months", type=int, default=1, help="Months of history to generate")
+    parser.add_argument(
+        "--end-month",
+        type=lambda s: date.fromisoformat(f"{s}-01"),
+        default=date(2024, 1, 1),
+        help="Last month, YYYY-MM",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--messy-rate", type=float, default=0.1, help="Share of balance cells in $/comma/() formats")
+    parser.add_argument("--swap-rate", type=float, default=0.05, help="Share of rows with officer code/name the other way round")
+    parser.add_argument("--format", choices=FORMATS, default=None, help="Defaults to the --out suffix")
+    parser.add_argument("--out", type=Path, default=TARGET_FILE)
+    parser.add_argument(
+        "--reference-out",
+        type=Path,
+        default=None,
+        help="Also write the matching officer_teams.csv here",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] = None) -> Dict[str, int]:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    fmt = args.format or args.out.suffix.lstrip(".")
+    if fmt not in FORMATS:
+        raise SystemExit(f"Unknown format '{fmt}', expected one of {FORMATS}")
+    out = args.out.with_suffix(f".{fmt}")
+
+    started = time.perf_counter()
+    rows = 0
+    for month, report in generate_reports(
+        households=args.households,
+        officers=args.officers,
+        teams=args.teams,
+        months=args.months,
+        end_month=args.end_month,
+        seed=args.seed,
+        messy_rate=args.messy_rate,
+        swap_rate=args.swap_rate,
+    ):
+        path = out if args.months == 1 else out.with_name(f"{out.stem}-{month:%Y-%m}{out.suffix}")
+        write_report(report, path, fmt)
+        rows += len(report)
+        print(f"Wrote {len(report):,} rows to {path}")
+
+    if args.reference_out:
+        args.reference_out.parent.mkdir(parents=True, exist_ok=True)
+        officer_teams_reference(args.officers, args.teams, args.seed).write_csv(args.reference_out)
+        print(f"Wrote officer team assignments to {args.reference_out}")
+
+    print(f"Done: {rows:,} rows in {time.perf_counter() - started:.1f}s")
+    return {"rows": rows, "months": args.months}
 
 
 if __name__ == "__main__":
-    create_dummy_excel()
+    main()
@@ -0,0 +1,50 @@
+from datetime import date
+import polars as pl
+import pytest
+from backend.app.api import endpoints
+from backend.app.cache import GoldTableCache
+from backend.app.db import DuckDBPool
+from backend.app.query import ConcurrencyLimiter, SingleFlight
+
+
+@pytest.fixture
+def gold_root(tmp_path, monkeypatch):
+    """Points the API at an empty Gold directory (Silver in its silver/ subdirectory)
+    with its own cache, pool and query layer."""
+    cache = GoldTableCache(root=tmp_path)
+    pool = DuckDBPool(size=2, extensions=[])
+    limiter = ConcurrencyLimiter(max_concurrent=2, queue_timeout=0.05)
+    single_flight = SingleFlight()
+    monkeypatch.setattr(endpoints, "GOLD_PATH", tmp_path)
+    monkeypatch.setattr(endpoints, "SILVER_PATH", tmp_path / "silver")
+    monkeypatch.setattr(endpoints, "get_gold_cache", lambda: cache)
+    monkeypatch.setattr(endpoints, "get_pool", lambda: pool)
+    monkeypatch.setattr(endpoints, "get_query_limiter", lambda: limiter)
+    monkeypatch.setattr(endpoints, "get_single_flight", lambda: single_flight)
+    yield tmp_path
+    pool.close()
+
+
+@pytest.fixture
+def kpi_cube(gold_root):
+    """Writes a two-month agg_kpi_daily (February doubles January) to the Gold root."""
+    rows = []
+    for report_date, scale in [(date(2024, 1, 31), 1), (date(2024, 2, 29), 2)]:
+        for dimension_type, dimension_value, deposits in [
+            ("Bank", "All", 300),
+            ("Team", "BB", 200),
+            ("Officer", "OFF001", 120),
+        ]:
+            rows += [
+                (report_date, "total_deposits", dimension_type, dimension_value, deposits * scale),
+                (report_date, "net_flow_mom", dimension_type, dimension_value, 10 * scale),
+                (report_date, "liquidity_ratio", dimension_type, dimension_value, 1),
+            ]
+    pl.DataFrame(
+        rows,
+        schema=["report_date", "kpi_name", "dimension_type", "dimension_value", "value"],
+        orient="row",
+    ).with_columns(pl.col("value").cast(pl.Decimal(18, 2))).write_delta(
+        gold_root / "agg_kpi_daily"
+    )
+    return gold_root
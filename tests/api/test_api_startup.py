@@ -0,0 +1,12 @@
+from backend.app import main
+
+
+def test_api_import_defers_polars_and_deltalake(loaded_modules):
+    deferred = ("polars", "deltalake", "pyarrow.parquet")
+    assert loaded_modules("import backend.app.main", deferred) == []
+
+
+def test_preload_imports_in_the_background(monkeypatch):
+    thread = main.preload_modules(["json", "no_such_module_for_preload"])
+    thread.join(timeout=10)
+    assert not thread.is_alive()
@@ -0,0 +1,50 @@
+import threading
+import pytest
+from backend.app.db import DuckDBPool, PoolExhaustedError
+
+
+@pytest.fixture
+def pool():
+    pool = DuckDBPool(size=2, extensions=[], checkout_timeout=0.05)
+    pool.open()
+    yield pool
+    pool.close()
+
+
+def test_cursors_share_one_database(pool):
+    with pool.connection() as con:
+        con.execute("CREATE TABLE t AS SELECT 42 AS x")
+
+    with pool.connection() as con:
+        assert con.execute("SELECT x FROM t").fetchone() == (42,)
+
+    stats = pool.stats()
+    assert stats["size"] == 2
+    assert stats["checkouts"] == 2
+    assert stats["in_use"] == 0
+
+
+def test_pool_exhaustion_times_out(pool):
+    with pool.connection(), pool.connection():
+        with pytest.raises(PoolExhaustedError):
+            with pool.connection():
+                pass
+
+    assert pool.stats()["timeouts"] == 1
+
+
+def test_concurrent_checkouts(pool):
+    results = []
+
+    def worker():
+        with pool.connection(timeout=5) as con:
+            results.append(con.execute("SELECT 1").fetchone()[0])
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == [1] * 8
+    assert pool.stats()["checkouts"] == 8
@@ -0,0 +1,93 @@
+import shutil
+import polars as pl
+import pytest
+from fastapi.testclient import TestClient
+from backend.app.api import endpoints
+from backend.app.main import app
+
+
+@pytest.fixture
+def client(kpi_cube):
+    return TestClient(app)
+
+
+def test_kpis_carry_etag_and_revalidate_with_304(client, monkeypatch):
+    first = client.get("/api/v1/kpis", params={"team_id": "BB"})
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"')
+    assert first.headers["cache-control"] == "no-cache"
+
+    # No query may run for a matching If-None-Match
+    def fail(*args, **kwargs):
+        raise AssertionError("query ran on a 304")
+
+    monkeypatch.setattr(endpoints, "query_gold_table", fail)
+    second = client.get(
+        "/api/v1/kpis", params={"team_id": "BB"}, headers={"If-None-Match": etag}
+    )
+    assert second.status_code == 304
+    assert second.headers["etag"] == etag
+    assert second.content == b""
+
+
+def test_no_etag_or_304_for_errors_or_missing_tables(client, gold_root):
+    etag = client.get("/api/v1/kpis").headers["etag"]
+
+    limiter = endpoints.get_query_limiter()
+    held = [limiter.slot() for _ in range(limiter.max_concurrent)]
+    for slot in held:
+        slot.__enter__()
+    try:
+        rejected = client.get("/api/v1/kpis")
+    finally:
+        for slot in held:
+            slot.__exit__(None, None, None)
+    assert rejected.status_code == 503
+    assert "etag" not in rejected.headers
+
+    # Placeholder body while the table is missing: never tagged, never a 304
+    shutil.rmtree(gold_root / "agg_kpi_daily")
+    for if_none_match in (etag, "*"):
+        missing = client.get("/api/v1/kpis", headers={"If-None-Match": if_none_match})
+        assert missing.status_code == 200
+        assert "etag" not in missing.headers
+
+
+def test_etag_normalizes_params_and_varies_by_params(client):
+    a = client.get("/api/v1/kpis?team_id=BB&date=2024-01-31").headers["etag"]
+    b = client.get("/api/v1/kpis?date=2024-01-31&team_id=BB").headers["etag"]
+    c = client.get("/api/v1/kpis?team_id=OCF&date=2024-01-31").headers["etag"]
+    assert a == b
+    assert a != c
+
+
+def test_new_gold_version_changes_etag(client, gold_root):
+    etag = client.get("/api/v1/kpis").headers["etag"]
+    table = gold_root / "agg_kpi_daily"
+    pl.read_delta(str(table)).write_delta(table, mode="overwrite")  # new Delta version
+    response = client.get("/api/v1/kpis", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+def test_large_bodies_are_gzipped(client, gold_root):
+    pl.DataFrame(
+        {
+            "date_key": [202401] * 500,
+            "household_key": [f"{100000 + i}" for i in range(500)],
+            "officer_key": ["OFF001"] * 500,
+            "team_key": ["BB"] * 500,
+            "total_deposits": [1.0] * 500,
+            "net_flow_mom": [0.0] * 500,
+            "net_flow_ytd": [0.0] * 500,
+        }
+    ).write_delta(gold_root / "fact_household_monthly")
+
+    response = client.get("/api/v1/households", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept" in [v.strip() for v in response.headers["vary"].split(",")]
+    assert response.json()["num_rows"] == 500
+
+    # Small bodies stay uncompressed
+    small = client.get("/api/v1/kpis", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
@@ -0,0 +1,36 @@
+from datetime import date
+import polars as pl
+from backend.app.api import endpoints
+
+
+def test_filters_list_current_officers_only(gold_root):
+    pl.DataFrame(
+        {
+            "officer_key": ["OFF002", "OFF002", "OFF001"],
+            "officer_name": ["Mike Ross", "Mike Ross", "Sarah Jenkins"],
+            "current_team": ["PB", "OCF", "BB"],
+            "effective_date": [date(2024, 1, 31), date(2024, 2, 29), date(2024, 1, 31)],
+            "end_date": [date(2024, 2, 29), None, None],
+            "is_current": [False, True, True],
+        }
+    ).write_delta(gold_root / "dim_officer")
+
+    filters = endpoints.get_filters()
+    assert filters["officers"] == [
+        {"id": "OFF002", "name": "Mike Ross", "team": "OCF"},
+        {"id": "OFF001", "name": "Sarah Jenkins", "team": "BB"},
+    ]
+
+
+def test_filters_list_teams_from_silver(gold_root):
+    pl.DataFrame(
+        {"team_id": ["PB", "BB"], "team_name": ["Personal Banking", "Business Banking"]}
+    ).write_delta(gold_root / "silver" / "teams")
+
+    assert endpoints.get_filters()["teams"] == ["BB", "PB"]
+
+
+def test_filters_without_dimension(gold_root):
+    filters = endpoints.get_filters()
+    assert filters["officers"] == []
+    assert filters["teams"] == []
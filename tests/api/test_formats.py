@@ -0,0 +1,152 @@
+import io
+from contextlib import nullcontext
+from datetime import date
+from decimal import Decimal
+import polars as pl
+import anyio
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from fastapi import Request
+from fastapi.testclient import TestClient
+from starlette.requests import ClientDisconnect
+from backend.app.api import endpoints, formats
+from backend.etl import aggregate
+from backend.app.main import app
+
+
+@pytest.fixture
+def client(gold_root):
+    pl.DataFrame(
+        {
+            "date_key": [202401, 202402, 202402, 202402],
+            "household_key": ["100001", "100001", "100002", "100003"],
+            "officer_key": ["OFF001", "OFF001", "OFF002", "OFF001"],
+            "team_key": ["BB", "BB", "PB", "BB"],
+            "total_deposits": ["10.00", "12.50", "7.25", "1.00"],
+            "net_flow_mom": ["1.00", "2.50", "-0.75", "1.00"],
+            "net_flow_ytd": ["1.00", "3.50", "-0.25", "1.00"],
+        }
+    ).with_columns(
+        pl.col("total_deposits", "net_flow_mom", "net_flow_ytd").cast(pl.Decimal(18, 2))
+    ).write_delta(gold_root / "fact_household_monthly")
+    return TestClient(app)
+
+
+def test_households_default_to_columnar_json(client):
+    response = client.get("/api/v1/households")
+    assert response.headers["content-type"] == formats.JSON_MEDIA_TYPE
+    body = response.json()
+    assert body["num_rows"] == 3
+    assert body["columns"][:2] == ["date_key", "household_id"]
+    assert body["data"]["household_id"] == ["100001", "100002", "100003"]
+    assert body["data"]["total_deposits"] == [12.5, 7.25, 1.0]
+
+
+def test_households_are_unique_per_month_with_two_snapshots(gold_root, monkeypatch):
+    # Two Silver snapshots in January; Gold keeps the latest per household
+    monkeypatch.setattr(aggregate, "SILVER_PATH", gold_root / "silver")
+    monkeypatch.setattr(aggregate, "GOLD_PATH", gold_root)
+    pl.DataFrame(
+        {
+            "household_id": ["100001", "100002"] * 2,
+            "household_name": ["Smith Family", "Jones Family"] * 2,
+            "officer_code": ["OFF001"] * 4,
+            "balance_current": ["100.00", "50.00", "250.00", "110.00"],
+            "balance_prior_month": ["90.00", "40.00", "90.00", "40.00"],
+            "balance_ytd_start": ["80.00", "30.00", "80.00", "30.00"],
+            "as_of_date": [date(2024, 1, 15)] * 2 + [date(2024, 1, 31)] * 2,
+        }
+    ).with_columns(pl.col("^balance_.*$").cast(pl.Decimal(18, 2))).write_delta(
+        gold_root / "silver" / "households"
+    )
+    pl.DataFrame(
+        {"officer_code": ["OFF001"], "officer_name": ["Sarah Jenkins"], "team_id": ["BB"]}
+    ).write_delta(gold_root / "silver" / "officers")
+    aggregate.aggregate_gold()
+
+    body = TestClient(app).get("/api/v1/households", params={"date": "2024-01"}).json()
+    rows = pl.DataFrame(body["data"])
+    assert rows.select("household_id", "date_key").is_unique().all()
+    assert rows["household_id"].to_list() == ["100001", "100002"]
+    assert rows["total_deposits"].to_list() == [250.0, 110.0]
+
+
+def test_households_filters_and_pagination(client):
+    body = client.get(
+        "/api/v1/households", params={"team_id": "BB", "limit": 1, "offset": 1}
+    ).json()
+    assert body["data"]["household_id"] == ["100003"]
+    body = client.get("/api/v1/households", params={"date": "2024-01"}).json()
+    assert body["data"]["date_key"] == [202401]
+
+
+def test_households_as_arrow_stream(client):
+    response = client.get(
+        "/api/v1/households", headers={"Accept": formats.ARROW_STREAM_MEDIA_TYPE}
+    )
+    assert response.headers["content-type"] == formats.ARROW_STREAM_MEDIA_TYPE
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.num_rows == 3
+    # Arrow keeps the exact Decimal(18,2) balances
+    assert table.column("total_deposits").to_pylist() == [
+        Decimal("12.50"), Decimal("7.25"), Decimal("1.00")
+    ]
+    # The cursor is returned to the pool once the stream is consumed
+    assert endpoints.get_pool().stats()["in_use"] == 0
+
+
+def test_households_as_parquet(client):
+    response = client.get(
+        "/api/v1/households", headers={"Accept": formats.PARQUET_MEDIA_TYPE}
+    )
+    table = pq.read_table(io.BytesIO(response.content))
+    assert table.column("household_id").to_pylist() == ["100001", "100002", "100003"]
+
+
+def test_officers_without_gold_table_is_empty(client):
+    body = client.get("/api/v1/officers").json()
+    assert body == {"columns": [], "num_rows": 0, "data": {}}
+    response = client.get("/api/v1/officers", headers={"Accept": formats.ARROW_STREAM_MEDIA_TYPE})
+    assert pa.ipc.open_stream(response.content).read_all().num_rows == 0
+
+
+def test_negotiation_honours_quality_values(client):
+    accept = f"application/json;q=0.5, {formats.PARQUET_MEDIA_TYPE};q=0.9, */*;q=0.1"
+    response = client.get("/api/v1/households", headers={"Accept": accept})
+    assert response.headers["content-type"] == formats.PARQUET_MEDIA_TYPE
+    response = client.get("/api/v1/households", headers={"Accept": "text/html, */*"})
+    assert response.headers["content-type"] == formats.JSON_MEDIA_TYPE
+
+
+@pytest.mark.parametrize("asgi_version", ["2.4", "2.0"])
+def test_arrow_stream_releases_cursor_when_client_leaves_before_first_chunk(client, asgi_version):
+    request = Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/api/v1/households",
+            "query_string": b"",
+            "headers": [(b"accept", formats.ARROW_STREAM_MEDIA_TYPE.encode())],
+        }
+    )
+    response = endpoints.gold_response(
+        request, "fact_household_monthly", "SELECT * FROM {table}"
+    )
+    assert endpoints.get_pool().stats()["in_use"] == 1
+    assert endpoints.get_query_limiter().stats()["active"] == 1
+
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if asgi_version == "2.4":
+            raise OSError("connection reset")  # Fails on http.response.start
+        await anyio.sleep(1)  # Still sending headers when the disconnect arrives
+
+    scope = {"type": "http", "asgi": {"spec_version": asgi_version}}
+    with pytest.raises(ClientDisconnect) if asgi_version == "2.4" else nullcontext():
+        anyio.run(response, scope, receive, send)
+
+    assert endpoints.get_pool().stats()["in_use"] == 0
+    assert endpoints.get_query_limiter().stats()["active"] == 0
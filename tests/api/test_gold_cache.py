@@ -0,0 +1,102 @@
+import pyarrow as pa
+import pytest
+from deltalake import write_deltalake
+from backend.app.api import endpoints
+from backend.app.cache import GoldTableCache, delta_table_version
+from backend.app.db import DuckDBPool
+
+
+def write_kpis(path, value, mode="overwrite"):
+    write_deltalake(
+        str(path),
+        pa.table(
+            {
+                "kpi_name": ["total_deposits"],
+                "dimension_type": ["Bank"],
+                "dimension_value": ["All"],
+                "value": [value],
+            }
+        ),
+        mode=mode,
+    )
+
+
+def test_delta_table_version(tmp_path):
+    assert delta_table_version(tmp_path / "missing") is None
+    write_kpis(tmp_path / "agg_kpi_daily", 1.0)
+    write_kpis(tmp_path / "agg_kpi_daily", 2.0)
+    assert delta_table_version(tmp_path / "agg_kpi_daily") == 1
+
+
+def test_cache_hit_and_reload_on_new_commit(tmp_path):
+    write_kpis(tmp_path / "agg_kpi_daily", 1.0)
+    cache = GoldTableCache(root=tmp_path)
+
+    first = cache.get("agg_kpi_daily")
+    assert cache.get("agg_kpi_daily") is first
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["hits"] == 1
+
+    write_kpis(tmp_path / "agg_kpi_daily", 2.0)
+    reloaded = cache.get("agg_kpi_daily")
+    assert reloaded.version == 1
+    assert reloaded.table["value"].to_pylist() == [2.0]
+    assert cache.stats()["reloads"] == 1
+
+    assert cache.get("missing") is None
+
+
+def test_cache_lru_eviction(tmp_path):
+    write_kpis(tmp_path / "a", 1.0)
+    write_kpis(tmp_path / "b", 1.0)
+    size = GoldTableCache(root=tmp_path).get("a").nbytes
+    cache = GoldTableCache(root=tmp_path, max_bytes=size)
+
+    cache.get("a")
+    cache.get("b")
+
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert list(stats["tables"]) == ["b"]
+
+
+def test_oversized_version_is_loaded_once(tmp_path, monkeypatch):
+    write_kpis(tmp_path / "agg_kpi_daily", 1.0)
+    cache = GoldTableCache(root=tmp_path, max_bytes=1)
+
+    assert cache.get("agg_kpi_daily").table.num_rows == 1
+    assert cache.stats()["oversized"] == {"agg_kpi_daily": 0}
+
+    # Same version again: no Delta load, gold_query falls back to delta_scan
+    with monkeypatch.context() as patch:
+        patch.setattr(
+            "deltalake.DeltaTable.to_pyarrow_table",
+            lambda *args, **kwargs: (_ for _ in ()).throw(AssertionError("reloaded")),
+        )
+        assert cache.get("agg_kpi_daily") is None
+    assert cache.stats()["misses"] == 1
+
+    # A new version is tried again
+    write_kpis(tmp_path / "agg_kpi_daily", 2.0)
+    cache.max_bytes = 10**9
+    assert cache.get("agg_kpi_daily").version == 1
+    assert cache.stats()["oversized"] == {}
+
+
+def test_query_gold_table_served_from_cache(tmp_path, monkeypatch):
+    write_kpis(tmp_path / "agg_kpi_daily", 125.5)
+    cache = GoldTableCache(root=tmp_path)
+    pool = DuckDBPool(size=1, extensions=[])
+    monkeypatch.setattr(endpoints, "GOLD_PATH", tmp_path)
+    monkeypatch.setattr(endpoints, "get_gold_cache", lambda: cache)
+    monkeypatch.setattr(endpoints, "get_pool", lambda: pool)
+
+    rows = endpoints.query_gold_table(
+        "agg_kpi_daily", "SELECT kpi_name, value FROM {table} WHERE value > ?", [100]
+    )
+    rows_again = endpoints.query_gold_table("agg_kpi_daily", "SELECT * FROM {table}")
+
+    assert rows == [{"kpi_name": "total_deposits", "value": 125.5}]
+    assert len(rows_again) == 1
+    assert cache.stats()["hits"] == 1
+    pool.close()
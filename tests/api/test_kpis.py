@@ -0,0 +1,43 @@
+from decimal import Decimal
+import polars as pl
+from fastapi.testclient import TestClient
+from backend.app.api import endpoints
+from backend.app.main import app
+
+
+def test_kpis_default_to_latest_bank_totals(kpi_cube):
+    kpis = endpoints.get_kpis()
+    assert kpis["total_deposits"] == Decimal("600.00")
+    assert kpis["net_flow_mom"] == Decimal("20.00")
+
+
+def test_kpis_filter_by_team_officer_and_date(kpi_cube):
+    assert endpoints.get_kpis(team_id="BB")["total_deposits"] == Decimal("400.00")
+    assert endpoints.get_kpis(team_id="BB", officer_id="OFF001")["total_deposits"] == Decimal("240.00")
+    assert endpoints.get_kpis(date="2024-01-31", officer_id="OFF001")["total_deposits"] == Decimal("120.00")
+    assert endpoints.get_kpis(team_id="unknown")["total_deposits"] == 0
+
+
+def test_latest_kpi_date_comes_from_partition_metadata(gold_root, kpi_cube, monkeypatch):
+    table = gold_root / "agg_kpi_daily"
+    pl.read_delta(str(table)).write_delta(
+        table,
+        mode="overwrite",
+        delta_write_options={"schema_mode": "overwrite", "partition_by": ["report_date"]},
+    )
+    assert endpoints.latest_partition("agg_kpi_daily", "report_date") == "2024-02-29"
+    assert endpoints.get_kpis()["total_deposits"] == Decimal("600.00")
+
+    # Memoized per Delta version: no second log read for the same version
+    monkeypatch.setattr(
+        "backend.app.cache.delta_partition_values",
+        lambda *args: (_ for _ in ()).throw(AssertionError("log re-read")),
+    )
+    assert endpoints.latest_partition("agg_kpi_daily", "report_date") == "2024-02-29"
+
+
+def test_kpis_reject_malformed_date(kpi_cube):
+    client = TestClient(app)
+    assert client.get("/api/v1/kpis", params={"date": "2024-01-31"}).status_code == 200
+    for bad in ["2024-02-30", "31/01/2024", "latest"]:
+        assert client.get("/api/v1/kpis", params={"date": bad}).status_code == 422
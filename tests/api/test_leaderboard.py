@@ -0,0 +1,71 @@
+from datetime import date
+from decimal import Decimal
+import polars as pl
+from fastapi.testclient import TestClient
+from backend.app.api import endpoints
+from backend.app.main import app
+from backend.app.models.gold import LeaderboardMetric
+
+
+def write_leaderboard(gold_root):
+    balances = {"OFF001": 300, "OFF002": 100, "OFF003": 200}
+    rows = []
+    for report_date, scale in [(date(2024, 1, 31), 1), (date(2024, 2, 29), 2)]:
+        for metric in LeaderboardMetric:
+            ranked = sorted(balances.items(), key=lambda kv: -kv[1])
+            for position, (officer, balance) in enumerate(ranked, start=1):
+                rows.append(
+                    (
+                        report_date,
+                        metric.value,
+                        position,
+                        len(ranked) - position + 1,
+                        officer,
+                        f"Officer {officer}",
+                        "BB",
+                        balance * scale,
+                        balance * scale,
+                        0,
+                        balance * scale,
+                        1,
+                    )
+                )
+    pl.DataFrame(
+        rows,
+        schema=[
+            "report_date", "metric", "rank_desc", "rank_asc", "officer_code", "officer_name",
+            "team_id", "value", "balance", "net_flow_mom", "growth_ytd", "household_count",
+        ],
+        orient="row",
+    ).with_columns(
+        pl.col("value", "balance", "net_flow_mom", "growth_ytd").cast(pl.Decimal(18, 2))
+    ).write_delta(gold_root / "agg_officer_leaderboard")
+
+
+def test_leaderboard_top_k_latest_date(gold_root):
+    write_leaderboard(gold_root)
+    board = endpoints.get_officer_leaderboard(limit=2, offset=0)
+    assert board["total"] == 3
+    assert [row["officer_id"] for row in board["data"]] == ["OFF001", "OFF003"]
+    assert [row["rank"] for row in board["data"]] == [1, 2]
+    assert board["data"][0]["balance"] == Decimal("600.00")
+
+
+def test_leaderboard_ascending_pagination_and_date(gold_root):
+    write_leaderboard(gold_root)
+    page = endpoints.get_officer_leaderboard(
+        metric=LeaderboardMetric.growth_ytd, sort="asc", limit=2, offset=1, date="2024-01-31"
+    )
+    assert [row["officer_id"] for row in page["data"]] == ["OFF003", "OFF001"]
+    assert page["data"][1]["value"] == Decimal("300.00")
+
+
+def test_leaderboard_without_gold_table(gold_root):
+    assert endpoints.get_officer_leaderboard(limit=10, offset=0)["data"] == []
+
+
+def test_leaderboard_rejects_malformed_date(gold_root):
+    write_leaderboard(gold_root)
+    client = TestClient(app)
+    response = client.get("/api/v1/officers/leaderboard", params={"date": "2024-02-31"})
+    assert response.status_code == 422
@@ -0,0 +1,68 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.main import app
+from backend.app.metrics import Registry
+
+
+@pytest.fixture
+def client(gold_root):
+    return TestClient(app)
+
+
+def sample(text, line_prefix):
+    """Value of the first exposition line starting with `line_prefix`."""
+    for line in text.splitlines():
+        if line.startswith(line_prefix):
+            return float(line.rsplit(" ", 1)[1])
+    return None
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = Registry()
+    latency = registry.histogram("op_seconds", "Op latency.", ("op",), buckets=(0.1, 1))
+    for value in (0.05, 0.5, 0.5, 5):
+        latency.labels("read").observe(value)
+    registry.counter("ops_total", "Ops.").inc(3)
+
+    text = registry.render()
+    assert "# TYPE op_seconds histogram" in text
+    assert 'op_seconds_bucket{op="read",le="0.1"} 1' in text
+    assert 'op_seconds_bucket{op="read",le="1"} 3' in text
+    assert 'op_seconds_bucket{op="read",le="+Inf"} 4' in text
+    assert 'op_seconds_count{op="read"} 4' in text
+    assert sample(text, 'op_seconds_sum{op="read"}') == pytest.approx(6.05)
+    assert "ops_total 3" in text
+
+
+def test_label_values_are_escaped_and_checked():
+    registry = Registry()
+    counter = registry.counter("errors_total", "Errors.", ("message",))
+    counter.labels('bad "quote"\n').inc()
+    assert 'errors_total{message="bad \\"quote\\"\\n"} 1' in registry.render()
+    with pytest.raises(ValueError):
+        counter.labels("a", "b")
+    with pytest.raises(ValueError):
+        registry.counter("errors_total", "Again.")
+
+
+def test_metrics_endpoint_reports_route_and_query_metrics(client, kpi_cube):
+    before = client.get("/metrics").text
+    route = 'http_request_duration_seconds_count{method="GET",route="/api/v1/kpis",status="200"}'
+    queries = 'gold_query_duration_seconds_count{table="agg_kpi_daily"}'
+
+    assert client.get("/api/v1/kpis", params={"team_id": "BB"}).status_code == 200
+    assert client.get("/api/v1/kpis").status_code == 200
+    assert client.get("/no/such/path").status_code == 404
+
+    response = client.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    assert sample(text, route) - (sample(before, route) or 0) == 2
+    assert sample(text, queries) - (sample(before, queries) or 0) >= 2
+    assert sample(text, 'http_request_duration_seconds_count{method="GET",route="unmatched",status="404"}')
+    assert sample(text, 'gold_query_rows_count{table="agg_kpi_daily"}')
+    assert sample(text, 'gold_delta_snapshot_files_total{table="agg_kpi_daily"}') >= 1
+    assert sample(text, 'http_response_size_bytes_count{method="GET",route="/api/v1/kpis"}')
+    assert sample(text, "http_requests_in_flight") == 1  # The scrape itself
+    assert "/no/such/path" not in text
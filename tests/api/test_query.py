@@ -0,0 +1,136 @@
+import threading
+import time
+import duckdb
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from backend.app.api import endpoints
+from backend.app.main import app
+from backend.app.query import (
+    ConcurrencyLimiter,
+    QueryRejectedError,
+    QueryTimeoutError,
+    SingleFlight,
+    interrupt_after,
+)
+
+SLOW_QUERY = "SELECT COUNT(*) FROM range(100000000000) a WHERE a.range % 7 = 3"
+
+
+def test_interrupt_after_cancels_slow_query():
+    con = duckdb.connect()
+    started = time.perf_counter()
+    with pytest.raises(QueryTimeoutError):
+        with interrupt_after(con, 0.2):
+            con.execute(SLOW_QUERY).fetchall()
+    assert time.perf_counter() - started < 5
+    # The cursor stays usable after the interrupt
+    assert con.execute("SELECT 42").fetchone() == (42,)
+
+
+def test_interrupt_after_leaves_fast_queries_alone():
+    con = duckdb.connect()
+    with interrupt_after(con, 0.05):
+        assert con.execute("SELECT 1").fetchone() == (1,)
+    time.sleep(0.1)
+    assert con.execute("SELECT 2").fetchone() == (2,)
+
+
+def test_limiter_rejects_when_full():
+    limiter = ConcurrencyLimiter(max_concurrent=1, queue_timeout=0.01)
+    with limiter.slot():
+        with pytest.raises(QueryRejectedError):
+            with limiter.slot():
+                pass
+    with limiter.slot():
+        pass
+    assert limiter.stats()["rejected"] == 1
+    assert limiter.stats()["admitted"] == 2
+
+
+def test_single_flight_shares_one_execution():
+    group = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        release.wait(5)
+        return ["row"]
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(group.do("kpis", slow)))
+        for _ in range(5)
+    ]
+    for t in threads:
+        t.start()
+    while group.stats()["coalesced"] < 4:
+        time.sleep(0.01)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == [["row"]] * 5
+    assert group.stats() == {"in_flight": 0, "executions": 1, "coalesced": 4}
+
+
+def test_single_flight_shares_errors():
+    group = SingleFlight()
+    with pytest.raises(ValueError):
+        group.do("key", lambda: (_ for _ in ()).throw(ValueError("boom")))
+    assert group.do("key", lambda: 1) == 1
+
+
+def test_endpoint_returns_503_when_limiter_full(kpi_cube):
+    limiter = endpoints.get_query_limiter()
+    held = [limiter.slot() for _ in range(limiter.max_concurrent)]
+    for slot in held:
+        slot.__enter__()
+    try:
+        with pytest.raises(HTTPException) as exc:
+            endpoints.query_gold_table("agg_kpi_daily", "SELECT * FROM {table}")
+        assert exc.value.status_code == 503
+        assert exc.value.headers == {"Retry-After": "1"}
+    finally:
+        for slot in held:
+            slot.__exit__(None, None, None)
+
+
+def test_kpis_route_returns_503_when_limiter_full(kpi_cube):
+    client = TestClient(app)
+    limiter = endpoints.get_query_limiter()
+    held = [limiter.slot() for _ in range(limiter.max_concurrent)]
+    for slot in held:
+        slot.__enter__()
+    try:
+        response = client.get("/api/v1/kpis")
+    finally:
+        for slot in held:
+            slot.__exit__(None, None, None)
+    # Not masked by a 200 with placeholder KPIs
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    assert "total_deposits" not in response.json()
+
+
+def test_kpis_route_returns_504_on_timeout(kpi_cube, monkeypatch):
+
+    def timeout(*args, **kwargs):
+        raise QueryTimeoutError("Query exceeded 0.2s")
+
+    monkeypatch.setattr(endpoints, "interrupt_after", timeout)
+    response = TestClient(app).get("/api/v1/kpis")
+    assert response.status_code == 504
+    assert "total_deposits" not in response.json()
+
+
+def test_endpoint_returns_504_on_timeout(kpi_cube, monkeypatch):
+    monkeypatch.setattr(endpoints, "QUERY_TIMEOUT_SECONDS", 0.2)
+    with pytest.raises(HTTPException) as exc:
+        endpoints.query_gold_table(
+            "agg_kpi_daily", SLOW_QUERY + " AND EXISTS (SELECT 1 FROM {table})"
+        )
+    assert exc.value.status_code == 504
+    assert endpoints.get_pool().stats()["in_use"] == 0
@@ -0,0 +1,57 @@
+from decimal import Decimal
+import polars as pl
+import pytest
+from fastapi import HTTPException
+from backend.app.api import endpoints
+
+
+def write_waterfall(gold_root):
+    rows = [
+        # date_key, dimension_type, dimension_value, start, increases, decreases, end
+        (202401, "Bank", "All", 100, 30, -10, 120),
+        (202402, "Bank", "All", 120, 5, -25, 100),
+        # One household joined the book in March with 50
+        (202403, "Bank", "All", 150, 20, 0, 170),
+        (202402, "Team", "BB", 60, 5, -5, 60),
+    ]
+    pl.DataFrame(
+        rows,
+        schema=[
+            "date_key", "dimension_type", "dimension_value",
+            "start_balance", "increases", "decreases", "end_balance",
+        ],
+        orient="row",
+    ).with_columns(
+        pl.col("start_balance", "increases", "decreases", "end_balance").cast(pl.Decimal(18, 2))
+    ).write_delta(gold_root / "agg_flow_waterfall")
+
+
+def test_waterfall_defaults_to_latest_month(gold_root):
+    write_waterfall(gold_root)
+    waterfall = endpoints.get_waterfall()
+    assert waterfall["start_balance"] == Decimal("150.00")
+    assert waterfall["end_balance"] == Decimal("170.00")
+    assert [d["category"] for d in waterfall["details"]] == ["Increases", "Decreases"]
+
+
+def test_waterfall_sums_months_in_range(gold_root):
+    write_waterfall(gold_root)
+    waterfall = endpoints.get_waterfall(start_date="2024-01-01", end_date="2024-02")
+    assert waterfall["start_balance"] == Decimal("100.00")
+    assert waterfall["increases"] == Decimal("35.00")
+    assert waterfall["decreases"] == Decimal("-35.00")
+    assert waterfall["end_balance"] == Decimal("100.00")
+    assert len(waterfall["months"]) == 2
+
+
+def test_waterfall_reports_book_changes_between_months(gold_root):
+    write_waterfall(gold_root)
+    waterfall = endpoints.get_waterfall(start_date="2024-02")
+    assert waterfall["details"][-1] == {"category": "Book changes", "value": Decimal("50.00")}
+    assert endpoints.get_waterfall(start_date="2024-02", team_id="BB")["end_balance"] == Decimal("60.00")
+
+
+def test_waterfall_rejects_bad_dates(gold_root):
+    with pytest.raises(HTTPException) as exc:
+        endpoints.get_waterfall(start_date="Jan 2024")
+    assert exc.value.status_code == 422
@@ -1,6 +1,24 @@
+import subprocess
 import sys
 import os
 from pathlib import Path
 
+import pytest
+
 # Add the project root to the python path
 sys.path.append(str(Path(__file__).parent.parent))
+
+
+@pytest.fixture
+def loaded_modules():
+    """Which of `modules` are imported after running `code` in a fresh interpreter."""
+    root = Path(__file__).resolve().parent.parent
+
+    def check(code, modules):
+        script = f"import sys; {code}; print(','.join(m for m in {modules!r} if m in sys.modules))"
+        result = subprocess.run(
+            [sys.executable, "-c", script], cwd=root, capture_output=True, text=True, check=True
+        )
+        return [m for m in result.stdout.strip().split(",") if m]
+
+    return check
@@ -0,0 +1,34 @@
+import polars as pl
+import pytest
+from backend.etl import ingest, transform
+
+
+@pytest.fixture
+def make_report():
+    """Writes a source workbook with one household per balance."""
+
+    def write(path, balances):
+        pl.DataFrame(
+            {
+                "Household ID": [str(100001 + i) for i in range(len(balances))],
+                "Household Name": [f"Family {i}" for i in range(len(balances))],
+                "Officer Code": ["OFF001"] * len(balances),
+                "Officer Name": ["Sarah Jenkins"] * len(balances),
+                "Current Month-end Deposit Balance": balances,
+                "Prior Month-end Deposit Balance": balances,
+                "Prior Year-end Deposit Balance": balances,
+            }
+        ).write_excel(path)
+
+    return write
+
+
+@pytest.fixture
+def lakehouse(tmp_path, monkeypatch):
+    """Points ingest and transform at an empty lakehouse; returns (source file, root)."""
+    source = tmp_path / "household-balance-report.xlsx"
+    monkeypatch.setattr(ingest, "SOURCE_FILE_PATH", source)
+    monkeypatch.setattr(ingest, "BRONZE_PATH", tmp_path / "bronze")
+    monkeypatch.setattr(transform, "BRONZE_PATH", tmp_path / "bronze")
+    monkeypatch.setattr(transform, "SILVER_PATH", tmp_path / "silver")
+    return source, tmp_path
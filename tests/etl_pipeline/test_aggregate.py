@@ -0,0 +1,250 @@
+import shutil
+from datetime import date
+from decimal import Decimal
+import polars as pl
+import pytest
+from deltalake import DeltaTable
+from backend.etl import aggregate
+from backend.etl.transform import CURRENCY_DTYPE, HOUSEHOLD_KEYS, merge_into_silver
+
+
+@pytest.fixture
+def lakehouse(tmp_path, monkeypatch):
+    monkeypatch.setattr(aggregate, "SILVER_PATH", tmp_path / "silver")
+    monkeypatch.setattr(aggregate, "GOLD_PATH", tmp_path / "gold")
+    households = pl.DataFrame(
+        {
+            "household_id": ["100001", "100002", "100003"],
+            "household_name": ["Smith Family", "Jones Family", "Brown Family"],
+            "officer_code": ["OFF001", "OFF002", "OFF001"],
+            "balance_current": ["0.10", "0.20", "150000.00"],
+            "balance_prior_month": ["0.05", "0.30", "145000.00"],
+            "balance_ytd_start": ["0.00", "0.10", "120000.00"],
+            "as_of_date": [date(2024, 1, 31)] * 3,
+        }
+    ).with_columns(pl.col("^balance_.*$").cast(CURRENCY_DTYPE))
+    households.write_delta(tmp_path / "silver" / "households")
+    pl.DataFrame(
+        {
+            "officer_code": ["OFF001", "OFF002"],
+            "officer_name": ["Sarah Jenkins", "Mike Ross"],
+            "team_id": ["BB", None],
+            "status": ["Active", "Active"],
+        },
+        schema_overrides={"team_id": pl.Utf8},
+    ).write_delta(tmp_path / "silver" / "officers")
+    return tmp_path
+
+
+def gold(root, table):
+    return pl.read_delta(str(root / "gold" / table))
+
+
+def add_snapshot(root, as_of_date, scale):
+    """Appends a snapshot of every household on `as_of_date`, balances scaled."""
+    households = pl.read_delta(str(root / "silver" / "households"))
+    households.filter(pl.col("as_of_date") == date(2024, 1, 31)).with_columns(
+        (pl.col("^balance_.*$") * scale).cast(CURRENCY_DTYPE),
+        as_of_date=pl.lit(as_of_date),
+    ).write_delta(root / "silver" / "households", mode="append")
+
+
+def test_aggregate_gold_builds_fact_and_kpis(lakehouse):
+    aggregate.aggregate_gold()
+
+    fact = gold(lakehouse, "fact_household_monthly").sort("household_key")
+    assert fact["date_key"].to_list() == [202401] * 3
+    assert fact["net_flow_mom"].to_list() == [
+        Decimal("0.05"),
+        Decimal("-0.10"),
+        Decimal("5000.00"),
+    ]
+
+    assert fact["team_key"].to_list() == ["BB", "PB", "BB"]
+
+    kpis = gold(lakehouse, "agg_kpi_daily")
+    assert kpis["value"].dtype == pl.Decimal(18, 2)
+    bank_total = kpis.filter(
+        (pl.col("dimension_type") == "Bank") & (pl.col("kpi_name") == "total_deposits")
+    )
+    assert bank_total["value"].to_list() == [Decimal("150000.30")]
+
+
+def test_fact_table_keeps_the_latest_snapshot_per_month(lakehouse):
+    add_snapshot(lakehouse, date(2024, 1, 15), 2)
+    aggregate.aggregate_gold()
+
+    fact = gold(lakehouse, "fact_household_monthly").sort("household_key")
+    assert fact.select("household_key", "date_key").is_unique().all()
+    assert fact["date_key"].to_list() == [202401] * 3
+    assert fact["total_deposits"].to_list() == [
+        Decimal("0.10"),
+        Decimal("0.20"),
+        Decimal("150000.00"),
+    ]
+
+
+def test_kpi_cube_covers_every_kpi_and_dimension(lakehouse):
+    aggregate.aggregate_gold()
+
+    kpis = gold(lakehouse, "agg_kpi_daily")
+    cube = {
+        (row["dimension_type"], row["dimension_value"], row["kpi_name"]): row["value"]
+        for row in kpis.iter_rows(named=True)
+    }
+
+    # 1 bank + 2 teams + 2 officers, 3 KPIs each
+    assert len(cube) == 15
+    assert cube[("Team", "BB", "total_deposits")] == Decimal("150000.10")
+    assert cube[("Team", "PB", "net_flow_mom")] == Decimal("-0.10")
+    assert cube[("Officer", "OFF001", "net_flow_mom")] == Decimal("5000.05")
+    assert cube[("Bank", "All", "liquidity_ratio")] == Decimal("1.03")
+
+
+def test_write_gold_reports_rows_and_bytes(lakehouse):
+    import duckdb
+
+    con = duckdb.connect()
+    stats = aggregate.write_gold(con, "numbers", "SELECT range AS n FROM range(10)", mode="overwrite")
+
+    assert stats["rows"] == 10
+    assert stats["bytes"] > 0
+    assert stats["version"] == 0
+
+
+def test_officer_leaderboard_is_ranked_per_metric(lakehouse):
+    aggregate.aggregate_gold()
+
+    board = gold(lakehouse, "agg_officer_leaderboard")
+    assert sorted(board["metric"].unique().to_list()) == ["balance", "growth_ytd", "net_flow_mom"]
+
+    by_balance = board.filter(pl.col("metric") == "balance").sort("rank_desc")
+    assert by_balance["officer_code"].to_list() == ["OFF001", "OFF002"]
+    assert by_balance["rank_asc"].to_list() == [2, 1]
+    assert by_balance["value"].to_list() == [Decimal("150000.10"), Decimal("0.20")]
+    assert by_balance["officer_name"].to_list() == ["Sarah Jenkins", "Mike Ross"]
+    assert by_balance["household_count"].to_list() == [2, 1]
+
+
+def test_flow_waterfall_reconciles_with_fact_table(lakehouse):
+    aggregate.aggregate_gold()
+
+    fact = gold(lakehouse, "fact_household_monthly")
+    waterfall = gold(lakehouse, "agg_flow_waterfall")
+    assert len(waterfall) == 1 + 2 + 2  # Bank, 2 teams, 2 officers
+
+    bank = waterfall.filter(pl.col("dimension_type") == "Bank").row(0, named=True)
+    assert bank["end_balance"] == fact["total_deposits"].sum()
+    assert bank["start_balance"] == fact["total_deposits"].sum() - fact["net_flow_mom"].sum()
+    assert bank["increases"] == Decimal("5000.05")
+    assert bank["decreases"] == Decimal("-0.10")
+
+    for row in waterfall.iter_rows(named=True):
+        assert row["start_balance"] + row["increases"] + row["decreases"] == row["end_balance"]
+
+
+def test_flow_waterfall_counts_each_household_once_per_month(lakehouse):
+    add_snapshot(lakehouse, date(2024, 1, 15), 2)
+    aggregate.aggregate_gold()
+
+    waterfall = gold(lakehouse, "agg_flow_waterfall")
+    bank = waterfall.filter(pl.col("dimension_type") == "Bank").row(0, named=True)
+    assert bank["household_count"] == 3
+    assert bank["end_balance"] == Decimal("150000.30")
+    assert bank["start_balance"] == Decimal("145000.35")
+    assert bank["increases"] == Decimal("5000.05")
+    assert bank["decreases"] == Decimal("-0.10")
+
+
+def test_dim_officer_is_maintained_as_scd2(lakehouse):
+    aggregate.aggregate_gold()
+    dim = gold(lakehouse, "dim_officer").sort("officer_key")
+    assert dim["officer_key"].to_list() == ["OFF001", "OFF002"]
+    assert dim["current_team"].to_list() == ["BB", "PB"]
+    assert dim["is_current"].to_list() == [True, True]
+    assert dim["effective_date"].to_list() == [date(2024, 1, 31)] * 2
+
+    # Unchanged officers: rerunning touches nothing
+    dim_path = str(lakehouse / "gold" / "dim_officer")
+    commits = len(DeltaTable(dim_path).history())
+    aggregate.aggregate_gold()
+    assert len(DeltaTable(dim_path).history()) == commits
+
+    # OFF002 moves to OCF in February: close the PB row, open an OCF row
+    DeltaTable(str(lakehouse / "silver" / "officers")).update(
+        updates={"team_id": "'OCF'"}, predicate="officer_code = 'OFF002'"
+    )
+    pl.read_delta(str(lakehouse / "silver" / "households")).with_columns(
+        pl.lit(date(2024, 2, 29)).alias("as_of_date")
+    ).write_delta(lakehouse / "silver" / "households", mode="append")
+
+    aggregate.aggregate_gold()
+    history = (
+        gold(lakehouse, "dim_officer")
+        .filter(pl.col("officer_key") == "OFF002")
+        .sort("effective_date")
+    )
+    assert history["current_team"].to_list() == ["PB", "OCF"]
+    assert history["is_current"].to_list() == [False, True]
+    assert history["end_date"].to_list() == [date(2024, 2, 29), None]
+    assert history["effective_date"].to_list() == [date(2024, 1, 31), date(2024, 2, 29)]
+    assert len(gold(lakehouse, "dim_officer")) == 3
+
+
+def test_kpi_reruns_replace_their_report_date_partition(lakehouse):
+    aggregate.aggregate_gold()
+    first = gold(lakehouse, "agg_kpi_daily")
+    aggregate.aggregate_gold()
+    second = gold(lakehouse, "agg_kpi_daily")
+
+    assert len(second) == len(first)
+    dt = DeltaTable(str(lakehouse / "gold" / "agg_kpi_daily"))
+    assert dt.metadata().partition_columns == ["report_date"]
+    assert dt.partitions() == [{"report_date": "2024-01-31"}]
+
+
+def kpi_files(root, report_date):
+    dt = DeltaTable(str(root / "gold" / "agg_kpi_daily"))
+    adds = pl.DataFrame(dt.get_add_actions(flatten=True))
+    return set(
+        adds.filter(pl.col("partition.report_date").cast(pl.Utf8) == report_date)["path"]
+    )
+
+
+def test_kpis_only_rebuild_the_dates_silver_changed(lakehouse):
+    aggregate.aggregate_gold()
+    january = kpi_files(lakehouse, "2024-01-31")
+
+    households = pl.read_delta(str(lakehouse / "silver" / "households"))
+    february = households.with_columns(as_of_date=pl.lit(date(2024, 2, 29)))
+    merge_into_silver(
+        february,
+        lakehouse / "silver" / "households",
+        HOUSEHOLD_KEYS,
+        commit_metadata={"as_of_dates": "2024-02-29"},
+    )
+    aggregate.aggregate_gold()
+
+    assert kpi_files(lakehouse, "2024-01-31") == january
+    assert kpi_files(lakehouse, "2024-02-29")
+    kpis = gold(lakehouse, "agg_kpi_daily")
+    assert kpis.group_by("report_date").len()["len"].to_list() == [15, 15]
+
+    # A Silver commit that doesn't say which dates it wrote rebuilds every date
+    february.write_delta(lakehouse / "silver" / "households", mode="append")
+    aggregate.aggregate_gold()
+    assert kpi_files(lakehouse, "2024-01-31").isdisjoint(january)
+
+
+def test_kpi_table_from_before_partitioning_is_rewritten(lakehouse):
+    aggregate.aggregate_gold()
+    table = lakehouse / "gold" / "agg_kpi_daily"
+    legacy = gold(lakehouse, "agg_kpi_daily")
+    # Unpartitioned and with the duplicates the old append mode produced
+    shutil.rmtree(table)
+    pl.concat([legacy, legacy]).write_delta(table)
+    assert DeltaTable(str(table)).metadata().partition_columns == []
+
+    aggregate.aggregate_gold()
+    assert DeltaTable(str(table)).metadata().partition_columns == ["report_date"]
+    assert len(gold(lakehouse, "agg_kpi_daily")) == len(legacy)
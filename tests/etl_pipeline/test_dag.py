@@ -0,0 +1,144 @@
+import json
+import threading
+from datetime import datetime, timedelta
+import pytest
+from backend.etl import run
+from backend.etl.dag import Dag, DagRunError, Task
+from backend.etl.run import build_pipeline
+
+
+def test_independent_tasks_run_in_parallel():
+    # Both tasks must be running at the same time to pass the barrier
+    barrier = threading.Barrier(2, timeout=5)
+    dag = Dag(
+        [
+            Task("households", barrier.wait, outputs=("silver.households",)),
+            Task("officers", barrier.wait, outputs=("silver.officers",)),
+        ],
+        max_workers=2,
+    )
+    results = dag.run()
+    assert {r.status for r in results.values()} == {"completed"}
+
+
+def test_tasks_run_after_their_inputs_are_produced():
+    order = []
+    dag = Dag(
+        [
+            Task("aggregate", lambda: order.append("aggregate"), inputs=("silver",)),
+            Task("transform", lambda: order.append("transform"), inputs=("bronze",), outputs=("silver",)),
+            Task("ingest", lambda: order.append("ingest"), outputs=("bronze",)),
+        ]
+    )
+    dag.run()
+    assert order == ["ingest", "transform", "aggregate"]
+    assert dag.dependencies("aggregate") == {"transform"}
+
+
+def test_failed_run_resumes_from_failed_task(tmp_path):
+    checkpoint = tmp_path / "run.json"
+    calls = []
+    broken = {"transform": True}
+
+    def transform():
+        calls.append("transform")
+        if broken["transform"]:
+            raise ValueError("bad batch")
+
+    def make_dag():
+        return Dag(
+            [
+                Task("ingest", lambda: calls.append("ingest"), outputs=("bronze",)),
+                Task("transform", transform, inputs=("bronze",), outputs=("silver",)),
+                Task("aggregate", lambda: calls.append("aggregate"), inputs=("silver",)),
+            ],
+            name="etl_all",
+            checkpoint_path=checkpoint,
+        )
+
+    with pytest.raises(DagRunError) as exc:
+        make_dag().run()
+    assert exc.value.failed == "transform"
+    assert exc.value.results["aggregate"].status == "not_run"
+    assert checkpoint.exists()
+
+    broken["transform"] = False
+    results = make_dag().run()
+    assert calls == ["ingest", "transform", "transform", "aggregate"]
+    assert results["ingest"].status == "skipped"
+    assert not checkpoint.exists()
+
+
+def test_checkpoint_of_other_task_set_is_ignored(tmp_path):
+    checkpoint = tmp_path / "run.json"
+    stale = Dag([Task("ingest", lambda: 1)], name="etl_ingest", checkpoint_path=checkpoint)
+    stale._save_checkpoint({"ingest": {"seconds": 1.0}})
+
+    dag = Dag([Task("ingest", lambda: 1)], name="etl_all", checkpoint_path=checkpoint)
+    results = dag.run()
+    assert results["ingest"].status == "completed"
+
+
+def test_checkpoint_only_resumes_the_same_run(tmp_path):
+    checkpoint = tmp_path / "run.json"
+
+    def make_dag(run_key, max_age=None):
+        return Dag(
+            [
+                Task("ingest", lambda: 1, outputs=("bronze",)),
+                Task("transform", lambda: 2, inputs=("bronze",)),
+            ],
+            name="etl_all",
+            checkpoint_path=checkpoint,
+            run_key=run_key,
+            checkpoint_max_age=max_age,
+        )
+
+    # Night 1 failed after ingest; night 2 brings a new report
+    make_dag("report-1")._save_checkpoint({"ingest": {"seconds": 1.0}})
+    results = make_dag("report-2").run()
+    assert results["ingest"].status == "completed"
+    assert not checkpoint.exists()
+
+    # Same report, but the checkpoint is older than the allowed age
+    make_dag("report-2")._save_checkpoint({"ingest": {"seconds": 1.0}})
+    stale = json.loads(checkpoint.read_text())
+    stale["updated_at"] = (datetime.now() - timedelta(hours=13)).isoformat()
+    checkpoint.write_text(json.dumps(stale))
+    assert make_dag("report-2", max_age=12 * 3600).run()["ingest"].status == "completed"
+
+    # Same report within the window: resumed
+    make_dag("report-2")._save_checkpoint({"ingest": {"seconds": 1.0}})
+    assert make_dag("report-2", max_age=12 * 3600).run()["ingest"].status == "skipped"
+    assert not checkpoint.exists()
+
+
+def test_run_key_follows_the_source_file(tmp_path, monkeypatch):
+    source = tmp_path / "report.xlsx"
+    monkeypatch.setattr(run, "SOURCE_FILE_PATH", source)
+    assert run.source_run_key() == "report.xlsx:missing"
+    source.write_bytes(b"jan")
+    january = run.source_run_key()
+    source.write_bytes(b"february")
+    assert run.source_run_key() != january
+    assert build_pipeline("all").run_key == run.source_run_key()
+
+
+def test_invalid_graphs_are_rejected():
+    with pytest.raises(ValueError, match="cycle"):
+        Dag(
+            [
+                Task("a", print, inputs=("y",), outputs=("x",)),
+                Task("b", print, inputs=("x",), outputs=("y",)),
+            ]
+        )
+    with pytest.raises(ValueError, match="produced by both"):
+        Dag([Task("a", print, outputs=("x",)), Task("b", print, outputs=("x",))])
+
+
+def test_pipeline_stages_are_wired_by_datasets():
+    dag = build_pipeline("all")
+    assert dag.dependencies("ingest") == set()
+    assert dag.dependencies("transform") == {"ingest"}
+    assert dag.dependencies("aggregate") == {"transform"}
+    assert [t.name for t in build_pipeline("aggregate").tasks] == ["aggregate"]
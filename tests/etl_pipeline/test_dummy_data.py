@@ -0,0 +1,59 @@
+from datetime import date
+
+import polars as pl
+
+from backend.etl import ingest, transform
+from scripts.create_dummy_data import (
+    BALANCE_COLUMNS,
+    generate_reports,
+    officer_roster,
+)
+
+
+def reports(**options):
+    return [report for _, report in generate_reports(households=500, **options)]
+
+
+def test_same_seed_reproduces_reports():
+    assert reports(seed=7)[0].equals(reports(seed=7)[0])
+    assert not reports(seed=7)[0].equals(reports(seed=8)[0])
+
+
+def test_messy_currency_parses_to_the_clean_values():
+    clean = reports(messy_rate=0.0)[0]
+    messy = reports(messy_rate=0.5)[0]
+
+    texts = messy[BALANCE_COLUMNS[0]]
+    assert texts.str.starts_with("$").any()
+    assert texts.str.contains(",", literal=True).any()
+
+    parsed = messy.select(transform.clean_currency(pl.col(c)) for c in BALANCE_COLUMNS)
+    expected = clean.select(pl.col(c).cast(transform.CURRENCY_DTYPE) for c in BALANCE_COLUMNS)
+    assert parsed.equals(expected)
+
+
+def test_history_is_consistent_across_months():
+    months = reports(months=3, end_month=date(2024, 1, 1), messy_rate=0.0)
+    previous, current = months[1], months[2]
+
+    # January's prior month is December; its prior year-end is also December
+    assert current[BALANCE_COLUMNS[1]].equals(previous[BALANCE_COLUMNS[0]])
+    assert current[BALANCE_COLUMNS[2]].equals(previous[BALANCE_COLUMNS[0]])
+    assert current["Household ID"][-1] == "Totals"
+
+
+def test_officer_names_are_unique_at_any_cardinality():
+    assert officer_roster(2000, 3, seed=1)["officer_name"].n_unique() == 2000
+
+
+def test_generated_report_loads_through_silver(lakehouse):
+    source, root = lakehouse
+    report = reports(swap_rate=0.2)[0]
+    report.write_excel(source)
+
+    ingest.ingest_excel_to_bronze()
+    transform.transform_silver()
+
+    households = pl.read_delta(str(root / "silver" / "households"))
+    assert len(households) == len(report) - 1  # Totals row dropped
+    assert households["officer_code"].str.contains(r"^\d+$").all()
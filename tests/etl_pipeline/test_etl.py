@@ -1,6 +1,7 @@
 import pytest
+from decimal import Decimal
 import polars as pl
-from backend.etl.transform import clean_currency
+from backend.etl.transform import clean_currency, parse_balances
 
 
 def test_clean_currency():
@@ -12,3 +13,39 @@ def test_clean_currency():
     assert result["clean"][1] == -500.00
     assert result["clean"][2] == 200.00
     assert result["clean"][3] is None
+
+
+def test_clean_currency_is_exact_decimal():
+    df = pl.DataFrame({"raw_money": ["$(1,607,943)", "0.10", "0.20", "abc"]})
+
+    result = df.select(clean_currency(pl.col("raw_money")).alias("clean"))
+
+    assert result["clean"].dtype == pl.Decimal(18, 2)
+    assert result["clean"][0] == Decimal("-1607943.00")
+    assert result["clean"][1] + result["clean"][2] == Decimal("0.30")
+    assert result["clean"][3] is None
+
+
+def test_clean_currency_strips_symbols_and_whitespace_anywhere():
+    df = pl.DataFrame({"raw_money": ["-$500", " 12.00", "$ 1 000.25 ", "$-7", "( 3.10 )"]})
+
+    result = df.select(clean_currency(pl.col("raw_money")).alias("clean"))
+
+    assert result["clean"].to_list() == [
+        Decimal("-500.00"),
+        Decimal("12.00"),
+        Decimal("1000.25"),
+        Decimal("-7.00"),
+        Decimal("-3.10"),
+    ]
+
+
+def test_clean_currency_rejects_excess_precision_instead_of_truncating():
+    df = pl.DataFrame({"raw_money": ["1,000.505", "1.500", "2.0000"]})
+
+    rejected = df.select(clean_currency(pl.col("raw_money")).alias("clean"))
+    # Trailing zeros lose nothing and are kept
+    assert rejected["clean"].to_list() == [None, Decimal("1.50"), Decimal("2.00")]
+
+    flags = df.select(parse_balances({"clean": "raw_money"}))["clean__excess_precision"]
+    assert flags.to_list() == [True, False, False]
@@ -0,0 +1,171 @@
+import hashlib
+import polars as pl
+import pytest
+from backend.etl import ingest
+
+
+@pytest.fixture
+def lakehouse(tmp_path, monkeypatch):
+    source = tmp_path / "household-balance-report.xlsx"
+    monkeypatch.setattr(ingest, "SOURCE_FILE_PATH", source)
+    monkeypatch.setattr(ingest, "BRONZE_PATH", tmp_path / "bronze")
+    return source, tmp_path / "bronze"
+
+
+def bronze_rows(bronze):
+    return pl.read_delta(str(bronze / ingest.BRONZE_TABLE))
+
+
+def test_rerun_on_unchanged_file_is_noop(lakehouse, make_report):
+    source, bronze = lakehouse
+    make_report(source, [100, 200])
+
+    ingest.ingest_excel_to_bronze()
+    ingest.ingest_excel_to_bronze()
+
+    assert len(bronze_rows(bronze)) == 2
+    assert len(pl.read_delta(str(bronze / ingest.MANIFEST_TABLE))) == 1
+
+
+def test_changed_file_appends_only_changed_rows(lakehouse, make_report):
+    source, bronze = lakehouse
+    make_report(source, [100, 200])
+    ingest.ingest_excel_to_bronze()
+
+    make_report(source, [100, 250, 300])
+    ingest.ingest_excel_to_bronze()
+
+    rows = bronze_rows(bronze)
+    assert len(rows) == 4
+    assert rows["ingestion_id"].n_unique() == 2
+
+
+def test_snapshot_is_only_written_when_rows_are_carried(lakehouse, make_report):
+    source, bronze = lakehouse
+    make_report(source, [100, 200])
+    ingest.ingest_excel_to_bronze()
+    # Every row is stored by the batch itself
+    assert not (bronze / ingest.BRONZE_SNAPSHOT_TABLE).exists()
+
+    make_report(source, [100, 250])
+    ingest.ingest_excel_to_bronze()
+
+    snapshot = pl.read_delta(str(bronze / ingest.BRONZE_SNAPSHOT_TABLE))
+    batches = bronze_rows(bronze).sort("ingestion_timestamp")["ingestion_id"].unique(
+        maintain_order=True
+    )
+    assert snapshot["ingestion_id"].unique().to_list() == [batches[1]]
+    assert sorted(snapshot["stored_ingestion_id"].to_list()) == sorted(batches.to_list())
+
+
+def test_force_appends_whole_workbook(lakehouse, make_report):
+    source, bronze = lakehouse
+    make_report(source, [100, 200])
+    ingest.ingest_excel_to_bronze()
+    ingest.ingest_excel_to_bronze(force=True)
+
+    assert len(bronze_rows(bronze)) == 4
+
+
+def test_row_hash_is_column_order_independent():
+    a = pl.DataFrame({"x": ["1"], "y": [None]})
+    b = pl.DataFrame({"y": [None], "x": ["1"]})
+    assert ingest.add_row_hashes(a)["row_hash"][0] == ingest.add_row_hashes(b)["row_hash"][0]
+
+
+def test_row_hash_format_is_stable():
+    # Fingerprints already in Bronze must keep matching: sha256 of the cells in
+    # column-name order, joined by \x1f, with \x00 for empty cells
+    df = pl.DataFrame({"b": ["x", None], "a": ["1", "é"]})
+    assert ingest.add_row_hashes(df)["row_hash"].to_list() == [
+        hashlib.sha256("1\x1fx".encode()).hexdigest(),
+        hashlib.sha256("é\x1f\x00".encode()).hexdigest(),
+    ]
+
+
+def test_calamine_reader_chunks_into_one_commit_with_raw_content(lakehouse):
+    source, bronze = lakehouse
+    pl.DataFrame(
+        {
+            "Transaction Date": ["2024-01-15", "2024-01-20", "2024-01-21"],
+            "Household ID": ["100001", "100002", "Totals"],
+            "Household Name": ["Smith Family", "Jones Family", None],
+            "Officer Code": ["OFF001", "Mike Ross", None],
+            "Officer Name": ["Sarah Jenkins", "OFF002", None],
+            "Current Month-end Deposit Balance": ["$1,000.50", "(500.00)", "500.50"],
+            "Prior Month-end Deposit Balance": [900.0, 100.0, 1000.0],
+            "Prior Year-end Deposit Balance": [800.0, 50.0, 850.0],
+        }
+    ).write_excel(source)
+
+    ingest.ingest_excel_to_bronze(reader="calamine", chunk_rows=1)
+
+    rows = bronze_rows(bronze).sort("Household ID")
+    assert len(rows) == 3
+    assert rows["ingestion_id"].n_unique() == 1
+    assert "Transaction Date" not in rows.columns
+    assert rows["raw_content"][0] == '{"Transaction Date":"2024-01-15"}'
+    assert rows["Current Month-end Deposit Balance"].to_list() == ["$1,000.50", "(500.00)", "500.50"]
+    assert rows["Prior Month-end Deposit Balance"].dtype == pl.Utf8
+
+    from deltalake import DeltaTable
+
+    assert DeltaTable(str(bronze / ingest.BRONZE_TABLE)).version() == 0
+
+
+def test_calamine_reader_hands_out_bounded_chunks(lakehouse, make_report):
+    source, _ = lakehouse
+    make_report(source, list(range(5)))
+
+    row_count, chunks = ingest._read_calamine_chunks(source, chunk_rows=2, keep_raw=False)
+
+    assert row_count == 5
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+
+
+def test_calamine_reader_prunes_columns_without_raw_content(lakehouse, make_report):
+    source, bronze = lakehouse
+    make_report(source, [100, 200])
+    ingest.ingest_excel_to_bronze(reader="calamine", keep_raw=False)
+    assert "raw_content" not in bronze_rows(bronze).columns
+
+
+def test_missing_silver_column_fails(lakehouse):
+    source, _ = lakehouse
+    pl.DataFrame({"Household ID": ["100001"]}).write_excel(source)
+    with pytest.raises(ValueError, match="missing required columns"):
+        ingest.ingest_excel_to_bronze(reader="calamine")
+
+
+def test_parquet_source_reads_like_excel(lakehouse, monkeypatch):
+    source, bronze = lakehouse
+    parquet = source.with_suffix(".parquet")
+    monkeypatch.setattr(ingest, "SOURCE_FILE_PATH", parquet)
+    pl.DataFrame(
+        {
+            "Household ID": ["100001", "Totals"],
+            "Household Name": ["Smith Family", None],
+            "Officer Code": ["Mike Ross", None],
+            "Officer Name": ["615", None],
+            "Current Month-end Deposit Balance": ["$(1,000.50)", "10.00"],
+            "Prior Month-end Deposit Balance": [900.5, 1000.0],
+            "Prior Year-end Deposit Balance": [800.0, 850.0],
+            "Deposit Balance Change Year-to-date": [200.5, 150.0],
+        }
+    ).write_parquet(parquet)
+
+    ingest.ingest_excel_to_bronze(reader="polars", chunk_rows=1)
+
+    rows = bronze_rows(bronze).sort("Household ID")
+    assert rows["Current Month-end Deposit Balance"].to_list() == ["$(1,000.50)", "10.00"]
+    assert rows["Prior Month-end Deposit Balance"].to_list() == ["900.5", "1000.0"]
+    assert rows["raw_content"][0] == '{"Deposit Balance Change Year-to-date":"200.5"}'
+
+
+def test_polars_reader_keeps_flat_columns(lakehouse, make_report):
+    source, bronze = lakehouse
+    make_report(source, [100, 200])
+    ingest.ingest_excel_to_bronze(reader="polars")
+    rows = bronze_rows(bronze)
+    assert len(rows) == 2
+    assert rows["Current Month-end Deposit Balance"].dtype == pl.Utf8
@@ -0,0 +1,86 @@
+import polars as pl
+import pytest
+from deltalake import write_deltalake
+
+from backend.shared import instrumentation
+from backend.shared.instrumentation import instrument
+
+
+class RecordingLog:
+    def __init__(self):
+        self.events = []
+
+    def info(self, event, **fields):
+        self.events.append((event, fields))
+
+    def find(self, event):
+        return [fields for name, fields in self.events if name == event]
+
+
+def test_step_logs_metrics_on_success():
+    log = RecordingLog()
+    with instrument(log, "step_done", table="t") as step:
+        step.rows_in = 10
+        step.rows_out = 7
+
+    [fields] = log.find("step_done")
+    assert fields["table"] == "t"
+    assert fields["rows_in"] == 10 and fields["rows_out"] == 7
+    assert fields["duration_seconds"] >= 0 and fields["cpu_seconds"] >= 0
+    assert fields["rss_peak_delta_bytes"] >= 0
+    assert "bytes_written" not in fields  # Unknown metrics are left out
+
+
+def test_failed_or_discarded_steps_log_nothing():
+    log = RecordingLog()
+    with pytest.raises(ValueError):
+        with instrument(log, "step_done"):
+            raise ValueError("boom")
+    with instrument(log, "step_done") as step:
+        step.discard()
+    assert log.events == []
+
+
+def test_delta_bytes_roll_up_to_the_parent(tmp_path):
+    log = RecordingLog()
+    table = tmp_path / "t"
+    frame = pl.DataFrame({"part": ["a", "a", "b"], "value": [1, 2, 3]})
+    write_deltalake(str(table), frame.to_arrow(), partition_by=["part"])
+    partition_a = sum(f.stat().st_size for f in (table / "part=a").glob("*.parquet"))
+    first_write = sum(f.stat().st_size for f in table.rglob("*.parquet"))
+
+    with instrument(log, "stage_done", pipeline_stage="test"):
+        with instrument(log, "read_done") as step:
+            step.track_delta_read(table, part="a")
+        with instrument(log, "write_done") as step:
+            step.track_delta_write(table)
+            write_deltalake(str(table), frame.to_arrow(), mode="append", partition_by=["part"])
+
+    [read] = log.find("read_done")
+    [write] = log.find("write_done")
+    [stage] = log.find("stage_done")
+    assert read["bytes_read"] == partition_a
+    assert write["bytes_written"] == first_write  # Only the appended files
+    assert stage["bytes_read"] == read["bytes_read"]
+    assert stage["bytes_written"] == write["bytes_written"]
+
+
+def test_profiled_stage_writes_plans_and_a_folded_profile(tmp_path, monkeypatch):
+    monkeypatch.setattr(instrumentation, "PROFILE_STAGES", {"transform"})
+    monkeypatch.setattr(instrumentation, "PROFILE_OUTPUT_DIR", tmp_path)
+    log = RecordingLog()
+
+    with instrument(log, "not_profiled", pipeline_stage="ingest") as step:
+        assert step.profile_dir is None
+    with instrument(log, "transform_done", pipeline_stage="transform"):
+        with instrument(log, "sub_step") as step:
+            lf = pl.LazyFrame({"a": [1, 2]}).filter(pl.col("a") > 1)
+            step.explain_polars("filtered", lf)
+            pl.concat([lf] * 50).collect()
+
+    [fields] = log.find("transform_done")
+    profile_dir = tmp_path / fields["profile_dir"].split("/")[-1]
+    assert log.find("sub_step")[0]["profile_dir"] == fields["profile_dir"]
+    assert "FILTER" in (profile_dir / "filtered.plan.txt").read_text().upper()
+    assert (profile_dir / "profile.folded").exists()
+    assert len(list(tmp_path.iterdir())) == 1
@@ -0,0 +1,118 @@
+import io
+import json
+import logging
+import threading
+from decimal import Decimal
+
+import pytest
+import structlog
+
+from backend.shared import logging_config
+from backend.shared.logging_config import AsyncLogWriter, configure_logger, flush_logs
+
+
+@pytest.fixture
+def fast_logs():
+    """Configures the fast mode into a buffer and restores the defaults afterwards."""
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    stream = io.StringIO()
+
+    def configure(**options):
+        configure_logger(fast=True, stream=stream, **options)
+        return structlog.get_logger("test")
+
+    def lines():
+        flush_logs()
+        return stream.getvalue().splitlines()
+
+    yield configure, lines
+    logging_config._close_writer()
+    structlog.reset_defaults()
+    root.handlers[:], root.level = handlers, level
+
+
+def test_fast_mode_writes_json_lines(fast_logs):
+    configure, lines = fast_logs
+    logger = configure()
+    logger.info("rows_written", rows=3, value=Decimal("1.50"))
+    logger.warning("slow_query", seconds=2.5)
+    logging.getLogger("uvicorn").warning("plain stdlib record")
+
+    first, second, third = lines()
+    first, second = json.loads(first), json.loads(second)
+    assert first["event"] == "rows_written" and first["rows"] == 3
+    assert first["level"] == "info" and first["logger"] == "test"
+    assert "timestamp" in first
+    assert first["value"] == repr(Decimal("1.50"))  # Same fallback as the default renderer
+    assert second["level"] == "warning"
+    assert third == "plain stdlib record"  # Stdlib records share the writer, unformatted
+
+
+def test_debug_events_are_filtered_or_sampled(fast_logs):
+    configure, lines = fast_logs
+    logger = configure(log_level="INFO")
+    logger.debug("noisy")
+    assert lines() == []
+
+    logger = configure(log_level="DEBUG", debug_sample_rate=0.1)
+    for i in range(50):
+        logger.debug("noisy", i=i)
+        logger.info("kept", i=i)
+    events = [json.loads(line) for line in lines()]
+    assert [e["i"] for e in events if e["event"] == "noisy"] == [0, 10, 20, 30, 40]
+    assert sum(e["event"] == "kept" for e in events) == 50
+
+
+def test_writer_drops_instead_of_blocking_on_a_stalled_stream():
+    unblock = threading.Event()
+
+    class StalledStream(io.BytesIO):
+        def write(self, data):
+            unblock.wait()
+            return super().write(data)
+
+    stream = StalledStream()
+    writer = AsyncLogWriter(stream, max_queue=10, flush_interval=0.01)
+    for i in range(100):
+        writer.write(b'{"i": %d}' % i)  # Returns immediately even though the stream hangs
+    assert writer.dropped >= 80
+    unblock.set()
+    writer.close()
+
+    written = stream.getvalue().splitlines()
+    assert json.loads(written[-1]) == {
+        "event": "log_events_dropped",
+        "dropped": writer.dropped,
+        "logger": "logging_config",
+        "level": "warning",
+    }
+    assert len(written) == 100 - writer.dropped + 1
+
+
+def test_logger_bound_before_reconfiguring_keeps_writing(fast_logs):
+    configure, lines = fast_logs
+    logger = configure()
+    logger.info("before")  # Cached on first use, with the writer of that time
+
+    second = io.StringIO()
+    configure_logger(fast=True, stream=second)
+    logger.info("after")
+    flush_logs()
+
+    assert [json.loads(line)["event"] for line in lines()] == ["before"]
+    assert [json.loads(line)["event"] for line in second.getvalue().splitlines()] == ["after"]
+
+
+def test_dropped_events_are_reported_with_the_console_renderer(fast_logs):
+    configure, lines = fast_logs
+    logger = configure(json_logs=False)
+    logging_config._writer.max_queue = 0
+    logger.info("lost")
+    logging_config._writer.max_queue = 10
+    logger.info("kept")
+
+    kept, dropped = lines()
+    assert "kept" in kept
+    assert "log_events_dropped" in dropped and "dropped=1" in dropped
+    assert not dropped.startswith("{")
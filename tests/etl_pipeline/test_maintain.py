@@ -0,0 +1,65 @@
+from datetime import date
+import polars as pl
+import pytest
+from deltalake import DeltaTable
+from backend.etl import maintain
+
+
+def append_batches(path, batches):
+    for i in range(batches):
+        pl.DataFrame(
+            {
+                "household_id": [str(100001 + i)],
+                "officer_code": [f"OFF00{i % 3}"],
+                "as_of_date": [date(2024, 1, 31)],
+            }
+        ).write_delta(path, mode="append")
+
+
+def test_maintain_table_compacts_checkpoints_and_vacuums(tmp_path):
+    table = tmp_path / "silver" / "households"
+    append_batches(table, 5)
+
+    report = maintain.maintain_table(table, retention_hours=0)
+
+    assert report["zorder_columns"] == ["officer_code", "as_of_date"]
+    assert report["before"]["files"] == 5
+    assert report["after"]["files"] == 1
+    assert report["after"]["storage_files"] == 1
+    assert report["files_vacuumed"] == 5
+    assert list((table / "_delta_log").glob("*.checkpoint.parquet"))
+    assert len(pl.read_delta(str(table))) == 5
+
+
+def test_partition_columns_are_not_zordered(tmp_path):
+    table = tmp_path / "gold" / "agg_kpi_daily"
+    for day in (30, 31):
+        pl.DataFrame({"report_date": [date(2024, 1, day)], "value": [1]}).write_delta(
+            table,
+            mode="append",
+            delta_write_options={"partition_by": ["report_date"]},
+        )
+
+    report = maintain.maintain_table(
+        table, zorder_columns=["report_date"], retention_hours=0
+    )
+    assert report["zorder_columns"] == []
+    assert DeltaTable(str(table)).metadata().partition_columns == ["report_date"]
+
+
+def test_maintain_lakehouse_covers_every_layer(tmp_path, monkeypatch):
+    for layer in ("bronze", "silver", "gold"):
+        monkeypatch.setattr(maintain, f"{layer.upper()}_PATH", tmp_path / layer)
+    append_batches(tmp_path / "bronze" / "raw_household_balances", 2)
+    append_batches(tmp_path / "gold" / "fact_household_monthly", 3)
+
+    reports = maintain.maintain_lakehouse(retention_hours=0)
+    assert [r["after"]["files"] for r in reports] == [1, 1]
+
+
+def test_maintain_lakehouse_reports_failures(tmp_path, monkeypatch):
+    for layer in ("bronze", "silver", "gold"):
+        monkeypatch.setattr(maintain, f"{layer.upper()}_PATH", tmp_path / layer)
+    (tmp_path / "silver" / "broken" / "_delta_log").mkdir(parents=True)
+    with pytest.raises(RuntimeError, match="broken"):
+        maintain.maintain_lakehouse()
@@ -0,0 +1,40 @@
+import sys
+
+import pytest
+
+from backend.shared.startup import ImportTimer, process_age_seconds
+
+@pytest.fixture
+def packages(tmp_path, monkeypatch):
+    (tmp_path / "slow_parent").mkdir()
+    (tmp_path / "slow_parent" / "__init__.py").write_text(
+        "import time\ntime.sleep(0.05)\nimport slow_parent.sub\n"
+    )
+    (tmp_path / "slow_parent" / "sub.py").write_text("import time\ntime.sleep(0.05)\nimport slow_child\n")
+    (tmp_path / "slow_child.py").write_text("import time\ntime.sleep(0.1)\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield
+    for name in ("slow_parent", "slow_parent.sub", "slow_child"):
+        sys.modules.pop(name, None)
+
+
+def test_import_timer_reports_exclusive_time_per_package(packages):
+    with ImportTimer() as imports:
+        import slow_parent  # noqa: F401
+        import slow_child  # noqa: F401  (already imported: free)
+
+    assert imports.seconds["slow_parent"] == pytest.approx(0.1, abs=0.04)
+    assert imports.seconds["slow_child"] == pytest.approx(0.1, abs=0.04)
+    assert sum(imports.seconds.values()) <= imports.total_seconds
+    assert set(imports.top(2)) == {"slow_parent", "slow_child"}
+
+
+def test_cli_import_leaves_stage_dependencies_unloaded(loaded_modules):
+    heavy = ("polars", "duckdb", "deltalake", "pydantic", "backend.etl.ingest")
+    code = "from backend.etl.run import build_pipeline; build_pipeline('all')"
+    assert loaded_modules(code, heavy) == []
+
+
+def test_process_age_is_positive():
+    age = process_age_seconds()
+    assert age is None or age > 0
@@ -0,0 +1,270 @@
+from datetime import date, datetime
+from decimal import Decimal
+import polars as pl
+import pyarrow as pa
+import pytest
+from deltalake import write_deltalake
+from backend.etl import aggregate, ingest, reference, transform
+
+
+def bronze_batch(ingestion_id, timestamp, household_id="100001"):
+    return pa.table(
+        {
+            "Household ID": [household_id],
+            "ingestion_id": [ingestion_id],
+            "ingestion_timestamp": [timestamp],
+            "ingestion_date": [timestamp.date()],
+        }
+    )
+
+
+def test_latest_batch_comes_from_commit_metadata(lakehouse, make_report):
+    source, root = lakehouse
+    make_report(source, [100, 200])
+    ingest.ingest_excel_to_bronze()
+    make_report(source, [300])
+    ingest.ingest_excel_to_bronze()
+
+    bronze = root / "bronze" / ingest.BRONZE_TABLE
+    batches = pl.read_delta(str(bronze)).sort("ingestion_timestamp")["ingestion_id"]
+    latest = transform.latest_bronze_batch(bronze)
+
+    assert latest == batches[-1]
+    assert len(transform.read_bronze_batch(bronze, latest).collect()) == 1
+
+
+def test_latest_batch_from_partitions_without_commit_metadata(tmp_path):
+    bronze = tmp_path / "bronze"
+    for ingestion_id, ts in [
+        ("b", datetime(2024, 1, 2, 9)),
+        ("c", datetime(2024, 1, 2, 8)),
+        ("a", datetime(2024, 1, 1, 23)),
+    ]:
+        write_deltalake(
+            str(bronze),
+            bronze_batch(ingestion_id, ts),
+            mode="append",
+            partition_by=ingest.BRONZE_PARTITION_COLUMNS,
+        )
+
+    assert transform.latest_bronze_batch(bronze) == "b"
+
+
+def test_latest_batch_on_unpartitioned_legacy_table(tmp_path):
+    bronze = tmp_path / "bronze"
+    write_deltalake(str(bronze), bronze_batch("new", datetime(2024, 1, 2)), mode="append")
+    write_deltalake(str(bronze), bronze_batch("old", datetime(2024, 1, 1)), mode="append")
+
+    # No commit metadata and no partitions: newest by ingestion_timestamp, not by row order
+    assert transform.latest_bronze_batch(bronze) == "new"
+    assert len(transform.read_bronze_batch(bronze, "new").collect()) == 1
+
+
+def test_transform_silver_processes_latest_batch(lakehouse, make_report):
+    source, root = lakehouse
+    make_report(source, [100, 200])
+    ingest.ingest_excel_to_bronze()
+    make_report(source, [100, 250])
+    ingest.ingest_excel_to_bronze()
+
+    transform.transform_silver()
+
+    households = pl.read_delta(str(root / "silver" / "households")).sort("household_id")
+    assert households["household_id"].to_list() == ["100001", "100002"]
+    assert households["balance_current"].to_list() == [100, 250]
+
+
+def ingest_report_on(monkeypatch, day):
+    class IngestedOn(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.combine(day, datetime.min.time())
+
+    monkeypatch.setattr(ingest, "datetime", IngestedOn)
+    ingest.ingest_excel_to_bronze()
+
+
+def test_unchanged_rows_are_carried_into_the_next_report(lakehouse, monkeypatch, make_report):
+    source, root = lakehouse
+    monkeypatch.setattr(aggregate, "SILVER_PATH", root / "silver")
+    monkeypatch.setattr(aggregate, "GOLD_PATH", root / "gold")
+
+    make_report(source, [100, 200, 300])
+    ingest_report_on(monkeypatch, date(2024, 1, 31))
+    transform.transform_silver()
+    make_report(source, [100, 200, 999])
+    ingest_report_on(monkeypatch, date(2024, 2, 29))
+    transform.transform_silver()
+    aggregate.aggregate_gold()
+
+    # Bronze stores the two unchanged rows once
+    assert len(pl.read_delta(str(root / "bronze" / ingest.BRONZE_TABLE))) == 4
+    households = pl.read_delta(str(root / "silver" / "households"))
+    assert households.group_by("as_of_date").len().sort("as_of_date")["len"].to_list() == [3, 3]
+    bank_total = pl.read_delta(str(root / "gold" / "agg_kpi_daily")).filter(
+        (pl.col("dimension_type") == "Bank") & (pl.col("kpi_name") == "total_deposits")
+    ).sort("report_date")
+    assert bank_total["value"].to_list() == [600, 1299]
+
+
+def test_report_with_only_known_rows_is_still_processed(lakehouse, monkeypatch, make_report):
+    source, root = lakehouse
+    make_report(source, [100, 200, 300])
+    ingest_report_on(monkeypatch, date(2024, 1, 31))
+    make_report(source, [100, 200])
+    ingest_report_on(monkeypatch, date(2024, 2, 29))
+    transform.transform_silver()
+
+    households = pl.read_delta(str(root / "silver" / "households"))
+    assert households["as_of_date"].to_list() == [date(2024, 2, 29)] * 2
+
+
+def test_snapshot_reads_only_the_batches_storing_its_rows(lakehouse, monkeypatch, make_report):
+    source, root = lakehouse
+    make_report(source, [100, 200])
+    ingest_report_on(monkeypatch, date(2024, 1, 31))
+    make_report(source, [300, 400])
+    ingest_report_on(monkeypatch, date(2024, 2, 29))
+    make_report(source, [300, 400, 500])
+    ingest_report_on(monkeypatch, date(2024, 3, 31))
+
+    bronze = root / "bronze" / ingest.BRONZE_TABLE
+    batches = pl.read_delta(str(bronze)).sort("ingestion_timestamp")["ingestion_id"].unique(
+        maintain_order=True
+    )
+    read = []
+    read_bronze_batches = transform.read_bronze_batches
+    monkeypatch.setattr(
+        transform,
+        "read_bronze_batches",
+        lambda path, ids: read.append(sorted(ids)) or read_bronze_batches(path, ids),
+    )
+
+    snapshot = transform.read_bronze_snapshot(bronze, batches[2]).collect()
+
+    # January's rows are not in the March report, so its batch is never opened
+    assert read == [[batches[2]], [batches[1]]]
+    assert sorted(snapshot["Current Month-end Deposit Balance"].to_list()) == ["300", "400", "500"]
+    assert snapshot["ingestion_id"].unique().to_list() == [batches[2]]
+
+
+def test_officer_teams_come_from_reference_data(lakehouse, monkeypatch, make_report):
+    source, root = lakehouse
+    make_report(source, [100])
+    ingest.ingest_excel_to_bronze()
+
+    transform.transform_silver()
+    officers = pl.read_delta(str(root / "silver" / "officers"))
+    # Not listed in officer_teams.csv: falls into the Personal Banking catch-all
+    assert officers["team_id"].to_list() == ["PB"]
+    teams = pl.read_delta(str(root / "silver" / "teams")).sort("team_id")
+    assert teams["team_id"].to_list() == ["BB", "OCF", "PB"]
+
+    reference_dir = root / "reference"
+    reference_dir.mkdir()
+    (reference_dir / "teams.csv").write_text("team_id,team_name\nBB,Business Banking\n")
+    officer_name = officers["officer_name"][0]
+    (reference_dir / "officer_teams.csv").write_text(f"officer_name,team_id\n{officer_name},BB\n")
+    monkeypatch.setattr(reference, "REFERENCE_DATA_PATH", reference_dir)
+    make_report(source, [150])
+    ingest.ingest_excel_to_bronze()
+
+    transform.transform_silver()
+    officers = pl.read_delta(str(root / "silver" / "officers"))
+    assert officers["team_id"].to_list() == ["BB"]
+
+
+def test_reference_data_rejects_unknown_teams(tmp_path, monkeypatch):
+    (tmp_path / "officer_teams.csv").write_text("officer_name,team_id\nSarah Jenkins,XX\n")
+    monkeypatch.setattr(reference, "REFERENCE_DATA_PATH", tmp_path)
+    with pytest.raises(ValueError, match="XX"):
+        reference.load_officer_teams()
+
+
+def test_merge_into_silver_reports_change_set(tmp_path):
+    table = tmp_path / "households"
+    day = date(2024, 1, 31)
+    first = pl.DataFrame(
+        {"household_id": ["1", "2"], "as_of_date": [day, day], "balance": [10.0, 20.0]}
+    )
+    assert transform.merge_into_silver(first, table, transform.HOUSEHOLD_KEYS) == {
+        "rows_inserted": 2,
+        "rows_updated": 0,
+        "rows_unchanged": 0,
+    }
+
+    second = pl.DataFrame(
+        {"household_id": ["1", "2", "3"], "as_of_date": [day] * 3, "balance": [10.0, 25.0, 30.0]}
+    )
+    stats = transform.merge_into_silver(second, table, transform.HOUSEHOLD_KEYS)
+
+    assert stats == {"rows_inserted": 1, "rows_updated": 1, "rows_unchanged": 1}
+    result = pl.read_delta(str(table)).sort("household_id")
+    assert result["balance"].to_list() == [10.0, 25.0, 30.0]
+
+
+def test_transform_silver_upserts_across_runs(lakehouse, make_report):
+    source, root = lakehouse
+    make_report(source, [100, 200])
+    ingest.ingest_excel_to_bronze()
+    transform.transform_silver()
+
+    make_report(source, [100, 250, 300])
+    ingest.ingest_excel_to_bronze()
+    transform.transform_silver()
+
+    households = pl.read_delta(str(root / "silver" / "households")).sort("household_id")
+    assert households["household_id"].to_list() == ["100001", "100002", "100003"]
+    assert households["balance_current"].to_list() == [100, 250, 300]
+    assert len(pl.read_delta(str(root / "silver" / "officers"))) == 1
+
+
+def test_transform_silver_quarantines_invalid_rows(lakehouse):
+    source, root = lakehouse
+    pl.DataFrame(
+        {
+            "Household ID": ["100001", "42"],
+            "Household Name": ["Smith Family", "Short Id"],
+            "Officer Code": ["OFF001", "OFF001"],
+            "Officer Name": ["Sarah Jenkins", "Sarah Jenkins"],
+            "Current Month-end Deposit Balance": ["$1,000.50", "not a number"],
+            "Prior Month-end Deposit Balance": ["900", "900"],
+            "Prior Year-end Deposit Balance": ["800", "800"],
+        }
+    ).write_excel(source)
+    ingest.ingest_excel_to_bronze()
+    transform.transform_silver()
+
+    households = pl.read_delta(str(root / "silver" / "households"))
+    quarantine = pl.read_delta(str(root / "silver" / "quarantine_households"))
+    assert households["household_id"].to_list() == ["100001"]
+    assert quarantine["household_id"].to_list() == ["42"]
+    assert quarantine["reason_codes"][0].to_list() == [
+        "household_id_pattern",
+        "balance_current_required",
+    ]
+
+
+def test_transform_silver_quarantines_excess_precision(lakehouse):
+    source, root = lakehouse
+    pl.DataFrame(
+        {
+            "Household ID": ["100001", "100002", "100003"],
+            "Household Name": ["Smith Family", "Jones Family", "Brown Family"],
+            "Officer Code": ["OFF001"] * 3,
+            "Officer Name": ["Sarah Jenkins"] * 3,
+            "Current Month-end Deposit Balance": ["-$500", " 12.00", "1,000.505"],
+            "Prior Month-end Deposit Balance": ["900"] * 3,
+            "Prior Year-end Deposit Balance": ["800"] * 3,
+        }
+    ).write_excel(source)
+    ingest.ingest_excel_to_bronze()
+    transform.transform_silver()
+
+    households = pl.read_delta(str(root / "silver" / "households")).sort("household_id")
+    assert households["balance_current"].dtype == transform.CURRENCY_DTYPE
+    assert households["balance_current"].to_list() == [Decimal("-500.00"), Decimal("12.00")]
+    quarantine = pl.read_delta(str(root / "silver" / "quarantine_households"))
+    assert quarantine["household_id"].to_list() == ["100003"]
+    assert quarantine["reason_codes"][0].to_list() == ["balance_current_decimal_places"]
+    assert quarantine["balance_current"].dtype == transform.CURRENCY_DTYPE
@@ -0,0 +1,82 @@
+from datetime import date
+from decimal import Decimal
+import polars as pl
+from backend.app.models.silver import Household, Officer
+from backend.etl.validation import apply_rules, compile_model_rules, validate_against_model
+
+
+def households():
+    return pl.DataFrame(
+        {
+            "household_id": ["123456", "123", "1234567", None],
+            "household_name": ["Smith Family", "Jones Family", "Big Family", "No Id"],
+            "officer_code": ["OFF001"] * 4,
+            "balance_current": [100.50, 10.0, 1e17, 5.005],
+            "balance_prior_month": [90.0] * 4,
+            "balance_ytd_start": [80.0] * 4,
+            "as_of_date": [date(2024, 1, 15)] * 4,
+        }
+    )
+
+
+def test_model_constraints_compile_to_rules():
+    codes = {rule.reason_code for rule in compile_model_rules(Household, households().schema)}
+    assert {
+        "household_id_required",
+        "household_id_pattern",
+        "balance_current_max_digits",
+        "balance_current_decimal_places",
+        "as_of_date_required",
+    } <= codes
+
+
+def test_failing_rows_carry_every_reason_code():
+    valid, invalid = validate_against_model(households(), Household)
+
+    assert valid["household_id"].to_list() == ["123456"]
+    reasons = dict(zip(invalid["household_name"], invalid["reason_codes"].to_list()))
+    assert reasons["Jones Family"] == ["household_id_pattern"]
+    assert reasons["Big Family"] == ["balance_current_max_digits"]
+    assert reasons["No Id"] == ["household_id_required", "balance_current_decimal_places"]
+
+
+def test_failure_counts_per_rule():
+    df = households()
+    _, _, counts = apply_rules(df, compile_model_rules(Household, df.schema))
+    assert counts["household_id_pattern"] == 1
+    assert counts["household_name_required"] == 0
+
+
+def test_enum_and_optional_fields():
+    df = pl.DataFrame(
+        {
+            "officer_code": ["OFF001", "OFF002"],
+            "officer_name": ["Sarah Jenkins", "Mike Ross"],
+            "team_id": [None, "XX"],
+            "status": ["Active", "Retired"],
+        }
+    )
+    valid, invalid = validate_against_model(df, Officer)
+    assert valid["officer_code"].to_list() == ["OFF001"]
+    assert invalid["reason_codes"][0].to_list() == ["team_id_enum", "status_enum"]
+
+
+def test_decimal_places_rule_applies_to_decimal_columns():
+    df = households().with_columns(
+        pl.Series(
+            "balance_current",
+            [Decimal("100.50"), Decimal("10.000"), Decimal("1000.505"), Decimal("5")],
+            dtype=pl.Decimal(38, 9),
+        )
+    )
+    rules = compile_model_rules(Household, df.schema)
+    _, invalid, counts = apply_rules(df.slice(0, 3), rules)
+    assert counts["balance_current_decimal_places"] == 1
+    reasons = dict(zip(invalid["balance_current"], invalid["reason_codes"].to_list()))
+    assert reasons[Decimal("1000.505")] == ["balance_current_decimal_places"]
+    assert reasons[Decimal("10.000")] == ["household_id_pattern"]  # Trailing zeros are fine
+
+    # Already at the model's scale: nothing to check
+    exact = df.with_columns(pl.col("balance_current").cast(pl.Decimal(18, 2), strict=False))
+    codes = {rule.reason_code for rule in compile_model_rules(Household, exact.schema)}
+    assert "balance_current_decimal_places" not in codes